@@ -1,17 +1,42 @@
 """
 AWS 비용 정산 웹 애플리케이션
 """
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, session
 from werkzeug.utils import secure_filename
+import io
 import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from collections import Counter
 import pandas as pd
 from pathlib import Path
 import logging
 
 from src.cost_data_converter import CostDataConverter
 from src.converters.currency_converter_integration import CostDataConverterWithCurrency
+from src.converters.excel_writer import write_dataframe_to_excel
+from src.converters.columnar import project_columns, to_records, to_columnar, iter_ndjson, iter_csv
+from src.converters.frame_cache import ParsedFrameCache
+from src.converters.parse_worker import convert_csv_file_to_frame
+from src.converters.line_items import line_item_classes
+from src.parsers.description_attributes import ATTRIBUTE_COLUMNS
+from src.dataset.filter_expr import compile_filter
+from src.dataset.query_cache import QueryResultCache
+from src.dataset.registry import DatasetRegistry
+from src.dataset.merge import merge_company_frames
+from src.dataset.incremental import incremental_update, source_partitions
+from src.dataset.shared_store import SharedDatasetStore
+from src.dataset.cost_store import CostHistoryStore
+from src.dataset.fact_store import CostFactStore, FactVersionChanged, sort_dataframe
+from src.dataset.diff import diff_datasets
+from src.dataset.search_index import SearchIndex, SearchIndexCache
+from src.settlement.msp import calculate_msp_costs, custom_charge_mask, split_environment_costs, summarize_msp
+from src.settlement.allocation import default_allocation
+from src.settlement.workbook import write_settlement_workbook
+from src.jobs.manager import JobManager, JOB_FAILED
+from src.jobs.upload_spool import ChunkedUploadStore, ChunkOffsetError, UploadFinalizingError
 
 # 로깅 설정
 logging.basicConfig(
@@ -26,63 +51,243 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')  # 환경 변수에서 읽기
 app.config['KOREA_EXIM_API_KEY'] = os.environ.get('KOREA_EXIM_API_KEY', 'K7Ns1BMF9j5ZZN9daJAMjMqlTbWTJlg6')  # 한국수출입은행 API 키
 
+# 내보내기 버퍼를 메모리에 유지하는 최대 크기 (초과하면 임시 파일로 전환)
+EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# 업로드 가능한 파일 형식 (압축 파일은 변환할 때 압축을 풀면서 읽음)
+UPLOAD_EXTENSIONS = ('.csv', '.csv.gz', '.zip')
+
+# 업로드 방식 - replace: 기존 데이터 교체 / incremental: 기간이 겹치는 파일이면 바뀐 날짜만 교체하고 새 날짜 추가
+UPLOAD_MODE_REPLACE = 'replace'
+UPLOAD_MODE_INCREMENTAL = 'incremental'
+UPLOAD_MODES = (UPLOAD_MODE_REPLACE, UPLOAD_MODE_INCREMENTAL)
+
+# /api/pivot에서 묶을 수 있는 컬럼 (Description 속성 포함)
+PIVOT_COLUMNS = (
+    'service_name', 'environment', 'project', 'region', 'account_id', 'line_item_class', *ATTRIBUTE_COLUMNS
+)
+
+# 업로드 원본 보관 여부 (기본: 보관 안 함 - 업로드 내용은 메모리에서 바로 변환)
+app.config['UPLOAD_AUDIT'] = os.environ.get('UPLOAD_AUDIT', '').lower() in ('1', 'true', 'yes')
+
 # 업로드 폴더 생성
 Path(app.config['UPLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
 
-# 전역 변수로 변환기와 데이터 저장
+# 작업 공간(세션)별 데이터셋 레지스트리 - 메모리 예산을 넘으면 오래 사용하지 않은 데이터셋을 디스크로 내보냄
+# 공유 저장소: gunicorn 워커가 여러 개여도 같은 데이터셋 파일을 memory-map으로 함께 사용 (빈 값이면 사용 안 함)
+shared_dir = os.environ.get('DATASET_SHARED_DIR', 'data/shared')
+registry = DatasetRegistry(
+    memory_budget_bytes=int(os.environ.get('DATASET_MEMORY_BUDGET_MB', 512)) * 1024 * 1024,
+    spill_dir=os.environ.get('DATASET_SPILL_DIR', 'data/workspaces'),
+    store=SharedDatasetStore(shared_dir) if shared_dir else None,
+    idle_ttl_seconds=float(os.environ.get('DATASET_IDLE_TTL_HOURS', 24)) * 3600 or None
+)
+
+# 분할 업로드 저장소 (MAX_CONTENT_LENGTH보다 큰 파일을 여러 요청으로 나눠 받음)
+# 완료 표시에 변환 작업 ID를 기록 - 작업을 실행하던 워커가 종료되면 바로 다시 완료할 수 있음
+upload_spool = ChunkedUploadStore(
+    root_dir=os.path.join(shared_dir or 'data', 'uploads'),
+    max_size=int(os.environ.get('CHUNKED_UPLOAD_MAX_MB', 1024)) * 1024 * 1024,
+    job_active=lambda job_id: jobs.is_active(job_id)
+)
+
+# 업로드 원본 보관용 스레드 (업로드 응답을 기다리게 하지 않음)
+audit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='upload-audit')
+
+# 업로드 파일 변환에 사용할 프로세스 수 (기본: CPU 코어 수)
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', 0)) or None
+
+# 변환 결과 캐시 (같은 내용의 파일을 다시 업로드하면 변환하지 않고 Parquet 캐시에서 읽음, 0이면 사용 안 함)
+parsed_cache_mb = int(os.environ.get('PARSED_CACHE_MB', 256))
+frame_cache = ParsedFrameCache(
+    cache_dir=os.path.join(shared_dir or 'data', 'parsed'),
+    max_bytes=parsed_cache_mb * 1024 * 1024
+) if parsed_cache_mb > 0 else None
+
+# 분할 업로드 미리 변환용 스레드 - 받는 중인 파일을 분할이 도착하는 대로 읽어서 변환하고 결과를 변환 결과 캐시에 저장
+# (완료 요청 후 변환 작업은 캐시에서 읽음, 변환 결과 캐시를 사용하지 않으면 완료 요청 후 변환)
+ingest_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='upload-ingest') if frame_cache else None
+
+# 월별 비용 이력 저장소 (업로드한 데이터를 회사/월별 Parquet으로 보관 - 재시작 후에도 월별 비교 가능, 빈 값이면 사용 안 함)
+history_dir = os.environ.get('COST_HISTORY_DIR', 'data/cost_history')
+history_store = CostHistoryStore(history_dir) if history_dir else None
+
+# 조회 백엔드 - memory: 스냅샷 DataFrame으로 조회 / sqlite: 공개한 데이터셋을 SQLite 팩트 테이블에도 저장하고
+# /api/data, /api/summary의 필터·정렬·집계를 SQL로 처리 (워커마다 전체 DataFrame을 훑지 않음)
+DATASET_BACKEND = os.environ.get('DATASET_BACKEND', 'memory').lower()
+fact_store = CostFactStore(
+    os.environ.get('FACT_DB_PATH') or os.path.join(shared_dir or 'data', 'cost_facts.db')
+) if DATASET_BACKEND == 'sqlite' else None
+
+# 팩트 테이블 조회 중 새 버전이 저장되면 다시 조회하는 횟수
+FACT_READ_RETRIES = 3
+
+# 업로드 등 백그라운드 작업 (상태는 공유 폴더의 SQLite에 기록 - 어느 워커에서든 조회 가능)
+jobs = JobManager(
+    db_path=os.path.join(shared_dir or 'data', 'jobs.db'),
+    max_workers=int(os.environ.get('UPLOAD_WORKERS', 2))
+)
+
+# 변환기 (데이터를 보관하지 않으므로 모든 작업 공간이 공유)
 converter = None
-current_data = None
-current_df = None
-
-# 두 파일의 데이터를 각각 저장
-ciel_data_list = None  # 씨엘모빌리티 파일 데이터
-segi_data_list = None  # 세기모빌리티 파일 데이터
-combined_data_list = None  # 합쳐진 데이터
-combined_df = None  # 합쳐진 DataFrame
-
-
-def calculate_msp_costs(non_custom_charge_usd, custom_charge_usd=0.0):
-    """
-    MSP 비용 계산
-
-    우선순위 1 - CSV에 실제 Custom Charge가 $2,000 이상인 경우:
-      - M2 = CSV Custom Charge 값 그대로
-      - M1 = $1,000 (고정, segimobility 청구)
-      - cielmobility Custom Charge = M2 - M1
-
-    우선순위 2 - CSV Custom Charge가 없거나 $2,000 미만인 경우 (AWS 사용료 기준 계산):
-      - $20,000 미만: M2 = $2,000 (고정), M1 = $1,000 (고정)
-      - $20,000 이상: M2 = 사용료 * 20%, M1 = 사용료 * 5%
-    """
-    THRESHOLD = 20000.0
-    M2_RATE = 0.20
-    M2_FIXED = 2000.0
-    M1_FIXED = 1000.0
-    M1_RATE = 0.05
-    CSV_CUSTOM_CHARGE_THRESHOLD = 2000.0
-
-    if custom_charge_usd >= CSV_CUSTOM_CHARGE_THRESHOLD:
-        # CSV에 실제 Custom Charge가 있는 경우: 그 값을 그대로 M2로 사용
-        msp_invoice_amount = custom_charge_usd
-        msp_segi_amount = M1_FIXED
-    elif non_custom_charge_usd >= THRESHOLD:
-        msp_invoice_amount = non_custom_charge_usd * M2_RATE
-        msp_segi_amount = non_custom_charge_usd * M1_RATE
-    else:
-        msp_invoice_amount = M2_FIXED
-        msp_segi_amount = M1_FIXED
 
-    # 씨엘모빌리티 사용 MSP = M2 - M1
-    msp_ciel_usage = msp_invoice_amount - msp_segi_amount
+# 조회 결과 캐시 (작업 공간 + 데이터셋 버전 기준)
+query_cache = QueryResultCache(max_entries=int(os.environ.get('QUERY_CACHE_SIZE', 256)))
 
-    return {
-        'threshold': THRESHOLD,
-        'is_over_threshold': non_custom_charge_usd >= THRESHOLD,
-        'has_csv_custom_charge': custom_charge_usd >= CSV_CUSTOM_CHARGE_THRESHOLD,
-        'msp_invoice_amount': round(msp_invoice_amount, 2),  # M2: 세금계산서 발행 MSP
-        'msp_segi_amount': round(msp_segi_amount, 2),  # M1: 세기모빌리티 MSP
-        'msp_ciel_usage': round(msp_ciel_usage, 2)  # 씨엘모빌리티 사용 MSP
-    }
+# 서비스명 / Description 검색 색인 (작업 공간 + 데이터셋 버전 기준, 공개할 때 생성)
+search_indexes = SearchIndexCache(max_entries=int(os.environ.get('SEARCH_INDEX_CACHE_SIZE', 16)))
+
+
+def get_converter():
+    """환율 변환 기능이 통합된 변환기 (처음 사용할 때 생성)"""
+    global converter
+    if converter is None:
+        converter = CostDataConverterWithCurrency(auto_fetch=False)
+    return converter
+
+
+def current_workspace_id():
+    """
+    요청의 작업 공간 ID
+
+    X-Workspace-Id 헤더 또는 workspace 파라미터로 지정하면 같은 작업 공간을 여러 명이 함께 사용할 수 있고,
+    지정하지 않으면 세션마다 새 작업 공간을 만듭니다.
+    """
+    workspace_id = request.headers.get('X-Workspace-Id') or request.values.get('workspace')
+    if registry.is_valid_id(workspace_id):
+        return workspace_id
+    
+    if not registry.is_valid_id(session.get('workspace_id')):
+        session['workspace_id'] = uuid.uuid4().hex
+    return session['workspace_id']
+
+
+def get_workspace():
+    """현재 요청의 작업 공간"""
+    return registry.get(current_workspace_id())
+
+
+def snapshot_cache_version(workspace_id, snapshot):
+    """
+    캐시 키 / ETag에 쓰는 데이터셋 구분 값 (작업 공간 ID, 버전, 스냅샷 token)
+
+    버전 번호는 공유 저장소를 비우거나 재시작하면 다시 시작되므로, 공개할 때 정한 token을 함께 사용해서
+    브라우저에 남은 ETag가 다른 데이터셋과 같아지지 않도록 함
+    """
+    return (workspace_id, snapshot.version, snapshot.token)
+
+
+def publish_snapshot(workspace, snapshot):
+    """새 데이터셋 스냅샷 공개 (이전 버전의 캐시 항목은 더 이상 조회되지 않으므로 정리)"""
+    previous = snapshot_cache_version(workspace.workspace_id, workspace.snapshot)
+    if fact_store is not None:
+        # 새 버전을 저장하는 동안 팩트 테이블의 이전 버전을 조회하지 않도록 (그동안은 스냅샷으로 조회)
+        fact_store.invalidate(workspace.workspace_id)
+    snapshot = registry.publish(workspace, snapshot)
+    query_cache.invalidate([previous])
+    if fact_store is not None and snapshot.has_data:
+        try:
+            fact_store.load(
+                workspace.workspace_id, snapshot.version, snapshot.df,
+                token=snapshot.token, newer_only=registry.store is not None
+            )
+        except Exception as e:
+            # 팩트 테이블에 데이터셋이 없으면 조회는 스냅샷으로 처리되므로 공개는 그대로 진행
+            print(f"[ERROR] 팩트 테이블 저장 실패: {e}")
+    if snapshot.has_data:
+        try:
+            search_indexes.put(snapshot_cache_version(workspace.workspace_id, snapshot), SearchIndex(snapshot.df))
+        except Exception as e:
+            # 색인이 없으면 첫 검색에서 다시 만듦
+            print(f"[ERROR] 검색 색인 생성 실패: {e}")
+    return snapshot
+
+
+def finish_publish(workspace):
+    """
+    공개 후 처리 (작업 공간 lock을 놓은 뒤 호출) - 메모리 사용량 갱신
+
+    팩트 테이블 백엔드면 /api/data, /api/summary, /api/pivot을 SQL로 처리하므로 워커 메모리에서 DataFrame을 내보냄
+    (내보내기, 검색 등 DataFrame이 필요한 요청은 처음 접근할 때 공유 저장소 / 디스크에서 다시 읽음)
+    """
+    registry.update(workspace)
+    if fact_store is not None:
+        registry.release(workspace)
+
+
+def use_fact_store(args=None):
+    """
+    팩트 테이블(SQL)로 조회하는 요청인지
+
+    필터 식(filter 파라미터)은 DataFrame 마스크로 평가하므로 args에 있으면 DataFrame 사용
+    """
+    if args is not None and args.get('filter'):
+        return False
+    return fact_store is not None
+
+
+def fact_json_response(workspace_id, endpoint, compute):
+    """
+    팩트 테이블로 만든 캐시된 JSON 응답 (작업 공간 스냅샷을 읽지 않음)
+
+    캐시 키는 팩트 테이블에 저장된 버전 / 스냅샷 token으로 만들고, compute는 같은 token의 데이터셋인지
+    행을 읽는 트랜잭션 안에서 확인하므로 다른 버전의 결과가 이 키로 캐시되지 않음
+
+    Args:
+        workspace_id: 작업 공간 ID
+        endpoint: 캐시 구분 이름
+        compute: compute(token) - 응답 dict를 만드는 함수 (다른 버전이면 FactVersionChanged)
+
+    Returns:
+        응답 (팩트 테이블에 데이터셋이 없으면 None - 스냅샷으로 조회)
+    """
+    for _ in range(FACT_READ_RETRIES):
+        info = fact_store.dataset_info(workspace_id)
+        if info is None:
+            return None
+        try:
+            cache_version = (workspace_id, info['version'], info['token'])
+            return json_response(cache_version, endpoint, lambda: compute(info['token']))
+        except FactVersionChanged:
+            # 캐시 키를 만든 뒤 새 버전이 저장됨 - 새 버전 기준으로 다시 조회
+            continue
+    return None
+
+
+def cached_json_response(workspace, snapshot, endpoint, compute):
+    """
+    작업 공간 + 데이터셋 버전(token 포함) + 조회 조건 기준으로 캐시된 JSON 응답 반환 (ETag/If-None-Match 지원)
+
+    Args:
+        workspace: 작업 공간
+        snapshot: 요청 시작 시 읽은 데이터셋 스냅샷
+        endpoint: 캐시 구분 이름
+        compute: 응답 dict를 만드는 함수 (캐시 미스일 때만 호출)
+    """
+    return json_response(snapshot_cache_version(workspace.workspace_id, snapshot), endpoint, compute)
+
+
+def json_response(cache_version, endpoint, compute):
+    """
+    캐시된 JSON 응답 (ETag/If-None-Match 지원)
+
+    Args:
+        cache_version: 데이터셋 구분 값 (작업 공간 ID, 버전, 스냅샷 token)
+        endpoint: 캐시 구분 이름
+        compute: 응답 dict를 만드는 함수 (캐시 미스일 때만 호출)
+    """
+    key = query_cache.make_key(cache_version, endpoint, request.args)
+    etag, body = query_cache.get_or_compute(
+        key, lambda: app.json.dumps(compute()).encode('utf-8')
+    )
+
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 
 @app.route('/')
@@ -93,8 +298,13 @@ def index():
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
-    """CSV 파일 업로드 (다중 파일 지원)"""
-    global converter, current_data, current_df, ciel_data_list, segi_data_list, combined_data_list, combined_df
+    """
+    CSV 파일 업로드 (다중 파일 지원)
+    
+    파일을 저장한 뒤 변환/합치기/집계는 백그라운드 작업으로 실행하고 작업 ID를 바로 반환합니다.
+    진행 상태와 결과는 /api/jobs/<job_id>로 조회합니다. (wait=1이면 끝날 때까지 기다린 뒤 결과 반환)
+    """
+    workspace = get_workspace()
     
     if 'files' not in request.files:
         return jsonify({'error': '파일이 없습니다'}), 400
@@ -102,239 +312,492 @@ def upload_file():
     files = request.files.getlist('files')
     # 'data_type' 또는 'upload_type' 둘 다 지원 (프론트엔드에서 data_type을 사용함)
     upload_type = request.form.get('data_type') or request.form.get('upload_type', 'ciel')  # 'ciel' 또는 'segi'
+    upload_mode = request.form.get('mode', UPLOAD_MODE_REPLACE)
+    wait = request.form.get('wait', '').lower() in ('1', 'true', 'yes')
     print(f"[DEBUG] upload_type: {upload_type}")
     
     if not files or len(files) == 0:
         return jsonify({'error': '파일이 선택되지 않았습니다'}), 400
     
     try:
-        all_data = []
-        uploaded_files = []
-        duplicates_info = {'total': 0, 'removed': 0}
+        uploads = []
         
-        # 여러 파일 처리
+        # 업로드 내용을 메모리로 읽음 (디스크에 저장하지 않고 바로 변환 - 요청이 끝나면 스트림을 읽을 수 없음)
         for file in files:
             if file.filename == '':
                 continue
                 
-            if not file.filename.endswith('.csv'):
-                return jsonify({'error': f'{file.filename}: CSV 파일만 업로드 가능합니다'}), 400
+            if not file.filename.lower().endswith(UPLOAD_EXTENSIONS):
+                return jsonify({'error': f'{file.filename}: CSV 파일(.csv, .csv.gz, .zip)만 업로드 가능합니다'}), 400
             
-            # 파일 저장
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            # 데이터 변환기 초기화 (첫 번째 파일에서만)
-            if converter is None:
-                converter = CostDataConverterWithCurrency(auto_fetch=False)
+            content = file.stream.read()
+            uploads.append((filename, content))
             
-            # 데이터 변환
-            file_data = converter.convert_csv_file(filepath)
-            all_data.extend(file_data)
-            uploaded_files.append(filename)
+            # 원본 보관 (설정한 경우에만, 별도 스레드에서 저장)
+            if app.config['UPLOAD_AUDIT']:
+                audit_executor.submit(save_upload_audit, workspace.workspace_id, filename, content)
         
-        if len(all_data) == 0:
+        if not uploads:
             return jsonify({'error': '유효한 데이터가 없습니다'}), 400
         
-        # 중복 제거 비활성화 - CloudCheckr CSV는 같은 조건의 별개 레코드가 있을 수 있음
-        # 같은 날짜, 서비스, 설명, 환경, 비용이라도 별개의 리소스/사용량일 수 있음
-        print(f"[데이터 검사] 총 {len(all_data)}개 레코드")
-        duplicates_info['total'] = len(all_data)
-        duplicates_info['removed'] = 0
+        if upload_mode not in UPLOAD_MODES:
+            return jsonify({'error': f'잘못된 업로드 방식입니다: {upload_mode}'}), 400
         
-        # 중복 제거 없이 모든 데이터 사용
-        unique_data = all_data
+        job_id = jobs.submit(
+            workspace.workspace_id, 'upload', process_upload,
+            workspace.workspace_id, uploads, upload_type, upload_mode
+        )
+        return upload_job_response(job_id, wait)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def upload_job_response(job_id, wait):
+    """업로드 작업 응답 - 작업 ID(202) 또는 wait=1이면 끝날 때까지 기다린 뒤 결과"""
+    if wait:
+        job = jobs.wait(job_id)
+        if job['status'] == JOB_FAILED:
+            return jsonify({'error': job['error'], 'job_id': job_id}), 500
+        return jsonify(job['result'])
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': f'/api/jobs/{job_id}'
+    }), 202
+
+
+def chunked_upload_status(upload_id):
+    """현재 작업 공간의 분할 업로드 상태 (없거나 다른 작업 공간이면 None)"""
+    try:
+        status = upload_spool.status(upload_id)
+    except KeyError:
+        return None
+    if status['workspace_id'] != current_workspace_id():
+        return None
+    return status
+
+
+def chunked_upload_payload(status):
+    """분할 업로드 상태 응답"""
+    return {
+        'success': True,
+        'upload_id': status['upload_id'],
+        'filename': status['filename'],
+        'size': status['size'],
+        'chunk_size': status['chunk_size'],
+        'received': status['received'],
+        'complete': status['complete']
+    }
+
+
+@app.route('/api/uploads', methods=['POST'])
+def create_chunked_upload():
+    """
+    분할 업로드 시작 (MAX_CONTENT_LENGTH보다 큰 파일용)
+    
+    1. POST /api/uploads {"filename", "size", "checksum"(전체 SHA-256, 선택)} → upload_id, chunk_size
+    2. PUT /api/uploads/<upload_id>?offset=N (본문: 분할 내용, X-Chunk-Sha256 헤더 선택) - 실패하면 GET으로 received 확인 후 이어서 전송
+    3. POST /api/uploads/finalize {"upload_ids": [...], "data_type", "mode"} → 변환 작업 ID
+    """
+    data = request.get_json(silent=True) or {}
+    filename = secure_filename(data.get('filename') or '')
+    
+    if not filename.lower().endswith(UPLOAD_EXTENSIONS):
+        return jsonify({'error': f'{filename or "파일"}: CSV 파일(.csv, .csv.gz, .zip)만 업로드 가능합니다'}), 400
+    
+    try:
+        status = upload_spool.create(current_workspace_id(), filename, int(data.get('size', 0)), data.get('checksum'))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if ingest_executor is not None:
+        ingest_executor.submit(ingest_chunked_upload, status['upload_id'])
+    return jsonify(chunked_upload_payload(status)), 201
+
+
+def ingest_chunked_upload(upload_id):
+    """
+    받는 중인 분할 업로드를 분할이 도착하는 대로 읽어서 변환 (압축 해제/CSV 읽기는 전송과 함께 진행)
+    
+    마지막 분할까지 받으면 파일 내용 해시로 변환 결과 캐시에 저장하므로, 완료 요청 후 변환 작업은 다시 변환하지 않음
+    (새 분할이 오래 오지 않거나 변환에 실패하면 중단 - 완료 요청 후 변환 작업에서 변환하고 오류도 그때 알림)
+    """
+    try:
+        if not upload_spool.start_ingest(upload_id):
+            return
+    except KeyError:
+        return
+    
+    try:
+        with upload_spool.open_received(upload_id) as stream:
+            df = convert_csv_file_to_frame(stream)
+            # Cost by Group 이후는 읽지 않으므로 끝까지 받을 때까지 기다린 뒤 전체 내용으로 캐시 키 계산
+            stream.seek(0, os.SEEK_END)
+        frame_cache.put(frame_cache.source_key(upload_spool.data_path(upload_id)), df)
+        print(f"[DEBUG] 분할 업로드 미리 변환 완료: {upload_id} ({len(df)}건)")
+    except (KeyError, OSError, ValueError) as e:
+        print(f"[DEBUG] 분할 업로드 미리 변환 중단: {upload_id} - {e}")
+    finally:
+        upload_spool.finish_ingest(upload_id)
+
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def get_chunked_upload(upload_id):
+    """분할 업로드 상태 조회 (이어 보낼 위치 = received)"""
+    status = chunked_upload_status(upload_id)
+    if status is None:
+        return jsonify({'error': '업로드를 찾을 수 없습니다'}), 404
+    return jsonify(chunked_upload_payload(status))
+
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+def put_upload_chunk(upload_id):
+    """분할 전송 (offset 위치부터, 요청 본문 = 분할 내용)"""
+    status = chunked_upload_status(upload_id)
+    if status is None:
+        return jsonify({'error': '업로드를 찾을 수 없습니다'}), 404
+    
+    offset = request.args.get('offset', type=int)
+    if offset is None or offset < 0:
+        return jsonify({'error': 'offset 파라미터가 필요합니다'}), 400
+    
+    try:
+        received = upload_spool.write_chunk(
+            upload_id,
+            offset,
+            request.get_data(cache=False),
+            request.headers.get('X-Chunk-Sha256')
+        )
+    except ChunkOffsetError as e:
+        return jsonify({'error': str(e), 'received': e.received}), 409
+    except UploadFinalizingError as e:
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'upload_id': upload_id,
+        'received': received,
+        'complete': received == status['size']
+    })
+
+
+@app.route('/api/uploads/finalize', methods=['POST'])
+def finalize_chunked_upload():
+    """분할 업로드 완료 - 받은 파일들을 하나의 업로드로 변환 (작업 ID 반환, wait=1이면 결과)"""
+    workspace = get_workspace()
+    data = request.get_json(silent=True) or {}
+    upload_ids = data.get('upload_ids') or []
+    upload_type = data.get('data_type') or data.get('upload_type', 'ciel')
+    upload_mode = data.get('mode', UPLOAD_MODE_REPLACE)
+    wait = str(data.get('wait', '')).lower() in ('1', 'true', 'yes')
+    
+    if not upload_ids:
+        return jsonify({'error': 'upload_ids가 필요합니다'}), 400
+    if upload_mode not in UPLOAD_MODES:
+        return jsonify({'error': f'잘못된 업로드 방식입니다: {upload_mode}'}), 400
+    
+    # 완료 표시는 업로드마다 한 요청만 성공 (동시에 완료하면 409) - 체크섬 확인은 변환 작업에서
+    uploads = []
+    error = None
+    for upload_id in upload_ids:
+        status = chunked_upload_status(upload_id)
+        if status is None:
+            error = (f'업로드를 찾을 수 없습니다: {upload_id}', 404)
+            break
+        try:
+            uploads.append((status['filename'], upload_spool.claim(upload_id)))
+        except UploadFinalizingError as e:
+            error = (str(e), 409)
+            break
+        except (KeyError, ValueError) as e:
+            error = (str(e) or f'업로드를 찾을 수 없습니다: {upload_id}', 400)
+            break
+    if error:
+        for upload_id in upload_ids[:len(uploads)]:
+            upload_spool.release(upload_id)
+        return jsonify({'error': error[0]}), error[1]
+    
+    job_id = jobs.submit(
+        workspace.workspace_id, 'upload', process_chunked_upload,
+        workspace.workspace_id, upload_ids, uploads, upload_type, upload_mode
+    )
+    for upload_id in upload_ids:
+        upload_spool.attach_job(upload_id, job_id)
+    return upload_job_response(job_id, wait)
+
+
+def process_chunked_upload(workspace_id, upload_ids, uploads, upload_type, mode, report):
+    """
+    분할 업로드 변환 작업 - 미리 변환이 끝나기를 기다리고 전체 체크섬 확인 후 변환, 끝나면(실패 포함) 받은 파일 정리
+    (UPLOAD_AUDIT이면 원본 보관 폴더로 이동)
+    """
+    try:
+        report('verify', 0, '파일 체크섬 확인 중')
+        for upload_id in upload_ids:
+            # 받는 동안 미리 변환 중이면 끝나기를 기다림 (변환 결과 캐시에서 읽음)
+            upload_spool.wait_ingest(upload_id)
+            upload_spool.verify(upload_id)
+        return process_upload(workspace_id, uploads, upload_type, mode, report)
+    finally:
+        for upload_id, (filename, path) in zip(upload_ids, uploads):
+            if app.config['UPLOAD_AUDIT']:
+                timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+                shutil.move(path, os.path.join(app.config['UPLOAD_FOLDER'], f'{timestamp}_{workspace_id}_{filename}'))
+            upload_spool.discard(upload_id)
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """백그라운드 작업 상태 조회 (단계, 진행률, 끝나면 결과 또는 오류)"""
+    job = jobs.get(job_id)
+    
+    # 다른 작업 공간의 작업은 조회할 수 없음
+    if job is None or job['workspace_id'] != current_workspace_id():
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    
+    return jsonify({
+        'success': True,
+        'job_id': job['job_id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'stage': job['stage'],
+        'progress': job['progress'],
+        'message': job['message'],
+        'result': job['result'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    })
+
+
+def save_upload_audit(workspace_id, filename, content):
+    """업로드 원본 보관 (UPLOAD_AUDIT 설정 시 - 같은 이름의 파일을 덮어쓰지 않도록 시각/작업 공간을 붙임)"""
+    try:
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'{timestamp}_{workspace_id}_{filename}')
+        with open(filepath, 'wb') as f:
+            f.write(content)
+        print(f"[DEBUG] 업로드 원본 보관: {filepath}")
+    except OSError as e:
+        print(f"[ERROR] 업로드 원본 보관 실패: {filename} - {e}")
+
+
+def process_upload(workspace_id, uploads, upload_type, mode, report):
+    """
+    업로드 작업 실행: 파일 변환(프로세스 풀) → 합치기 → 요약 집계
+    
+    Args:
+        workspace_id: 작업 공간 ID
+        uploads: (파일 이름, 파일 내용 bytes 또는 파일 경로) 목록
+        upload_type: 'ciel' 또는 'segi'
+        mode: 'replace' (기존 데이터 교체) 또는 'incremental' (바뀐 날짜만 교체, 새 날짜 추가)
+        report: 진행 상태 알림 함수 report(stage, progress, message)
         
-        print(f"[데이터 검사] 최종: {len(unique_data)}건 (중복 제거 비활성화됨)")
+    Returns:
+        dict: 업로드 결과 (파일 목록, 요약 정보)
+    """
+    workspace = registry.get(workspace_id)
+    converter = get_converter()
+    uploaded_files = [filename for filename, _ in uploads]
+    duplicates_info = {'total': 0, 'removed': 0}
+    days_field = 'segi_days' if upload_type == 'segi' else 'ciel_days'
+    incremental = None
+    partitions = None
+    
+    if mode == UPLOAD_MODE_INCREMENTAL:
+        # 날짜별 원본 해시를 비교해서 바뀐 날짜 / 새 날짜만 변환
+        report('parse', 0, f'{len(uploads)}개 파일에서 바뀐 날짜 확인 중')
+        with workspace.lock:
+            registry.refresh(workspace)
+            base = workspace.snapshot
+        incremental = incremental_update(
+            converter,
+            [content for _, content in uploads],
+            base.segi_df if upload_type == 'segi' else base.ciel_df,
+            getattr(base, days_field)
+        )
+        upload_df = incremental.df
+    else:
+        # 여러 파일을 동시에 변환 (파일별 DataFrame을 합침)
+        report('parse', 0, f'{len(uploads)}개 파일 변환 중')
+        upload_df = converter.convert_csv_files(
+            [content for _, content in uploads],
+            max_workers=INGEST_WORKERS,
+            cache=frame_cache,
+            on_file_done=lambda done, index: report(
+                'parse', 60 * done // len(uploads), f'{uploaded_files[index]} 변환 완료'
+            )
+        )
+        if upload_df is not None and len(upload_df):
+            # 다음 증분 업로드가 같은 날짜를 다시 변환하지 않도록 날짜별 해시도 저장
+            partitions = source_partitions(converter, [content for _, content in uploads])
+    
+    if upload_df is None or len(upload_df) == 0:
+        raise ValueError('유효한 데이터가 없습니다')
+    
+    # 중복 제거 비활성화 - CloudCheckr CSV는 같은 조건의 별개 레코드가 있을 수 있음
+    # 같은 날짜, 서비스, 설명, 환경, 비용이라도 별개의 리소스/사용량일 수 있음
+    print(f"[데이터 검사] 총 {len(upload_df)}개 레코드")
+    duplicates_info['total'] = len(upload_df)
+    duplicates_info['removed'] = 0
+    
+    print(f"[데이터 검사] 최종: {len(upload_df)}건 (중복 제거 비활성화됨)")
+    
+    # 환경값 확인 (data_converter에서 이미 정규화됨)
+    env_values = set(upload_df['environment'].dropna())
+    orig_env_values = set(value for value in upload_df['original_environment'].dropna() if value)
+    print(f"[DEBUG] 환경값들: {env_values}")
+    print(f"[DEBUG] 원본 환경값들: {orig_env_values}")
+    
+    report('merge', 70, '데이터 합치는 중')
+    
+    # 새 스냅샷 공개 (같은 작업 공간의 다른 업로드/환율 설정과 겹치지 않도록 쓰기만 직렬화)
+    with workspace.lock:
+        registry.refresh(workspace)  # 다른 워커가 저장한 최신 버전 기준으로 변경
+        snapshot = workspace.snapshot
         
-        # 환경값 확인 (data_converter에서 이미 정규화됨)
-        env_values = set(item.environment for item in unique_data)
-        orig_env_values = set(item.original_environment for item in unique_data if item.original_environment)
-        print(f"[DEBUG] 환경값들: {env_values}")
-        print(f"[DEBUG] 원본 환경값들: {orig_env_values}")
+        if incremental is not None and snapshot.version != base.version:
+            # 바뀐 날짜를 확인하는 동안 다른 업로드/환율 변경이 먼저 반영됨 - 최신 데이터 기준으로 다시 반영
+            incremental = incremental_update(
+                converter,
+                [content for _, content in uploads],
+                snapshot.segi_df if upload_type == 'segi' else snapshot.ciel_df,
+                getattr(snapshot, days_field)
+            )
+            upload_df = incremental.df
         
-        # upload_type에 따라 데이터 저장
+        # upload_type에 따라 데이터 저장 (날짜별 해시 포함)
         if upload_type == 'segi':
-            segi_data_list = unique_data
-            print(f"[DEBUG] 세기모빌리티 데이터 저장: {len(unique_data)}건")
+            changes = {'segi_df': upload_df}
+            print(f"[DEBUG] 세기모빌리티 데이터 저장: {len(upload_df)}건")
         else:
-            ciel_data_list = unique_data
-            print(f"[DEBUG] 씨엘모빌리티 데이터 저장: {len(unique_data)}건")
+            changes = {'ciel_df': upload_df}
+            print(f"[DEBUG] 씨엘모빌리티 데이터 저장: {len(upload_df)}건")
+        changes[days_field] = incremental.partitions if incremental is not None else partitions
+        
+        ciel_df = changes.get('ciel_df', snapshot.ciel_df)
+        segi_df = changes.get('segi_df', snapshot.segi_df)
         
         # 두 파일이 모두 있으면 합치기
-        if ciel_data_list and segi_data_list:
-            # 씨엘 파일에서 smartmobility 환경 데이터를 제외
-            # 방법 1: env 태그가 smartmobility인 레코드 제외 (env 태그가 있는 경우)
-            # 방법 2: 세기 파일과 동일한 레코드 제외 (씨엘 파일이 전체 청구서인 경우 - env 태그 없음)
-            segi_key_counter = Counter()
-            for item in segi_data_list:
-                key = (
-                    str(item.date)[:10],
-                    item.service_name,
-                    item.description,
-                    round(float(item.cost), 2)
-                )
-                segi_key_counter[key] += 1
-
-            remaining_segi = dict(segi_key_counter)
-            ciel_filtered = []
-            for item in ciel_data_list:
-                if item.environment == 'smartmobility':
-                    continue  # env 태그로 명시된 smartmobility 제외
-                match_key = (
-                    str(item.date)[:10],
-                    item.service_name,
-                    item.description,
-                    round(float(item.cost), 2)
-                )
-                if remaining_segi.get(match_key, 0) > 0:
-                    remaining_segi[match_key] -= 1
-                    continue  # 세기 파일과 동일한 레코드이므로 제외 (cielmobility는 순수 씨엘 비용만)
-                ciel_filtered.append(item)
-
-            print(f"[DEBUG] 씨엘 데이터에서 smartmobility/세기 중복 제외: {len(ciel_data_list)} -> {len(ciel_filtered)}건")
-            
-            # 필터링된 씨엘 데이터 + 세기 데이터 합침
-            all_combined = ciel_filtered + segi_data_list
-            
-            # 각 파일 내 중복만 제거 (원본 환경값 기준)
-            seen = set()
-            combined_unique = []
-            for idx, item in enumerate(all_combined):
-                # 원본 환경값 사용 (정규화 전 값)
-                original_env = getattr(item, 'original_environment', item.environment) or ''
-                # 출처 구분 (씨엘 필터링 데이터 vs 세기 데이터)
-                source = 'ciel' if idx < len(ciel_filtered) else 'segi'
-                key = (
-                    str(item.date),
-                    item.service_name,
-                    item.description,
-                    original_env,  # 원본 환경값 사용
-                    float(item.cost),
-                    source  # 출처를 키에 포함
-                )
-                if key not in seen:
-                    seen.add(key)
-                    combined_unique.append(item)
-            
-            combined_data_list = combined_unique
-            print(f"[DEBUG] 합쳐진 데이터: {len(combined_data_list)}건")
-            # 합쳐진 데이터를 사용
-            current_data = combined_data_list
+        if ciel_df is not None and len(ciel_df) and segi_df is not None and len(segi_df):
+            changes['df'] = merge_company_frames(ciel_df, segi_df)
         else:
             # 하나의 파일만 업로드된 경우
-            current_data = unique_data
-        
-        # DataFrame 생성 (환율 적용 전) - 합쳐진 데이터 기준
-        current_df = converter.to_dataframe(current_data)
-        combined_df = current_df  # API에서 사용할 수 있도록
-        
-        # 요약 정보 - 현재 업로드한 파일의 데이터만 기준으로 계산
-        summary = converter.get_summary_stats(unique_data)
-        
-        # 성공 메시지에 중복 제거 정보 포함
-        message = f'{len(uploaded_files)}개 파일, 총 {len(unique_data)}개 레코드 업로드 완료'
-        if duplicates_info['removed'] > 0:
-            message += f' (중복 {duplicates_info["removed"]}건 제거됨)'
-        
-        # 일별 비용 집계 (Custom Charge 제외) - 현재 업로드한 파일 기준
-        daily_costs = {}
-        for item in unique_data:
-            service_name = (item.service_name or '').lower()
-            # Custom Charge는 일별 비용에서 제외
-            if 'custom charge' in service_name:
-                continue
-            date_str = str(item.date)[:10]  # YYYY-MM-DD
-            if date_str not in daily_costs:
-                daily_costs[date_str] = 0
-            daily_costs[date_str] += float(item.cost)
-        
-        # 환경별 일별 비용 집계 (Custom Charge 제외) - 현재 업로드한 파일 기준
-        daily_costs_by_env = {}
-        environments = set()
-        for item in unique_data:
-            service_name = (item.service_name or '').lower()
-            # Custom Charge는 일별 비용에서 제외
-            if 'custom charge' in service_name:
-                continue
-            env = item.environment or 'Unknown'
-            environments.add(env)
-            date_str = str(item.date)[:10]
-            
-            if env not in daily_costs_by_env:
-                daily_costs_by_env[env] = {}
-            if date_str not in daily_costs_by_env[env]:
-                daily_costs_by_env[env][date_str] = 0
-            daily_costs_by_env[env][date_str] += float(item.cost)
-        
-        # 환경별 총 비용 계산 - 현재 업로드한 파일 기준
-        # smartmobility가 포함된 데이터가 있는지 확인
-        has_smartmobility = any('smartmobility' in (item.environment or '').lower() for item in unique_data)
-        
-        cielmobility_usd = 0
-        smartmobility_usd = 0
-        
-        # MSP 계산용 변수 (cielmobility 환경에서)
-        custom_charge_usd = 0  # Custom Charge 금액
-        non_custom_charge_usd = 0  # Custom Charge 외 금액
-        
-        for item in unique_data:
-            env = (item.environment or '').lower()
-            cost = float(item.cost)
-            service_name = (item.service_name or '').lower()
-            
-            if 'smartmobility' in env:
-                smartmobility_usd += cost
-            else:
-                cielmobility_usd += cost
-                # cielmobility 환경에서 Custom Charge 구분
-                if 'custom charge' in service_name:
-                    custom_charge_usd += cost
-                else:
-                    non_custom_charge_usd += cost
+            changes['df'] = upload_df
         
-        # MSP 비용 계산 (cielmobility 환경 기준)
-        msp_info = calculate_msp_costs(non_custom_charge_usd, custom_charge_usd)
+        # 환율 적용 전 데이터로 교체
+        changes['exchange_rate'] = None
+        publish_snapshot(workspace, snapshot.next_version(**changes))
+    
+    finish_publish(workspace)
+    
+    # 월별 비용 이력에도 저장 (저장 실패는 업로드 결과에 영향 없음)
+    if history_store is not None:
+        report('history', 80, '월별 이력 저장 중')
+        try:
+            history_store.save(
+                upload_type if upload_type == 'segi' else 'ciel', upload_df, workspace_id=workspace.workspace_id
+            )
+        except Exception as e:
+            print(f"[ERROR] 비용 이력 저장 실패: {e}")
+    
+    report('aggregate', 85, '요약 정보 계산 중')
+    
+    # 성공 메시지에 중복 제거 정보 포함
+    message = f'{len(uploaded_files)}개 파일, 총 {len(upload_df)}개 레코드 업로드 완료'
+    if duplicates_info['removed'] > 0:
+        message += f' (중복 {duplicates_info["removed"]}건 제거됨)'
+    
+    result = {
+        'success': True,
+        'message': message,
+        'files': uploaded_files,
+        'duplicates': duplicates_info,
+        # 요약 정보 - 현재 업로드한 파일의 데이터만 기준으로 계산 (증분 반영이면 반영 후 전체)
+        'summary': build_upload_summary(converter, upload_df)
+    }
+    
+    if incremental is not None:
+        result['incremental'] = incremental.stats()
+        result['message'] += (
+            f' (유지 {len(incremental.unchanged_days)}일, 교체 {len(incremental.replaced_days)}일, '
+            f'추가 {len(incremental.added_days)}일)'
+        )
+    
+    return result
+
+
+def build_upload_summary(converter, df):
+    """
+    업로드 결과 요약 (현재 업로드한 파일 기준)
+    
+    Args:
+        converter: 변환기
+        df: 업로드한 파일의 표준 데이터 DataFrame
         
-        return jsonify({
-            'success': True,
-            'message': message,
-            'files': uploaded_files,
-            'duplicates': duplicates_info,
-            'summary': {
-                'total_records': summary['total_records'],
-                'total_cost_usd': float(summary['total_cost']),
-                'cielmobility_usd': cielmobility_usd,
-                'smartmobility_usd': smartmobility_usd,
-                'has_smartmobility': has_smartmobility,
-                'custom_charge_usd': custom_charge_usd,
-                'non_custom_charge_usd': non_custom_charge_usd,
-                'msp_info': msp_info,
-                'date_range': {
-                    'start': str(summary['date_range']['start']),
-                    'end': str(summary['date_range']['end'])
-                },
-                'services': list(summary['cost_by_service'].keys()),
-                'service_costs': {k: float(v) for k, v in summary['cost_by_service'].items()},
-                'daily_costs': daily_costs,
-                'daily_costs_by_env': daily_costs_by_env,
-                'environments': sorted(list(environments))
-            }
-        })
+    Returns:
+        dict: 총 비용, 환경별 비용, MSP, 일별 비용 등
+    """
+    summary = converter.get_dataframe_summary_stats(df)
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    # 일별 비용 집계 (Custom Charge 제외)
+    daily_df = df[~custom_charge_mask(df)]
+    days = daily_df['date'].astype(str).str[:10]  # YYYY-MM-DD
+    costs = daily_df['cost'].astype(float)
+    daily_costs = costs.groupby(days).sum().to_dict()
+    
+    # 환경별 일별 비용 집계 (Custom Charge 제외)
+    envs = daily_df['environment'].fillna('').astype(str).replace('', 'Unknown')
+    daily_costs_by_env = {}
+    for (env, date_str), cost in costs.groupby([envs, days]).sum().items():
+        daily_costs_by_env.setdefault(env, {})[date_str] = cost
+    
+    # 라인 항목 분류별 비용 (Custom Charge, Tax, Credit/Refund, Support, Usage)
+    line_item_costs = df['cost'].astype(float).groupby(line_item_classes(df), observed=False).sum()
+    
+    # 테넌트별 총 비용 + MSP 계산용 Custom Charge 구분 (기본 테넌트 cielmobility 기준)
+    allocation = default_allocation()
+    env_costs = split_environment_costs(df, allocation)
+    msp_info = calculate_msp_costs(env_costs['non_custom_charge_usd'], env_costs['custom_charge_usd'])
+    
+    return {
+        'total_records': summary['total_records'],
+        'total_cost_usd': float(summary['total_cost']),
+        'cielmobility_usd': env_costs['cielmobility_usd'],
+        'smartmobility_usd': env_costs['smartmobility_usd'],
+        'has_smartmobility': env_costs['has_smartmobility'],
+        'custom_charge_usd': env_costs['custom_charge_usd'],
+        'non_custom_charge_usd': env_costs['non_custom_charge_usd'],
+        'msp_info': msp_info,
+        'tenants': allocation.allocate(df, msp_info['msp_invoice_amount']),
+        'line_item_costs': {name: float(cost) for name, cost in line_item_costs.items()},
+        'date_range': {
+            'start': str(summary['date_range']['start']),
+            'end': str(summary['date_range']['end'])
+        },
+        'services': list(summary['cost_by_service'].keys()),
+        'service_costs': {k: float(v) for k, v in summary['cost_by_service'].items()},
+        'daily_costs': daily_costs,
+        'daily_costs_by_env': daily_costs_by_env,
+        'environments': sorted(daily_costs_by_env.keys())
+    }
 
 
 @app.route('/api/exchange-rate/fetch', methods=['POST'])
 def fetch_exchange_rate():
     """환율 API에서 자동 조회 (SMBS 또는 한국수출입은행)"""
-    global converter
+    workspace = get_workspace()
     
-    if not converter:
+    if not workspace.has_data:
         return jsonify({'error': '먼저 파일을 업로드하세요'}), 400
     
+    converter = get_converter()
+    
     try:
         data = request.get_json()
         api_source = data.get('source', 'smbs')  # 'smbs' 또는 'koreaexim'
@@ -440,11 +903,13 @@ def fetch_exchange_rate():
 @app.route('/api/exchange-rate', methods=['POST'])
 def set_exchange_rate():
     """환율 설정 (수동 또는 자동)"""
-    global converter, current_data, current_df
+    workspace = get_workspace()
     
-    if not converter or not current_data:
+    if not workspace.has_data:
         return jsonify({'error': '먼저 파일을 업로드하세요'}), 400
     
+    converter = get_converter()
+    
     try:
         data = request.get_json()
         rate = float(data.get('rate', 0))
@@ -453,219 +918,718 @@ def set_exchange_rate():
         if rate <= 0:
             return jsonify({'error': '유효한 환율을 입력하세요'}), 400
         
-        # 기존 데이터프레임 초기화 (새로운 환율로 재계산)
-        global current_df
+        target_date = datetime.strptime(rate_date, '%Y-%m-%d').date()
         
-        # 환율 설정 (기존 환율 덮어쓰기)
+        # 환율 이력 저장 (기존 환율 덮어쓰기 - 모든 작업 공간이 함께 쓰는 환율 저장소)
         print(f"[DEBUG] 환율 설정: {rate} KRW, 날짜: {rate_date}")
-        converter.add_manual_exchange_rate(
-            rate=rate,
-            target_date=datetime.strptime(rate_date, '%Y-%m-%d').date()
-        )
+        converter.add_manual_exchange_rate(rate=rate, target_date=target_date)
         
-        # KRW 환산 DataFrame 재생성
+        # KRW 환산 DataFrame 재생성 (요청한 환율로 계산 - 다른 작업 공간이 저장한 환율과 무관하게
+        # 스냅샷의 exchange_rate와 cost_krw가 항상 같은 환율)
         print(f"[DEBUG] DataFrame 재생성 중...")
-        current_df = converter.to_dataframe_with_krw(current_data)
+        with workspace.lock:
+            registry.refresh(workspace)
+            snapshot = workspace.snapshot
+            df_krw = converter.apply_exchange_rate(snapshot.df, rate, target_date)
+            publish_snapshot(workspace, snapshot.next_version(df=df_krw, exchange_rate=rate))
+        finish_publish(workspace)
         
         # 요약 정보 재계산
         print(f"[DEBUG] 요약 정보 재계산 중...")
-        summary = converter.get_summary_stats_with_krw(current_data)
+        summary = build_rate_summary(df_krw, rate)
         
-        print(f"[DEBUG] 총 비용 KRW: {summary.get('total_cost_krw', 0):,.0f}")
+        print(f"[DEBUG] 총 비용 KRW: {summary['total_cost_krw']:,.0f}")
         print(f"[DEBUG] 환율: {rate}")
         
         return jsonify({
             'success': True,
             'message': f'환율 설정 완료: 1 USD = {rate:,.2f} KRW',
-            'summary': {
-                'total_cost_usd': float(summary['total_cost']),
-                'total_cost_krw': float(summary.get('total_cost_krw', 0)),
-                'exchange_rate': rate
-            }
+            'summary': summary
         })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def build_rate_summary(df_krw, rate):
+    """환율 적용 후 합계 (USD, KRW, 환율)"""
+    return {
+        'total_cost_usd': float(df_krw['cost'].sum()),
+        'total_cost_krw': float(df_krw['cost_krw'].sum()) if df_krw['cost_krw'].notna().any() else 0.0,
+        'exchange_rate': rate
+    }
+
+
+@app.route('/api/dataset')
+def get_dataset_state():
+    """
+    작업 공간의 현재 데이터셋 상태 (페이지를 다시 열거나 서버가 재시작된 뒤 화면 복원용)
+    
+    공유 저장소에 저장된 최신 버전을 처음 접근할 때 memory-map으로 다시 읽으므로 다시 업로드할 필요가 없습니다.
+    """
+    workspace = get_workspace()
+    snapshot = workspace.snapshot
+    
+    def compute():
+        converter = get_converter()
+        payload = {
+            'success': True,
+            'has_data': snapshot.has_data,
+            'version': snapshot.version,
+            'exchange_rate': snapshot.exchange_rate,
+            'rate_summary': None
+        }
+        for upload_type, frame in (('ciel', snapshot.ciel_df), ('segi', snapshot.segi_df)):
+            payload[upload_type] = {
+                'success': True,
+                'restored': True,
+                'files': [],
+                'summary': build_upload_summary(converter, frame)
+            } if frame is not None and len(frame) else None
+        if snapshot.exchange_rate and snapshot.has_data and 'cost_krw' in snapshot.df.columns:
+            payload['rate_summary'] = build_rate_summary(snapshot.df, snapshot.exchange_rate)
+        return payload
+    
+    return cached_json_response(workspace, snapshot, 'dataset', compute)
+
+
 @app.route('/api/data')
 def get_data():
-    """데이터 조회 (필터링 지원)"""
-    global current_df
+    """데이터 조회 (필터링 지원 - 팩트 테이블 백엔드면 스냅샷을 읽지 않고 SQL로 조회)"""
+    try:
+        if use_fact_store(request.args):
+            workspace_id = current_workspace_id()
+            response = fact_json_response(
+                workspace_id, 'data', lambda token: build_fact_data_payload(workspace_id, request.args, token)
+            )
+            if response is not None:
+                return response
+        
+        workspace = get_workspace()
+        snapshot = workspace.snapshot  # 요청 동안 같은 버전을 사용 (업로드 중에도 잠금 없이 읽기)
+        if snapshot.df is None:
+            return jsonify({'error': '데이터가 없습니다'}), 400
+        df = snapshot.df
+        return cached_json_response(workspace, snapshot, 'data', lambda: build_data_payload(df, request.args))
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def build_data_payload(df, args):
+    """
+    /api/data 응답 생성 (필터링, 정렬, 페이지네이션, 컬럼 선택)
+
+    Args:
+        df: 조회 대상 DataFrame
+        args: 조회 파라미터 (request.args)
+    """
+    df = filter_dataframe(df, args)
+    
+    # 페이지네이션
+    page = int(args.get('page', 1))
+    per_page = int(args.get('per_page', 50))
+    start = (page - 1) * per_page
+    end = start + per_page
+    
+    # 정렬
+    sort_by = args.get('sort_by', 'cost_krw')
+    sort_order = args.get('sort_order', 'desc')
+    
+    if sort_by in df.columns:
+        df = sort_dataframe(df, sort_by, ascending=(sort_order == 'asc'))
+    
+    total_records = len(df)
+    df_page = df.iloc[start:end]
+    
+    return build_page_payload(df_page, total_records, page, per_page, args)
+
+
+def build_fact_data_payload(workspace_id, args, token=None):
+    """
+    /api/data 응답 생성 (팩트 테이블 - 필터, 정렬, 페이지를 SQL로 처리)
+
+    Args:
+        workspace_id: 작업 공간 ID
+        args: 조회 파라미터 (request.args)
+        token: 조회할 스냅샷 token (저장된 데이터셋이 다르면 FactVersionChanged)
+    """
+    page = int(args.get('page', 1))
+    per_page = int(args.get('per_page', 50))
+    
+    df_page, total_records = fact_store.query_page(
+        workspace_id,
+        filters=fact_filters(args),
+        sort_by=args.get('sort_by', 'cost_krw'),
+        ascending=(args.get('sort_order', 'desc') == 'asc'),
+        offset=(page - 1) * per_page,
+        limit=per_page,
+        token=token
+    )
+    return build_page_payload(df_page, total_records, page, per_page, args)
+
+
+def fact_filters(args):
+    """조회 파라미터를 팩트 테이블 조건으로 변환 (filter_dataframe과 같은 조건)"""
+    services = args.get('services')
+    filters = {
+        'services': [s.strip() for s in services.split(',')] if services else None,
+        'environment': args.get('environment'),
+        'project': args.get('project'),
+        'date_start': args.get('date_start'),
+        'date_end': args.get('date_end'),
+    }
+    for column in ATTRIBUTE_COLUMNS:
+        if args.get(column):
+            filters[column] = [v.strip() for v in args[column].split(',')]
+    return filters
+
+
+def build_page_payload(df_page, total_records, page, per_page, args):
+    """
+    페이지 DataFrame을 /api/data 응답으로 변환 (컬럼 선택, JSON 형식)
+
+    Args:
+        df_page: 현재 페이지 DataFrame
+        total_records: 조건에 맞는 전체 행 수
+        page: 페이지 번호
+        per_page: 페이지 크기
+        args: 조회 파라미터 (request.args)
+    """
+    # 컬럼 선택 (fields=service_name,cost,... 쉼표 구분)
+    fields = args.get('fields')
+    if fields:
+        df_page = project_columns(df_page, [f.strip() for f in fields.split(',') if f.strip()])
+    
+    # JSON 변환 (format=columnar이면 컬럼 단위 + 사전 인코딩)
+    if args.get('format') == 'columnar':
+        records = to_columnar(df_page)
+    else:
+        records = to_records(df_page)
+    
+    return {
+        'success': True,
+        'data': records,
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': total_records,
+            'total_pages': (total_records + per_page - 1) // per_page
+        }
+    }
+
+
+def filter_dataframe(df, args):
+    """
+    조회 파라미터로 DataFrame 필터링 (services, environment, project, date_start, date_end,
+    Description 속성 pricing_model, operating_system, instance_family 등 - 쉼표로 여러 값,
+    filter 필터 식 - 예: service_name in ('EC2', 'RDS') and cost >= 10, src/dataset/filter_expr.py 참고)
+
+    Args:
+        df: 조회 대상 DataFrame
+        args: 조회 파라미터 (request.args)
+    """
+    services = args.get('services')  # 다중 선택 (쉼표 구분)
+    environment = args.get('environment')
+    project = args.get('project')
+    date_start = args.get('date_start')  # 기간 시작
+    date_end = args.get('date_end')  # 기간 끝
+    
+    # 조건을 하나의 마스크로 모은 뒤 마지막에 한 번만 행 선택 (전체 복사 없음)
+    mask = pd.Series(True, index=df.index)
+    
+    if services:
+        service_list = [s.strip() for s in services.split(',')]
+        mask &= df['service_name'].isin(service_list)
+    
+    if environment:
+        mask &= df['environment'] == environment
+    
+    if project:
+        mask &= df['project'] == project
+    
+    for column in ATTRIBUTE_COLUMNS:
+        values = args.get(column)
+        if values and column in df.columns:
+            mask &= df[column].isin([v.strip() for v in values.split(',')])
+    
+    # 날짜 필터링 (시작일과 종료일이 같으면 특정 날짜, 다르면 기간)
+    if date_start or date_end:
+        date_str = df['date'].astype(str).str[:10]
+        if date_start:
+            mask &= date_str >= date_start
+        if date_end:
+            mask &= date_str <= date_end
+    
+    # 필터 식 (같은 식은 캐시된 실행 계획으로 평가)
+    expression = args.get('filter')
+    if expression:
+        mask &= compile_filter(expression).evaluate(df)
+    
+    return df[mask]
+
+
+@app.route('/api/search')
+def search_data():
+    """
+    서비스명 / Description 검색 (예: q=natgateway, q=DataTransfer-Out)
+    
+    파라미터: q (단어를 모두 포함하는 라인, 단어로 시작하는 용어도 일치 - prefix=0이면 정확히 일치),
+    /api/data와 같은 필터 / 정렬 / 페이지 / fields
+    """
+    workspace = get_workspace()
+    snapshot = workspace.snapshot  # 요청 동안 같은 버전을 사용 (업로드 중에도 잠금 없이 읽기)
+    current_df = snapshot.df
     
     if current_df is None:
         return jsonify({'error': '데이터가 없습니다'}), 400
     
     try:
-        df = current_df.copy()
-        
-        # 필터링
-        services = request.args.get('services')  # 다중 선택 (쉼표 구분)
-        environment = request.args.get('environment')
-        project = request.args.get('project')
-        date_start = request.args.get('date_start')  # 기간 시작
-        date_end = request.args.get('date_end')  # 기간 끝
-        
-        if services:
-            service_list = [s.strip() for s in services.split(',')]
-            df = df[df['service_name'].isin(service_list)]
-        
-        if environment:
-            df = df[df['environment'] == environment]
-        
-        if project:
-            df = df[df['project'] == project]
-        
-        # 날짜 필터링 (시작일과 종료일이 같으면 특정 날짜, 다르면 기간)
-        if date_start or date_end:
-            df['date_str'] = df['date'].astype(str).str[:10]
-            if date_start:
-                df = df[df['date_str'] >= date_start]
-            if date_end:
-                df = df[df['date_str'] <= date_end]
-            df = df.drop(columns=['date_str'])
-        
-        # 페이지네이션
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 50))
-        start = (page - 1) * per_page
-        end = start + per_page
-        
-        # 정렬
-        sort_by = request.args.get('sort_by', 'cost_krw')
-        sort_order = request.args.get('sort_order', 'desc')
-        
-        if sort_by in df.columns:
-            df = df.sort_values(sort_by, ascending=(sort_order == 'asc'))
-        
-        total_records = len(df)
-        df_page = df.iloc[start:end]
-        
-        # JSON 변환
-        records = df_page.to_dict('records')
+        df = current_df
+        return cached_json_response(
+            workspace, snapshot, 'search', lambda: build_search_payload(workspace, snapshot, df, request.args)
+        )
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def build_search_payload(workspace, snapshot, df, args):
+    """
+    /api/search 응답 생성 (색인으로 찾은 행에만 필터, 정렬, 페이지네이션 적용)
+
+    Args:
+        workspace: 작업 공간
+        snapshot: 요청 시작 시 읽은 데이터셋 스냅샷
+        df: 조회 대상 DataFrame (snapshot.df)
+        args: 조회 파라미터 (request.args)
+    """
+    index = search_indexes.get_or_build(snapshot_cache_version(workspace.workspace_id, snapshot), df)
+    result = index.search(args.get('q', ''), prefix=args.get('prefix', '1') != '0')
+    
+    payload = build_data_payload(df.iloc[result['rows']], args)
+    payload['search'] = {
+        'query': args.get('q'),
+        'terms': result['terms'][:50],
+        'matches': int(len(result['rows'])),
+    }
+    return payload
+
+
+@app.route('/api/pivot')
+def get_pivot():
+    """
+    컬럼 조합별 비용 합계 (예: group_by=instance_family,operating_system)
+    
+    파라미터: group_by (쉼표 구분, PIVOT_COLUMNS) 및 /api/data와 같은 필터
+    """
+    group_by = [c.strip() for c in request.args.get('group_by', 'service_name').split(',') if c.strip()]
+    unknown = [c for c in group_by if c not in PIVOT_COLUMNS]
+    if not group_by or unknown:
+        return jsonify({'error': f"그룹 기준으로 사용할 수 없는 컬럼입니다: {', '.join(unknown)}"}), 400
+    
+    try:
+        if use_fact_store(request.args):
+            workspace_id = current_workspace_id()
+            response = fact_json_response(workspace_id, 'pivot', lambda token: build_pivot_payload(
+                fact_store.aggregate(workspace_id, group_by, filters=fact_filters(request.args), token=token), group_by
+            ))
+            if response is not None:
+                return response
         
-        # datetime/date를 문자열로 변환 및 environment 기본값 설정
-        for record in records:
-            for key, value in record.items():
-                if isinstance(value, (datetime, date)):
-                    record[key] = str(value)
-                elif pd.isna(value):
-                    record[key] = None
-            # environment가 비어있으면 cielmobility로 설정
-            if not record.get('environment') or (isinstance(record.get('environment'), str) and record['environment'].strip() == ''):
-                record['environment'] = 'cielmobility'
+        workspace = get_workspace()
+        snapshot = workspace.snapshot  # 요청 동안 같은 버전을 사용 (업로드 중에도 잠금 없이 읽기)
+        if snapshot.df is None:
+            return jsonify({'error': '데이터가 없습니다'}), 400
+        df = snapshot.df
+        compute = lambda: build_pivot_payload(pivot_dataframe(filter_dataframe(df, request.args), group_by), group_by)
+        return cached_json_response(workspace, snapshot, 'pivot', compute)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def pivot_dataframe(df, group_by):
+    """group_by 조합별 cost (+ cost_krw) 합계와 레코드 수 (빈 값도 하나의 그룹)"""
+    missing = [c for c in group_by if c not in df.columns]
+    if missing:
+        raise ValueError(f"데이터에 없는 컬럼입니다: {', '.join(missing)}")
+    
+    measures = [c for c in ('cost', 'cost_krw') if c in df.columns]
+    grouped = df.groupby(group_by, dropna=False, observed=True, sort=False)
+    result = grouped[measures].sum()
+    result['records'] = grouped.size()
+    return result.reset_index()
+
+
+def build_pivot_payload(groups, group_by):
+    """
+    /api/pivot 응답 생성 (비용 큰 순)
+
+    Args:
+        groups: group_by 컬럼 + cost (+ cost_krw) + records
+        group_by: 묶은 컬럼 목록
+    """
+    groups = groups.sort_values('cost', ascending=False, kind='stable')
+    return {
+        'success': True,
+        'group_by': group_by,
+        'rows': to_records(groups.astype({c: object for c in group_by})),
+        'total': {
+            'cost_usd': float(groups['cost'].sum()),
+            'records': int(groups['records'].sum())
+        }
+    }
+
+
+@app.route('/api/diff', methods=['POST'])
+def diff_data():
+    """
+    같은 기간 파일 두 버전 비교 (추가 / 삭제 / 비용 변경 라인과 서비스·날짜별 증감)
+    
+    파라미터 (multipart): new_files (새 버전 파일), old_files (이전 버전 파일, 없으면 현재 작업 공간 데이터),
+    data_type (ciel/segi - old_files가 없을 때 비교할 데이터), limit (반환할 라인 수, 기본 500)
+    """
+    data_type = request.form.get('data_type', 'ciel')
+    
+    try:
+        limit = max(0, int(request.form.get('limit', 500)))
+        new_df = convert_diff_files('new_files')
+        if request.files.getlist('old_files'):
+            old_df = convert_diff_files('old_files')
+        else:
+            snapshot = get_workspace().snapshot
+            old_df = snapshot.segi_df if data_type == 'segi' else snapshot.ciel_df
+            if old_df is None:
+                return jsonify({'error': '비교할 이전 데이터가 없습니다 (old_files를 함께 올려주세요)'}), 400
         
+        diff = diff_datasets(old_df, new_df)
         return jsonify({
             'success': True,
-            'data': records,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total_records,
-                'total_pages': (total_records + per_page - 1) // per_page
-            }
+            'totals': diff.totals(),
+            'by_service': diff.deltas_by('service_name'),
+            'by_date': diff.deltas_by('date'),
+            'lines': to_records(diff.lines.iloc[:limit]),
+            'truncated': len(diff.lines) > limit
         })
     
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/summary')
-def get_summary():
-    """요약 통계"""
-    global current_df
+def convert_diff_files(field):
+    """비교용 업로드 파일 변환 (같은 내용이면 변환 결과 캐시 사용)"""
+    contents = []
+    for file in request.files.getlist(field):
+        if file.filename == '':
+            continue
+        if not file.filename.lower().endswith(UPLOAD_EXTENSIONS):
+            raise ValueError(f'{file.filename}: CSV 파일(.csv, .csv.gz, .zip)만 업로드 가능합니다')
+        contents.append(file.stream.read())
+    
+    if not contents:
+        raise ValueError(f'{field} 파일이 없습니다')
+    
+    df = get_converter().convert_csv_files(contents, max_workers=INGEST_WORKERS, cache=frame_cache)
+    if df is None or len(df) == 0:
+        raise ValueError('유효한 데이터가 없습니다')
+    return df
+
+
+@app.route('/api/history')
+def get_history_partitions():
+    """작업 공간의 월별 비용 이력 (회사, 월) 목록"""
+    if history_store is None:
+        return jsonify({'error': '비용 이력 저장소가 설정되지 않았습니다'}), 404
+    
+    workspace_id = current_workspace_id()
+    try:
+        return jsonify({
+            'success': True,
+            'partitions': history_store.partitions(request.args.get('company'), workspace_id=workspace_id)
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/history/monthly')
+def get_history_monthly():
+    """
+    월별 합계 (전월 대비 증감, 연 누계)
+    
+    파라미터: company (ciel/segi), start_month, end_month (YYYY-MM), group_by (service_name, environment 등)
+    """
+    if history_store is None:
+        return jsonify({'error': '비용 이력 저장소가 설정되지 않았습니다'}), 404
+    
+    group_by = request.args.get('group_by')
+    if group_by and group_by not in ('service_name', 'environment', 'region', 'account_id'):
+        return jsonify({'error': f'그룹 기준으로 사용할 수 없는 컬럼입니다: {group_by}'}), 400
+    
+    workspace_id = current_workspace_id()
+    try:
+        return jsonify({
+            'success': True,
+            'company': request.args.get('company', 'ciel'),
+            'months': history_store.monthly_totals(
+                request.args.get('company', 'ciel'),
+                start_month=request.args.get('start_month'),
+                end_month=request.args.get('end_month'),
+                group_by=group_by,
+                workspace_id=workspace_id
+            )
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/history/data')
+def get_history_data():
+    """
+    비용 이력 데이터 조회 (date_start ~ date_end에 걸치는 달의 파일만 읽음)
+    
+    파라미터: company, date_start, date_end, services 및 /api/data와 같은 페이지/정렬/컬럼 선택
+    """
+    if history_store is None:
+        return jsonify({'error': '비용 이력 저장소가 설정되지 않았습니다'}), 404
+    
+    services = request.args.get('services')
+    workspace_id = current_workspace_id()
+    try:
+        df = history_store.query(
+            request.args.get('company', 'ciel'),
+            start_date=request.args.get('date_start'),
+            end_date=request.args.get('date_end'),
+            services=[s.strip() for s in services.split(',')] if services else None,
+            workspace_id=workspace_id
+        )
+        if len(df) == 0:
+            return jsonify({'error': '해당 기간의 이력 데이터가 없습니다'}), 404
+        return jsonify(build_data_payload(df, request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/api/data/stream')
+def stream_data():
+    """전체 데이터 스트리밍 다운로드 (NDJSON 또는 CSV, 필터링 지원)"""
+    workspace = get_workspace()
+    snapshot = workspace.snapshot  # 요청 동안 같은 버전을 사용 (업로드 중에도 잠금 없이 읽기)
+    current_df = snapshot.df
     
     if current_df is None:
         return jsonify({'error': '데이터가 없습니다'}), 400
     
     try:
-        df = current_df
+        output_format = request.args.get('format', 'ndjson')
+        if output_format not in ('ndjson', 'csv'):
+            return jsonify({'error': '지원하지 않는 형식입니다 (ndjson, csv)'}), 400
         
-        # 서비스별 집계
-        service_summary = df.groupby('service_name').agg({
-            'cost': 'sum',
-            'cost_krw': 'sum' if 'cost_krw' in df.columns else 'sum'
-        }).to_dict('index')
+        chunk_size = max(1, int(request.args.get('chunk_size', 5000)))
         
-        # 환경별 집계 (environment가 빈 값이면 cielmobility로 처리)
-        df_env = df.copy()
-        df_env['environment'] = df_env['environment'].fillna('cielmobility')
-        df_env['environment'] = df_env['environment'].replace('', 'cielmobility')
+        df = filter_dataframe(current_df, request.args)
         
-        env_summary = df_env.groupby('environment').agg({
-            'cost': 'sum',
-            'cost_krw': 'sum' if 'cost_krw' in df_env.columns else 'sum'
-        }).to_dict('index')
+        sort_by = request.args.get('sort_by')
+        if sort_by in df.columns:
+            df = sort_dataframe(df, sort_by, ascending=(request.args.get('sort_order', 'desc') == 'asc'))
         
-        # MSP 계산 (cielmobility 환경 기준)
-        custom_charge_usd = 0.0
-        non_custom_charge_usd = 0.0
+        fields = request.args.get('fields')
+        if fields:
+            df = project_columns(df, [f.strip() for f in fields.split(',') if f.strip()])
         
-        for idx, row in df_env.iterrows():
-            env = (row.get('environment') or '').lower()
-            service = (row.get('service_name') or '').lower()
-            cost = float(row.get('cost', 0))
-            
-            if 'smartmobility' not in env:  # cielmobility 환경
-                if 'custom charge' in service:
-                    custom_charge_usd += cost
-                else:
-                    non_custom_charge_usd += cost
-        
-        msp_info = calculate_msp_costs(non_custom_charge_usd, custom_charge_usd)
-        msp_info['custom_charge_usd'] = round(custom_charge_usd, 2)
-        msp_info['non_custom_charge_usd'] = round(non_custom_charge_usd, 2)
-        
-        # 프로젝트별 집계
-        project_summary = {}
-        if 'project' in df.columns and df['project'].notna().any():
-            project_summary = df.groupby('project').agg({
-                'cost': 'sum',
-                'cost_krw': 'sum' if 'cost_krw' in df.columns else 'sum'
-            }).to_dict('index')
+        if output_format == 'csv':
+            response = Response(iter_csv(df, chunk_size), mimetype='text/csv')
+            response.headers['Content-Disposition'] = (
+                f'attachment; filename=cost_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+            )
+        else:
+            response = Response(iter_ndjson(df, chunk_size), mimetype='application/x-ndjson')
         
-        return jsonify({
-            'success': True,
-            'summary': {
-                'total': {
-                    'cost_usd': float(df['cost'].sum()),
-                    'cost_krw': float(df['cost_krw'].sum()) if 'cost_krw' in df.columns else 0,
-                    'records': len(df)
-                },
-                'by_service': service_summary,
-                'by_environment': env_summary,
-                'by_project': project_summary,
-                'msp_info': msp_info
-            }
-        })
+        response.headers['X-Total-Records'] = str(len(df))
+        return response
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/summary')
+def get_summary():
+    """요약 통계 (팩트 테이블 백엔드면 스냅샷을 읽지 않고 SQL로 집계)"""
+    try:
+        if use_fact_store():
+            workspace_id = current_workspace_id()
+            response = fact_json_response(
+                workspace_id, 'summary', lambda token: build_fact_summary_payload(workspace_id, token)
+            )
+            if response is not None:
+                return response
+        
+        workspace = get_workspace()
+        snapshot = workspace.snapshot  # 요청 동안 같은 버전을 사용 (업로드 중에도 잠금 없이 읽기)
+        if snapshot.df is None:
+            return jsonify({'error': '데이터가 없습니다'}), 400
+        df = snapshot.df
+        return cached_json_response(workspace, snapshot, 'summary', lambda: build_summary_payload(df))
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def build_fact_summary_payload(workspace_id, token=None):
+    """
+    /api/summary 응답 생성 (팩트 테이블)
+
+    서비스/환경/프로젝트/라인 항목 분류 조합별 합계를 SQL GROUP BY로 먼저 구한 뒤 (커버링 인덱스만 읽음)
+    작은 집계 결과로 build_summary_payload를 계산 (합계는 원본 행으로 계산한 것과 같음)
+
+    Args:
+        workspace_id: 작업 공간 ID
+        token: 조회할 스냅샷 token (저장된 데이터셋이 다르면 FactVersionChanged)
+    """
+    groups = fact_store.aggregate(
+        workspace_id, ['service_name', 'environment', 'project', 'line_item_class'], token=token
+    )
+    return build_summary_payload(groups, record_count=int(groups['records'].sum()))
+
+
+def build_summary_payload(df, record_count=None):
+    """
+    /api/summary 응답 생성
+
+    Args:
+        df: 집계 대상 DataFrame
+        record_count: 전체 레코드 수 (df가 이미 묶인 집계 결과일 때 - records 컬럼이 묶인 라인 수, None이면 len(df))
+    """
+    # 서비스별 집계
+    service_summary = df.groupby('service_name').agg({
+        'cost': 'sum',
+        'cost_krw': 'sum' if 'cost_krw' in df.columns else 'sum'
+    }).to_dict('index')
+    
+    # 환경별 집계 (environment가 빈 값이면 기본 테넌트 cielmobility로 처리)
+    allocation = default_allocation()
+    df_env = df.copy()
+    df_env['environment'] = df_env['environment'].fillna(allocation.default_tenant)
+    df_env['environment'] = df_env['environment'].replace('', allocation.default_tenant)
+    
+    env_summary = df_env.groupby('environment').agg({
+        'cost': 'sum',
+        'cost_krw': 'sum' if 'cost_krw' in df_env.columns else 'sum'
+    }).to_dict('index')
+    
+    # MSP 계산 (cielmobility 환경 기준) + 테넌트별 합계 / MSP 분담액
+    msp_info = summarize_msp(df_env)
+    tenant_summary = allocation.allocate(df_env, msp_info['msp_invoice_amount'])
+    
+    # 프로젝트별 집계
+    project_summary = {}
+    if 'project' in df.columns and df['project'].notna().any():
+        project_summary = df.groupby('project').agg({
+            'cost': 'sum',
+            'cost_krw': 'sum' if 'cost_krw' in df.columns else 'sum'
+        }).to_dict('index')
+    
+    return {
+        'success': True,
+        'summary': {
+            'total': {
+                'cost_usd': float(df['cost'].sum()),
+                'cost_krw': float(df['cost_krw'].sum()) if 'cost_krw' in df.columns else 0,
+                'records': len(df) if record_count is None else record_count
+            },
+            'by_service': service_summary,
+            'by_environment': env_summary,
+            'by_project': project_summary,
+            'by_tenant': tenant_summary,
+            'msp_info': msp_info
+        }
+    }
+
+
 @app.route('/api/export')
 def export_data():
-    """데이터 다운로드 (Excel)"""
-    global current_df
+    """데이터 다운로드 (Excel, format=parquet 또는 format=arrow 지원)"""
+    workspace = get_workspace()
+    snapshot = workspace.snapshot  # 요청 동안 같은 버전을 사용 (업로드 중에도 잠금 없이 읽기)
+    current_df = snapshot.df
     
     if current_df is None:
         return jsonify({'error': '데이터가 없습니다'}), 400
     
     try:
-        output_path = 'exports/cost_report.xlsx'
-        Path('exports').mkdir(exist_ok=True)
+        export_format = request.args.get('format', 'xlsx')
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # 분석용 바이너리 형식 (Parquet / Arrow IPC) - 요청별 메모리 버퍼에 작성
+        if export_format in ('parquet', 'arrow'):
+            from src.converters.arrow_io import write_parquet, write_arrow_ipc
+            
+            buffer = io.BytesIO()
+            if export_format == 'parquet':
+                write_parquet(current_df, buffer)
+                mimetype = 'application/vnd.apache.parquet'
+            else:
+                write_arrow_ipc(current_df, buffer)
+                mimetype = 'application/vnd.apache.arrow.file'
+            buffer.seek(0)
+            
+            return send_file(
+                buffer,
+                mimetype=mimetype,
+                as_attachment=True,
+                download_name=f'cost_report_{timestamp}.{export_format}'
+            )
         
-        # raw_data 컬럼 제거
-        df_export = current_df.copy()
-        if 'raw_data' in df_export.columns:
-            df_export = df_export.drop(columns=['raw_data'])
+        if export_format != 'xlsx':
+            return jsonify({'error': '지원하지 않는 형식입니다 (xlsx, parquet, arrow)'}), 400
         
-        df_export.to_excel(output_path, index=False, sheet_name='비용데이터')
+        # 요청별 임시 버퍼에 작성 (공유 경로 없음, 큰 파일은 디스크로 넘어감)
+        buffer = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+        write_dataframe_to_excel(current_df, buffer, sheet_name='비용데이터')
+        buffer.seek(0)
+        
+        return send_file(
+            buffer,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=f'cost_report_{timestamp}.xlsx'
+        )
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+
+@app.route('/api/export/settlement')
+def export_settlement_workbook():
+    """정산 워크북 다운로드 (상세 + 환경별/서비스별/일별 환경별/MSP 집계 시트)"""
+    workspace = get_workspace()
+    snapshot = workspace.snapshot  # 요청 동안 같은 버전을 사용 (업로드 중에도 잠금 없이 읽기)
+    current_df = snapshot.df
+    
+    if current_df is None:
+        return jsonify({'error': '데이터가 없습니다'}), 400
+    
+    try:
+        buffer = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+        write_settlement_workbook(current_df, buffer)
+        buffer.seek(0)
         
         return send_file(
-            output_path,
+            buffer,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             as_attachment=True,
-            download_name=f'cost_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+            download_name=f'settlement_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
         )
     
     except Exception as e:
@@ -673,12 +1637,7 @@ def export_data():
 
 
 if __name__ == '__main__':
-    print("=" * 80)
-    print("AWS 비용 정산 툴 웹 서버 시작")
-    print("=" * 80)
-    print("\n브라우저에서 다음 주소로 접속하세요:")
-    print("  http://localhost:5000")
-    print("\n종료하려면 Ctrl+C를 누르세요.")
-    print("=" * 80)
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # 개발 서버는 run_server.py에서 시작 (app.py가 실행 스크립트면 업로드 변환 프로세스마다 이 모듈을 다시 실행함)
+    import subprocess
+    import sys
+    sys.exit(subprocess.call([sys.executable, str(Path(__file__).with_name('run_server.py'))]))
@@ -0,0 +1,24 @@
+"""
+개발 서버 실행 스크립트
+
+업로드 변환 프로세스(spawn)는 실행 스크립트를 다시 불러오므로, app은 __main__ 블록 안에서만 import함
+(app.py를 직접 실행하면 변환 프로세스마다 웹 서버 설정이 다시 실행됨)
+"""
+
+
+def main():
+    from app import app
+
+    print("=" * 80)
+    print("AWS 비용 정산 툴 웹 서버 시작")
+    print("=" * 80)
+    print("\n브라우저에서 다음 주소로 접속하세요:")
+    print("  http://localhost:5000")
+    print("\n종료하려면 Ctrl+C를 누르세요.")
+    print("=" * 80)
+
+    app.run(debug=True, host='0.0.0.0', port=5000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Arrow IPC / Parquet 입출력
+표준 데이터 DataFrame을 분석용 바이너리 형식으로 저장하고 다시 읽기
+"""
+from typing import BinaryIO, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+
+# 기본 압축 방식 (Parquet은 압축률 우선, Arrow IPC는 읽기 속도 우선)
+PARQUET_COMPRESSION = 'zstd'
+ARROW_COMPRESSION = 'lz4'
+
+
+def to_arrow_table(df: pd.DataFrame, dictionary_ratio: float = 0.5) -> pa.Table:
+    """
+    DataFrame을 Arrow Table로 변환
+
+    카디널리티가 낮은 문자열 컬럼(service_name, environment 등)은 사전(dictionary) 타입으로 저장합니다.
+
+    Args:
+        df: 표준 데이터 DataFrame (raw_data 컬럼은 제외됨)
+        dictionary_ratio: 고유값 수 / 행 수가 이 값 이하인 문자열 컬럼을 사전 인코딩
+
+    Returns:
+        pa.Table: Arrow 테이블
+    """
+    if 'raw_data' in df.columns:
+        df = df.drop(columns=['raw_data'])
+
+    encoded = {}
+    for col in df.columns:
+        series = df[col]
+        is_text = pd.api.types.infer_dtype(series, skipna=True) == 'string'
+        if is_text and len(series) > 0 and series.nunique() <= len(series) * dictionary_ratio:
+            series = series.astype('category')
+        encoded[col] = series
+
+    return pa.Table.from_pandas(pd.DataFrame(encoded, index=df.index), preserve_index=False)
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    destination: Union[str, BinaryIO],
+    compression: Optional[str] = PARQUET_COMPRESSION,
+    dictionary_ratio: float = 0.5,
+    row_group_size: Optional[int] = None
+):
+    """
+    DataFrame을 Parquet 파일로 저장
+
+    Args:
+        df: 표준 데이터 DataFrame
+        destination: 파일 경로 또는 바이너리 버퍼
+        compression: 압축 방식 (None이면 압축 안 함)
+        dictionary_ratio: 사전 인코딩 기준 (0이면 사전 인코딩 안 함 - 원래 dtype 그대로 복원)
+        row_group_size: row group 행 수 (정렬된 컬럼으로 조회할 때 통계로 건너뛸 수 있는 단위, None이면 기본값)
+    """
+    pq.write_table(
+        to_arrow_table(df, dictionary_ratio=dictionary_ratio),
+        destination,
+        compression=compression,
+        row_group_size=row_group_size
+    )
+
+
+def write_arrow_ipc(
+    df: pd.DataFrame,
+    destination: Union[str, BinaryIO],
+    compression: Optional[str] = ARROW_COMPRESSION,
+    dictionary_ratio: float = 0.5
+):
+    """
+    DataFrame을 Arrow IPC(Feather v2) 파일로 저장
+
+    압축하지 않으면(compression=None) memory-map으로 복사 없이 다시 읽을 수 있습니다.
+
+    Args:
+        df: 표준 데이터 DataFrame
+        destination: 파일 경로 또는 바이너리 버퍼
+        compression: 압축 방식 ('lz4', 'zstd' 또는 None)
+        dictionary_ratio: 사전 인코딩 기준 (0이면 사전 인코딩 안 함 - 원래 dtype 그대로 복원)
+    """
+    table = to_arrow_table(df, dictionary_ratio=dictionary_ratio)
+    options = ipc.IpcWriteOptions(compression=compression)
+    with ipc.new_file(destination, table.schema, options=options) as writer:
+        writer.write_table(table)
+
+
+def read_arrow_ipc(path: str, memory_map: bool = True) -> pd.DataFrame:
+    """
+    Arrow IPC 파일을 DataFrame으로 읽기
+
+    Args:
+        path: 파일 경로
+        memory_map: memory-map 사용 여부
+
+    Returns:
+        pd.DataFrame: 데이터프레임 (사전 타입 컬럼은 category로 복원)
+    """
+    source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'r')
+    with source:
+        table = ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+def arrow_string_dtype() -> pd.StringDtype:
+    """
+    Arrow 배열을 그대로 감싸는 문자열 dtype (빈 값은 NaN - object 문자열 컬럼과 같은 비교/마스크 결과)
+    """
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)  # pandas 2.3+
+    except TypeError:
+        return pd.StringDtype('pyarrow_numpy')  # pandas 2.1 / 2.2
+
+
+def map_arrow_ipc(path: str) -> pd.DataFrame:
+    """
+    압축하지 않은 Arrow IPC 파일을 memory-map으로 읽기
+
+    문자열 컬럼(description, service_name 등)은 파이썬 str 객체로 바꾸지 않고 Arrow 문자열 배열을 그대로 감싸고,
+    빈 값이 없는 숫자/날짜 컬럼도 파일 페이지를 복사 없이 참조하므로
+    여러 프로세스가 같은 파일을 읽으면 운영체제 페이지 캐시를 함께 사용합니다.
+    (사전 타입 컬럼은 category - 코드 배열만 프로세스마다 만들어짐, 빈 값이 있는 숫자 컬럼은 NaN으로 채우며 복사)
+
+    Args:
+        path: 파일 경로 (write_arrow_ipc(..., compression=None)로 저장한 파일)
+
+    Returns:
+        pd.DataFrame: 읽기 전용으로 사용할 데이터프레임
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = ipc.open_file(source).read_all()
+    string_dtype = arrow_string_dtype()
+    return table.to_pandas(
+        split_blocks=True,
+        types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+    )
+
+
+def read_parquet(path: str) -> pd.DataFrame:
+    """
+    Parquet 파일을 DataFrame으로 읽기
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        pd.DataFrame: 데이터프레임
+    """
+    return pq.read_table(path, memory_map=True).to_pandas()
@@ -0,0 +1,175 @@
+"""
+DataFrame JSON 직렬화 (벡터화)
+행 단위(records) 형식과 컬럼 단위(columnar) 형식, 스트리밍(NDJSON/CSV) 출력을 지원
+"""
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+
+# 환경값이 비어있을 때 사용하는 기본값
+DEFAULT_ENVIRONMENT = 'cielmobility'
+
+
+def project_columns(df: pd.DataFrame, fields: Optional[List[str]]) -> pd.DataFrame:
+    """
+    필요한 컬럼만 선택
+
+    Args:
+        df: 원본 데이터프레임
+        fields: 선택할 컬럼 목록 (None 또는 빈 목록이면 전체)
+
+    Returns:
+        pd.DataFrame: 선택된 컬럼만 포함한 데이터프레임
+    """
+    if not fields:
+        return df
+
+    unknown = [field for field in fields if field not in df.columns]
+    if unknown:
+        raise ValueError(f"알 수 없는 컬럼입니다: {', '.join(unknown)}")
+
+    return df[list(dict.fromkeys(fields))]
+
+
+def _is_date_object_column(series: pd.Series) -> bool:
+    """object 컬럼이 date/datetime 값을 담고 있는지 확인 (첫 번째 유효값 기준)"""
+    if not pd.api.types.is_object_dtype(series):
+        return False
+    first_valid = series.first_valid_index()
+    return first_valid is not None and isinstance(series[first_valid], (datetime, date))
+
+
+def _to_json_column(series: pd.Series) -> pd.Series:
+    """
+    한 컬럼을 JSON 직렬화 가능한 값으로 변환
+
+    - datetime64 -> 'YYYY-MM-DD HH:MM:SS'
+    - date 객체 -> 'YYYY-MM-DD'
+    - NaN/NaT -> None
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        converted = series.dt.strftime('%Y-%m-%d %H:%M:%S')
+    elif _is_date_object_column(series):
+        converted = series.map(str, na_action='ignore')
+    else:
+        converted = series
+
+    return converted.astype(object).where(series.notna(), None)
+
+
+def prepare_for_json(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    DataFrame 전체를 JSON 직렬화 가능한 값으로 변환 (컬럼 단위 벡터 연산)
+
+    Args:
+        df: 원본 데이터프레임
+
+    Returns:
+        pd.DataFrame: object 타입으로 변환된 데이터프레임
+    """
+    prepared = pd.DataFrame(
+        {col: _to_json_column(df[col]) for col in df.columns},
+        index=df.index,
+        columns=df.columns,
+    )
+
+    # environment가 비어있으면 cielmobility로 설정
+    if 'environment' in prepared.columns:
+        env = prepared['environment']
+        blank = env.isna() | (env.astype(str).str.strip() == '')
+        prepared.loc[blank, 'environment'] = DEFAULT_ENVIRONMENT
+
+    return prepared
+
+
+def to_records(df: pd.DataFrame) -> List[Dict]:
+    """
+    행 단위 JSON 형식으로 변환
+
+    Args:
+        df: 원본 데이터프레임
+
+    Returns:
+        List[Dict]: 레코드 리스트
+    """
+    return prepare_for_json(df).to_dict('records')
+
+
+def to_columnar(df: pd.DataFrame, dictionary_ratio: float = 0.5) -> Dict:
+    """
+    컬럼 단위 JSON 형식으로 변환
+
+    카디널리티가 낮은 문자열 컬럼(service_name, environment 등)은
+    사전(dictionary) + 정수 코드로 인코딩합니다. 코드 -1은 None입니다.
+
+    Args:
+        df: 원본 데이터프레임
+        dictionary_ratio: 고유값 수 / 행 수가 이 값 이하인 문자열 컬럼을 사전 인코딩
+
+    Returns:
+        Dict: {'format', 'length', 'columns', 'data'}
+    """
+    prepared = prepare_for_json(df)
+    length = len(prepared)
+
+    data = {}
+    for col in prepared.columns:
+        series = prepared[col]
+        is_text = (
+            pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])
+        ) and not _is_date_object_column(df[col])
+
+        if is_text and length > 0:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            if len(uniques) <= length * dictionary_ratio:
+                data[col] = {
+                    'dictionary': uniques.tolist(),
+                    'codes': codes.tolist(),
+                }
+                continue
+
+        data[col] = series.tolist()
+
+    return {
+        'format': 'columnar',
+        'length': length,
+        'columns': list(prepared.columns),
+        'data': data,
+    }
+
+
+def iter_ndjson(df: pd.DataFrame, chunk_size: int = 5000) -> Iterator[str]:
+    """
+    NDJSON(한 줄에 레코드 하나) 형식으로 일정 크기씩 나누어 생성
+
+    Args:
+        df: 원본 데이터프레임
+        chunk_size: 한 번에 직렬화할 행 수
+
+    Yields:
+        str: NDJSON 텍스트 조각
+    """
+    for start in range(0, len(df), chunk_size):
+        chunk = prepare_for_json(df.iloc[start:start + chunk_size])
+        text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+        yield text if text.endswith('\n') else text + '\n'
+
+
+def iter_csv(df: pd.DataFrame, chunk_size: int = 5000) -> Iterator[str]:
+    """
+    CSV 형식으로 일정 크기씩 나누어 생성 (첫 조각에 BOM + 헤더 포함, Excel 호환)
+
+    값은 iter_ndjson / /api/data와 같게 변환 (날짜 문자열, 빈 environment는 기본값, 빈 값은 빈 칸)
+
+    Args:
+        df: 원본 데이터프레임
+        chunk_size: 한 번에 직렬화할 행 수
+
+    Yields:
+        str: CSV 텍스트 조각
+    """
+    yield '\ufeff' + df.iloc[0:0].to_csv(index=False)
+    for start in range(0, len(df), chunk_size):
+        yield prepare_for_json(df.iloc[start:start + chunk_size]).to_csv(index=False, header=False)
@@ -64,6 +64,70 @@ class CostDataConverterWithCurrency(DataConverter):
         
         return df
     
+    def add_krw_columns(self, df: pd.DataFrame, to_currency: str = "KRW") -> pd.DataFrame:
+        """
+        표준 데이터 DataFrame에 KRW 환산 컬럼 추가 (to_dataframe_with_krw의 DataFrame 버전)
+        
+        통화별로 환율을 한 번만 조회하고 금액은 벡터 연산으로 계산합니다.
+        to_dataframe_with_krw와 같이 가장 최근 환율을 사용합니다.
+        
+        Args:
+            df: 표준 데이터 DataFrame (cost, currency 컬럼 필요)
+            to_currency: 대상 통화
+            
+        Returns:
+            pd.DataFrame: cost_krw, exchange_rate, exchange_date 컬럼이 추가된 새 데이터프레임
+        """
+        rates = {}
+        rate_dates = {}
+        for currency in df['currency'].dropna().unique():
+            try:
+                converted = self.currency_converter.convert_cost(1.0, currency, to_currency)
+                rates[currency] = converted.exchange_rate
+                rate_dates[currency] = converted.rate_date
+            except ValueError as e:
+                print(f"변환 실패 ({currency}): {e}")
+        
+        exchange_rates = df['currency'].map(rates).astype(float)
+        
+        result = df.copy()
+        result['cost_krw'] = df['cost'].astype(float) * exchange_rates
+        result['exchange_rate'] = exchange_rates
+        result['exchange_date'] = df['currency'].map(rate_dates).astype(object)
+        
+        return result
+    
+    @staticmethod
+    def apply_exchange_rate(
+        df: pd.DataFrame,
+        rate: float,
+        rate_date: Optional[date] = None,
+        from_currency: str = "USD"
+    ) -> pd.DataFrame:
+        """
+        지정한 환율로 KRW 환산 컬럼 추가 (작업 공간마다 설정한 환율 - 공유 환율 저장소를 조회하지 않음)
+        
+        Args:
+            df: 표준 데이터 DataFrame (cost, currency 컬럼 필요)
+            rate: 1 from_currency당 KRW
+            rate_date: 환율 기준일
+            from_currency: 환율을 적용할 통화 (통화가 비어 있는 라인 포함, KRW 라인은 1.0)
+            
+        Returns:
+            pd.DataFrame: cost_krw, exchange_rate, exchange_date 컬럼이 추가된 새 데이터프레임
+        """
+        currency = df['currency'].astype(object).fillna(from_currency).astype(str).str.upper()
+        exchange_rates = pd.Series(float('nan'), index=df.index)
+        exchange_rates[currency == from_currency.upper()] = float(rate)
+        exchange_rates[currency == 'KRW'] = 1.0
+        
+        result = df.copy()
+        result['cost_krw'] = df['cost'].astype(float) * exchange_rates
+        result['exchange_rate'] = exchange_rates
+        result['exchange_date'] = pd.Series(rate_date, index=df.index, dtype=object).where(exchange_rates.notna())
+        
+        return result
+    
     def export_to_csv_with_krw(
         self,
         standard_data_list: List[StandardCostData],
@@ -92,20 +156,60 @@ class CostDataConverterWithCurrency(DataConverter):
         sheet_name: str = '비용데이터'
     ):
         """
-        KRW 환산 금액을 포함하여 Excel로 저장
+        KRW 환산 금액을 포함하여 Excel로 저장 (write-only 스트리밍)
         
         Args:
             standard_data_list: 표준 데이터 리스트
-            output_path: 저장할 파일 경로
+            output_path: 저장할 파일 경로 또는 바이너리 버퍼
             sheet_name: 시트 이름
         """
+        from src.converters.excel_writer import write_dataframe_to_excel
+        
         df = self.to_dataframe_with_krw(standard_data_list)
         
         # raw_data 컬럼 제거
         if 'raw_data' in df.columns:
             df = df.drop(columns=['raw_data'])
         
-        df.to_excel(output_path, sheet_name=sheet_name, index=False, engine='openpyxl')
+        write_dataframe_to_excel(df, output_path, sheet_name=sheet_name)
+    
+    def export_to_parquet_with_krw(
+        self,
+        standard_data_list: List[StandardCostData],
+        output_path: str,
+        compression: Optional[str] = 'zstd'
+    ):
+        """
+        KRW 환산 금액(cost_krw, exchange_rate, exchange_date)을 포함하여 Parquet으로 저장
+        
+        Args:
+            standard_data_list: 표준 데이터 리스트
+            output_path: 저장할 파일 경로 또는 바이너리 버퍼
+            compression: 압축 방식
+        """
+        from src.converters.arrow_io import write_parquet
+        
+        df = self.to_dataframe_with_krw(standard_data_list)
+        write_parquet(df, output_path, compression=compression)
+    
+    def export_to_arrow_with_krw(
+        self,
+        standard_data_list: List[StandardCostData],
+        output_path: str,
+        compression: Optional[str] = 'lz4'
+    ):
+        """
+        KRW 환산 금액(cost_krw, exchange_rate, exchange_date)을 포함하여 Arrow IPC로 저장
+        
+        Args:
+            standard_data_list: 표준 데이터 리스트
+            output_path: 저장할 파일 경로 또는 바이너리 버퍼
+            compression: 압축 방식
+        """
+        from src.converters.arrow_io import write_arrow_ipc
+        
+        df = self.to_dataframe_with_krw(standard_data_list)
+        write_arrow_ipc(df, output_path, compression=compression)
     
     def get_summary_stats_with_krw(
         self, 
@@ -2,10 +2,12 @@
 데이터 변환기 - 클라우드체커 형식을 표준 형식으로 변환
 """
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import BinaryIO, Callable, List, Dict, Optional, Union
 from datetime import datetime
 
+from src.converters.line_items import with_line_item_class
 from src.models.standard_data import StandardCostData
+from src.parsers.description_attributes import with_description_attributes
 from src.parsers.cloudchecker_parser import CloudCheckerParser
 
 
@@ -116,7 +118,23 @@ class DataConverter:
         """
         # CSV 파일 읽기
         df = self.parser.parse_csv(file_path)
+        return self._convert_parsed_csv(df)
+    
+    def convert_csv_stream(self, stream: BinaryIO) -> List[StandardCostData]:
+        """
+        CSV 바이너리 스트림(업로드 스트림, 메모리 버퍼)을 파일 저장 없이 표준 데이터로 변환
         
+        Args:
+            stream: CSV 바이너리 스트림
+            
+        Returns:
+            List[StandardCostData]: 변환된 표준 데이터 리스트
+        """
+        df = self.parser.parse_csv_stream(stream)
+        return self._convert_parsed_csv(df)
+    
+    def _convert_parsed_csv(self, df: pd.DataFrame) -> List[StandardCostData]:
+        """파싱된 CSV DataFrame의 필수 컬럼 검증 후 변환"""
         # 필수 컬럼 검증
         is_valid, missing_columns = self.parser.validate_required_columns(df)
         if not is_valid:
@@ -125,6 +143,34 @@ class DataConverter:
         # 변환
         return self.convert_dataframe(df)
     
+    def convert_csv_files(
+        self,
+        sources: List[Union[str, bytes]],
+        max_workers: Optional[int] = None,
+        on_file_done: Optional[Callable[[int, int], None]] = None,
+        cache=None
+    ) -> pd.DataFrame:
+        """
+        여러 CSV 파일을 프로세스 풀에서 동시에 변환하여 하나의 DataFrame으로 합침
+        
+        Args:
+            sources: CSV 파일 경로 또는 파일 내용(bytes) 목록
+            max_workers: 프로세스 수 (None이면 CPU 코어 수)
+            on_file_done: 파일 하나가 끝날 때마다 호출 - on_file_done(완료 파일 수, 파일 순번)
+            cache: 변환 결과 캐시 (ParsedFrameCache, 같은 내용의 파일은 다시 변환하지 않음)
+            
+        Returns:
+            pd.DataFrame: 표준 데이터 DataFrame (raw_data 제외, 파일 순서 유지, line_item_class / Description 속성 포함)
+        """
+        from src.converters.parallel import convert_csv_files
+        
+        frames = convert_csv_files(sources, max_workers=max_workers, on_file_done=on_file_done, cache=cache)
+        frames = [frame for frame in frames if len(frame) > 0]
+        if not frames:
+            return pd.DataFrame()
+        # 캐시에서 읽은 파일은 category 값 목록이 다를 수 있으므로 합친 뒤 공통 타입으로 맞춤
+        return with_line_item_class(with_description_attributes(pd.concat(frames, ignore_index=True)))
+    
     def to_dataframe(self, standard_data_list: List[StandardCostData]) -> pd.DataFrame:
         """
         표준 데이터 리스트를 DataFrame으로 변환
@@ -133,10 +179,10 @@ class DataConverter:
             standard_data_list: 표준 데이터 리스트
             
         Returns:
-            pd.DataFrame: 변환된 데이터프레임
+            pd.DataFrame: 변환된 데이터프레임 (라인 항목 분류 line_item_class, Description 속성 컬럼 추가)
         """
         data_dicts = [data.model_dump(exclude={'raw_data'}) for data in standard_data_list]
-        return pd.DataFrame(data_dicts)
+        return with_line_item_class(with_description_attributes(pd.DataFrame(data_dicts)))
     
     def to_json(self, standard_data_list: List[StandardCostData]) -> List[Dict]:
         """
@@ -176,15 +222,53 @@ class DataConverter:
         sheet_name: str = '비용데이터'
     ):
         """
-        표준 데이터를 Excel 파일로 저장
+        표준 데이터를 Excel 파일로 저장 (write-only 스트리밍)
         
         Args:
             standard_data_list: 표준 데이터 리스트
-            output_path: 저장할 파일 경로
+            output_path: 저장할 파일 경로 또는 바이너리 버퍼
             sheet_name: 시트 이름
         """
+        from src.converters.excel_writer import write_dataframe_to_excel
+        
         df = self.to_dataframe(standard_data_list)
-        df.to_excel(output_path, sheet_name=sheet_name, index=False, engine='openpyxl')
+        write_dataframe_to_excel(df, output_path, sheet_name=sheet_name)
+    
+    def export_to_parquet(
+        self,
+        standard_data_list: List[StandardCostData],
+        output_path: str,
+        compression: Optional[str] = 'zstd'
+    ):
+        """
+        표준 데이터를 Parquet 파일로 저장 (문자열 컬럼 사전 인코딩 + 압축)
+        
+        Args:
+            standard_data_list: 표준 데이터 리스트
+            output_path: 저장할 파일 경로 또는 바이너리 버퍼
+            compression: 압축 방식
+        """
+        from src.converters.arrow_io import write_parquet
+        
+        write_parquet(self.to_dataframe(standard_data_list), output_path, compression=compression)
+    
+    def export_to_arrow(
+        self,
+        standard_data_list: List[StandardCostData],
+        output_path: str,
+        compression: Optional[str] = 'lz4'
+    ):
+        """
+        표준 데이터를 Arrow IPC 파일로 저장 (compression=None이면 memory-map으로 바로 읽기 가능)
+        
+        Args:
+            standard_data_list: 표준 데이터 리스트
+            output_path: 저장할 파일 경로 또는 바이너리 버퍼
+            compression: 압축 방식
+        """
+        from src.converters.arrow_io import write_arrow_ipc
+        
+        write_arrow_ipc(self.to_dataframe(standard_data_list), output_path, compression=compression)
     
     def get_summary_stats(self, standard_data_list: List[StandardCostData]) -> Dict:
         """
@@ -197,6 +281,21 @@ class DataConverter:
             Dict: 요약 통계 정보
         """
         if not standard_data_list:
+            return self.get_dataframe_summary_stats(pd.DataFrame())
+        
+        return self.get_dataframe_summary_stats(self.to_dataframe(standard_data_list))
+    
+    def get_dataframe_summary_stats(self, df: pd.DataFrame) -> Dict:
+        """
+        표준 데이터 DataFrame의 요약 통계 (get_summary_stats의 DataFrame 버전)
+        
+        Args:
+            df: 표준 데이터 DataFrame
+            
+        Returns:
+            Dict: 요약 통계 정보
+        """
+        if len(df) == 0:
             return {
                 'total_records': 0,
                 'total_cost': 0,
@@ -205,10 +304,8 @@ class DataConverter:
                 'unique_services': 0,
             }
         
-        df = self.to_dataframe(standard_data_list)
-        
         return {
-            'total_records': len(standard_data_list),
+            'total_records': len(df),
             'total_cost': df['cost'].sum(),
             'date_range': {
                 'start': df['date'].min(),
@@ -0,0 +1,80 @@
+"""
+스트리밍 Excel 작성기
+openpyxl write-only 모드로 행을 일정 크기씩 기록하여 메모리 사용량을 일정하게 유지
+"""
+from typing import BinaryIO, Dict, Iterator, Union
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+
+# 한 번에 Python 값으로 변환하는 행 수
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _iter_rows(df: pd.DataFrame, chunk_size: int) -> Iterator[tuple]:
+    """
+    DataFrame 행을 Excel에 쓸 수 있는 값 튜플로 변환 (청크 단위)
+
+    - NaN/NaT -> None (빈 셀)
+    - category -> 원래 값
+    """
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def write_excel(
+    sheets: Dict[str, pd.DataFrame],
+    output: Union[str, BinaryIO],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+):
+    """
+    여러 DataFrame을 시트별로 Excel 파일에 기록 (write-only 모드)
+
+    Args:
+        sheets: {시트 이름: DataFrame} (입력 순서대로 시트 생성)
+        output: 파일 경로 또는 바이너리 버퍼
+        chunk_size: 한 번에 변환할 행 수
+    """
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+
+    for sheet_name, df in sheets.items():
+        sheet = workbook.create_sheet(title=sheet_name)
+
+        if 'raw_data' in df.columns:
+            df = df.drop(columns=['raw_data'])
+
+        header = []
+        for col in df.columns:
+            cell = WriteOnlyCell(sheet, value=str(col))
+            cell.font = header_font
+            header.append(cell)
+        sheet.append(header)
+
+        for row in _iter_rows(df, chunk_size):
+            sheet.append(row)
+
+    workbook.save(output)
+
+
+def write_dataframe_to_excel(
+    df: pd.DataFrame,
+    output: Union[str, BinaryIO],
+    sheet_name: str = '비용데이터',
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+):
+    """
+    DataFrame 하나를 Excel 시트로 기록
+
+    Args:
+        df: 데이터프레임
+        output: 파일 경로 또는 바이너리 버퍼
+        sheet_name: 시트 이름
+        chunk_size: 한 번에 변환할 행 수
+    """
+    write_excel({sheet_name: df}, output, chunk_size=chunk_size)
@@ -0,0 +1,135 @@
+"""
+변환 결과 캐시 (파일 내용 해시 기준)
+같은 CloudCheckr 파일을 다시 업로드하면(새로고침 후 재업로드, 씨엘/세기 전환 등) 파싱/변환 없이
+이전에 저장한 Parquet 파일을 읽어서 사용
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from src.converters.arrow_io import read_parquet, write_parquet
+from src.settlement.allocation import default_allocation
+
+
+# 변환 결과 형식 버전 (파서/변환 결과가 바뀌면 올려서 이전 캐시를 사용하지 않게 함)
+CACHE_FORMAT_VERSION = 3
+
+# 파일 해시 계산 시 한 번에 읽는 크기
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ParsedFrameCache:
+    """
+    파일 내용(SHA-256) → 변환된 DataFrame 캐시
+
+    - 캐시 파일은 cache_dir/<해시>.parquet 하나씩 저장하므로 여러 워커 프로세스가 함께 사용합니다.
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다 (수정 시각 기준 LRU).
+    """
+
+    def __init__(self, cache_dir: str = 'data/shared/parsed', max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 캐시 파일 폴더
+            max_bytes: 캐시 파일 전체 크기 한도
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def source_key(source: Union[str, bytes]) -> str:
+        """
+        파일 내용 해시 (캐시 키)
+
+        Args:
+            source: CSV 파일 경로 또는 파일 내용(bytes)
+
+        Returns:
+            str: SHA-256 hex
+        """
+        # 테넌트 배분 규칙이 바뀌면 environment 정규화 결과도 달라지므로 규칙 해시를 포함
+        digest = hashlib.sha256(
+            f'cloudchecker-v{CACHE_FORMAT_VERSION}:{default_allocation().fingerprint}:'.encode()
+        )
+        if isinstance(source, bytes):
+            digest.update(source)
+        else:
+            with open(source, 'rb') as f:
+                for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.parquet'
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        캐시된 변환 결과 (없으면 None)
+
+        Args:
+            key: source_key() 결과
+
+        Returns:
+            Optional[pd.DataFrame]: 변환된 DataFrame
+        """
+        path = self._path(key)
+        try:
+            df = read_parquet(str(path))
+            os.utime(path)  # 최근 사용 표시 (삭제 순서)
+        except OSError:
+            # 없거나 다른 워커가 삭제/기록 중인 경우
+            return None
+        except (pa.ArrowInvalid, ValueError) as e:
+            # 잘린/손상된 파일 (디스크가 가득 찬 상태에서 기록 등) - 삭제하고 다시 변환
+            print(f"[ERROR] 변환 결과 캐시 손상: {key[:12]} ({e})")
+            path.unlink(missing_ok=True)
+            return None
+        print(f"[DEBUG] 변환 결과 캐시 사용: {key[:12]} ({len(df)}건)")
+        return df
+
+    def put(self, key: str, df: pd.DataFrame):
+        """
+        변환 결과 저장 (빈 결과는 저장하지 않음)
+
+        Args:
+            key: source_key() 결과
+            df: 변환된 DataFrame
+        """
+        if len(df) == 0:
+            return
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        try:
+            write_parquet(df, str(tmp_path), dictionary_ratio=0)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[ERROR] 변환 결과 캐시 저장 실패: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """전체 크기가 한도를 넘으면 오래 사용하지 않은 파일부터 삭제"""
+        entries = []
+        for path in self.cache_dir.glob('*.parquet'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            print(f"[DEBUG] 변환 결과 캐시 삭제: {path.name}")
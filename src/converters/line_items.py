@@ -0,0 +1,115 @@
+"""
+라인 항목 분류 (Custom Charge / Tax / Credit·Refund / Support / Usage)
+변환할 때 한 번만 분류해서 category 컬럼(line_item_class)으로 저장하고,
+집계에서는 매번 서비스명을 소문자로 바꿔 찾는 대신 정수 코드로 비교
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# 분류 컬럼 이름
+LINE_ITEM_CLASS_COLUMN = 'line_item_class'
+
+# 분류 값 (순서 = category 코드)
+LINE_ITEM_USAGE = 'usage'
+LINE_ITEM_CUSTOM_CHARGE = 'custom_charge'
+LINE_ITEM_TAX = 'tax'
+LINE_ITEM_CREDIT = 'credit'
+LINE_ITEM_SUPPORT = 'support'
+LINE_ITEM_CLASSES = [LINE_ITEM_USAGE, LINE_ITEM_CUSTOM_CHARGE, LINE_ITEM_TAX, LINE_ITEM_CREDIT, LINE_ITEM_SUPPORT]
+
+LINE_ITEM_CLASS_DTYPE = pd.CategoricalDtype(LINE_ITEM_CLASSES)
+
+# 분류 규칙 (위에서부터 먼저 맞는 분류, 서비스명 / 설명에 대한 정규식 - 대소문자 구분 없음)
+LINE_ITEM_RULES = [
+    (LINE_ITEM_CUSTOM_CHARGE, re.compile(r'custom charge', re.I), None),
+    (LINE_ITEM_TAX, re.compile(r'\btax(es)?\b', re.I), re.compile(r'^\s*tax(es)?\b', re.I)),
+    (LINE_ITEM_CREDIT, re.compile(r'\b(credits?|refunds?)\b', re.I), re.compile(r'\b(credits?|refunds?)\b', re.I)),
+    (LINE_ITEM_SUPPORT, re.compile(r'\bsupport\b', re.I), None),
+]
+
+
+def _matches(values: pd.Index, pattern) -> np.ndarray:
+    """고유값별 정규식 일치 여부"""
+    if pattern is None or len(values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    return np.fromiter((bool(pattern.search(value)) for value in values), dtype=bool, count=len(values))
+
+
+def classify_line_items(df: pd.DataFrame) -> pd.Series:
+    """
+    라인별 분류 (서비스명 / 설명의 고유값에 대해서만 규칙을 적용한 뒤 코드로 펼침)
+
+    Args:
+        df: 표준 데이터 DataFrame (service_name, description 컬럼)
+
+    Returns:
+        pd.Series: LINE_ITEM_CLASS_DTYPE category (df와 같은 index)
+    """
+    service_codes, services = pd.factorize(df['service_name'].fillna('').astype(str))
+    if 'description' in df.columns:
+        description_codes, descriptions = pd.factorize(df['description'].fillna('').astype(str))
+    else:
+        description_codes, descriptions = np.zeros(len(df), dtype=np.intp), pd.Index([''])
+
+    masks = [
+        _matches(services, service_pattern)[service_codes] | _matches(descriptions, description_pattern)[description_codes]
+        for _, service_pattern, description_pattern in LINE_ITEM_RULES
+    ]
+    codes = np.select(masks, [LINE_ITEM_CLASSES.index(name) for name, _, _ in LINE_ITEM_RULES], default=0)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes.astype(np.int8), dtype=LINE_ITEM_CLASS_DTYPE),
+        index=df.index,
+        name=LINE_ITEM_CLASS_COLUMN,
+    )
+
+
+def with_line_item_class(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    line_item_class 컬럼 추가 또는 정규화 (이미 있으면 공통 category 타입으로 맞춤 - 캐시/저장소에서 읽은 데이터)
+
+    Args:
+        df: 표준 데이터 DataFrame
+
+    Returns:
+        pd.DataFrame: line_item_class 컬럼이 있는 DataFrame (바뀐 것이 없으면 같은 객체)
+    """
+    if len(df.columns) == 0 or 'service_name' not in df.columns:
+        return df
+    column = df.get(LINE_ITEM_CLASS_COLUMN)
+    if column is not None and column.dtype == LINE_ITEM_CLASS_DTYPE and not column.isna().any():
+        return df
+    return df.assign(**{LINE_ITEM_CLASS_COLUMN: line_item_classes(df)})
+
+
+def line_item_classes(df: pd.DataFrame) -> pd.Series:
+    """
+    라인별 분류 (line_item_class 컬럼이 있으면 그대로, 없거나 빈 값이 있으면 새로 분류)
+
+    Args:
+        df: 표준 데이터 DataFrame
+
+    Returns:
+        pd.Series: LINE_ITEM_CLASS_DTYPE category
+    """
+    column = df.get(LINE_ITEM_CLASS_COLUMN)
+    if column is not None:
+        column = column.astype(LINE_ITEM_CLASS_DTYPE)
+        if not column.isna().any():
+            return column
+    return classify_line_items(df)
+
+
+def line_item_mask(df: pd.DataFrame, line_item_class: str) -> pd.Series:
+    """
+    분류가 line_item_class인 라인 (category 코드 비교)
+
+    Args:
+        df: 표준 데이터 DataFrame
+        line_item_class: 분류 값 (LINE_ITEM_CLASSES)
+    """
+    classes = line_item_classes(df)
+    return pd.Series(classes.cat.codes.to_numpy() == LINE_ITEM_CLASSES.index(line_item_class), index=df.index)
@@ -0,0 +1,120 @@
+"""
+여러 CSV 파일을 프로세스 풀에서 동시에 변환
+각 프로세스는 변환 결과를 DataFrame(raw_data 제외)으로 돌려주고 부모 프로세스에서 합침
+(작업 함수는 파서 모듈만 불러오는 parse_worker에 있음)
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Union
+
+import pandas as pd
+
+from src.converters.frame_cache import ParsedFrameCache
+from src.converters.parse_worker import convert_csv_file_to_frame
+
+
+# 기본 프로세스 수 (CPU 코어 수)
+DEFAULT_MAX_WORKERS = os.cpu_count() or 1
+
+# 프로세스 풀은 한 번 만들어서 계속 사용 (업로드마다 프로세스를 새로 띄우지 않음)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    공용 프로세스 풀 (처음 호출할 때 생성)
+
+    웹 서버의 스레드와 함께 쓰므로 fork 대신 spawn 방식으로 프로세스를 만듭니다.
+    spawn은 부모의 실행 스크립트를 다시 불러오므로 개발 서버는 run_server.py로 시작합니다.
+
+    Args:
+        max_workers: 프로세스 수 (처음 생성할 때만 적용)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers or DEFAULT_MAX_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def _reset_process_pool():
+    """비정상 종료된 프로세스 풀 폐기 (다음 호출 때 다시 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def convert_csv_files(
+    sources: List[Union[str, bytes]],
+    max_workers: Optional[int] = None,
+    on_file_done: Optional[Callable[[int, int], None]] = None,
+    cache: Optional[ParsedFrameCache] = None
+) -> List[pd.DataFrame]:
+    """
+    여러 CSV 파일을 동시에 변환
+
+    파일이 하나이거나 프로세스를 하나만 쓰는 경우에는 현재 프로세스에서 바로 변환합니다.
+    캐시가 있으면 이전에 변환한 파일(내용 해시가 같은 파일)은 변환하지 않고 캐시에서 읽습니다.
+
+    Args:
+        sources: CSV 파일 경로 또는 파일 내용(bytes) 목록
+        max_workers: 프로세스 수 (None이면 CPU 코어 수)
+        on_file_done: 파일 하나가 끝날 때마다 호출 - on_file_done(완료 파일 수, 파일 순번)
+        cache: 변환 결과 캐시 (None이면 사용 안 함)
+
+    Returns:
+        List[pd.DataFrame]: 파일 순서대로 변환된 DataFrame 목록
+    """
+    frames: List[Optional[pd.DataFrame]] = [None] * len(sources)
+    keys: List[Optional[str]] = [None] * len(sources)
+    done_count = 0
+
+    if cache is not None:
+        for index, source in enumerate(sources):
+            keys[index] = cache.source_key(source)
+            frames[index] = cache.get(keys[index])
+            if frames[index] is not None:
+                done_count += 1
+                if on_file_done:
+                    on_file_done(done_count, index)
+
+    pending = [index for index, frame in enumerate(frames) if frame is None]
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, len(pending))
+
+    def finish(index: int, frame: pd.DataFrame):
+        nonlocal done_count
+        frames[index] = frame
+        if keys[index] is not None:
+            cache.put(keys[index], frame)
+        done_count += 1
+        if on_file_done:
+            on_file_done(done_count, index)
+
+    if workers > 1:
+        try:
+            pool = get_process_pool(max_workers)
+            futures = {
+                pool.submit(convert_csv_file_to_frame, sources[index]): index
+                for index in pending
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+            return frames
+        except BrokenProcessPool:
+            # 프로세스가 비정상 종료된 경우 - 풀을 다시 만들도록 하고 남은 파일은 현재 프로세스에서 변환
+            print("[DEBUG] 프로세스 풀 오류 - 현재 프로세스에서 변환")
+            _reset_process_pool()
+
+    for index in pending:
+        if frames[index] is None:
+            finish(index, convert_csv_file_to_frame(sources[index]))
+    return frames
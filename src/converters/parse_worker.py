@@ -0,0 +1,39 @@
+"""
+프로세스 풀 작업 함수 (업로드 CSV 변환)
+spawn으로 띄운 프로세스는 이 모듈만 불러오므로 파서/변환 모듈 외에는 import하지 않음
+(app이나 데이터셋 저장소를 불러오면 프로세스마다 웹 서버 설정이 다시 실행됨)
+"""
+import io
+from typing import BinaryIO, Union
+
+import pandas as pd
+
+from src.converters.data_converter import DataConverter
+
+
+# 프로세스마다 변환기를 한 번만 생성
+_worker_converter = None
+
+
+def convert_csv_file_to_frame(source: Union[str, bytes, BinaryIO]) -> pd.DataFrame:
+    """
+    CSV 파일 하나를 표준 데이터 DataFrame으로 변환
+
+    Args:
+        source: CSV 파일 경로, 파일 내용(bytes - 업로드 내용을 저장하지 않고 바로 변환)
+            또는 바이너리 스트림 (받는 중인 분할 업로드 - 현재 프로세스에서만 사용)
+
+    Returns:
+        pd.DataFrame: 표준 데이터 DataFrame (raw_data 제외)
+    """
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = DataConverter()
+
+    if isinstance(source, bytes):
+        data = _worker_converter.convert_csv_stream(io.BytesIO(source))
+    elif isinstance(source, str):
+        data = _worker_converter.convert_csv_file(source)
+    else:
+        data = _worker_converter.convert_csv_stream(source)
+    return _worker_converter.to_dataframe(data)
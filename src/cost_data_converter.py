@@ -2,13 +2,17 @@
 메인 변환 모듈
 클라우드체커 CSV -> 표준 데이터 변환의 진입점
 """
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 import os
 
 from src.models.standard_data import StandardCostData
 from src.converters.data_converter import DataConverter
 from src.parsers.cloudchecker_parser import CloudCheckerParser
 
+if TYPE_CHECKING:
+    # 변환 프로세스가 src 패키지를 불러올 때 데이터셋 저장소까지 불러오지 않도록 타입 확인용으로만 import
+    from src.dataset.cost_store import CostHistoryStore
+
 
 class CostDataConverter:
     """
@@ -28,9 +32,14 @@ class CostDataConverter:
         converter.save_to_csv('standard_cost_data.csv')
     """
     
-    def __init__(self):
+    def __init__(self, history_store: Optional['CostHistoryStore'] = None):
+        """
+        Args:
+            history_store: 월별 비용 이력 저장소 (save_to_history / load_history에 사용)
+        """
         self.parser = CloudCheckerParser()
         self.converter = DataConverter()
+        self.history_store = history_store
         self.standard_data: Optional[List[StandardCostData]] = None
         self.source_file: Optional[str] = None
     
@@ -161,6 +170,36 @@ class CostDataConverter:
         
         return self.converter.to_dataframe(self.standard_data)
     
+    def save_to_history(self, company: str = 'ciel') -> List[str]:
+        """
+        변환된 데이터를 월별 비용 이력 저장소에 저장
+        
+        Args:
+            company: 'ciel' 또는 'segi'
+            
+        Returns:
+            List[str]: 저장한 월 목록 (YYYY-MM)
+        """
+        if self.history_store is None:
+            raise ValueError("비용 이력 저장소가 설정되지 않았습니다.")
+        return self.history_store.save(company, self.get_data_as_dataframe())
+    
+    def load_history(self, company: str = 'ciel', start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """
+        비용 이력 저장소에서 날짜 범위 데이터 읽기 (다시 변환하지 않음, 범위에 걸치는 달의 파일만 읽음)
+        
+        Args:
+            company: 'ciel' 또는 'segi'
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD)
+            
+        Returns:
+            pd.DataFrame: 데이터프레임
+        """
+        if self.history_store is None:
+            raise ValueError("비용 이력 저장소가 설정되지 않았습니다.")
+        return self.history_store.query(company, start_date=start_date, end_date=end_date)
+    
     def get_data_as_json(self) -> list:
         """
         표준 데이터를 JSON으로 반환
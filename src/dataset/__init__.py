@@ -0,0 +1,16 @@
+"""
+__init__.py for dataset package
+"""
+from src.dataset.query_cache import QueryResultCache
+from src.dataset.registry import DatasetRegistry, Workspace
+from src.dataset.snapshot import DatasetSnapshot
+from src.dataset.merge import merge_company_frames
+from src.dataset.shared_store import SharedDatasetStore
+from src.dataset.incremental import incremental_update
+from src.dataset.cost_store import CostHistoryStore
+from src.dataset.fact_store import CostFactStore
+from src.dataset.diff import diff_datasets
+from src.dataset.filter_expr import compile_filter
+from src.dataset.search_index import SearchIndex
+
+__all__ = ['QueryResultCache', 'DatasetRegistry', 'Workspace', 'DatasetSnapshot', 'merge_company_frames', 'SharedDatasetStore', 'incremental_update', 'CostHistoryStore', 'CostFactStore', 'diff_datasets', 'compile_filter', 'SearchIndex']
@@ -0,0 +1,395 @@
+"""
+월별 / 회사별 비용 이력 저장소
+업로드한 표준 데이터를 (작업 공간, 회사, 청구 월) 단위 Parquet 파일로 보관하고, 파티션 목록은 SQLite에 기록
+(재시작 후에도 남아 있고, 여러 달 비교 시 필요한 달의 파일만 읽음)
+"""
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.converters.arrow_io import write_parquet
+from src.dataset.registry import WORKSPACE_ID_PATTERN
+
+
+# 회사 구분 (업로드 종류와 같은 값)
+COMPANIES = ('ciel', 'segi')
+
+# 파티션 파일 안의 정렬 순서 (날짜/서비스 조건으로 row group을 건너뛸 수 있게 함)
+SORT_COLUMNS = ['date', 'service_name']
+
+# Parquet row group 크기
+ROW_GROUP_SIZE = 4096
+
+# 파일 읽기 중 다른 워커가 같은 달을 교체했을 때 다시 시도하는 횟수
+LOAD_RETRIES = 3
+
+# 작업 공간을 지정하지 않은 이력 (명령줄 변환기 등 - 작업 공간 폴더 없이 회사 폴더에 바로 저장)
+DEFAULT_WORKSPACE = ''
+
+
+class CostHistoryStore:
+    """
+    월별 비용 이력 저장소
+
+    파티션은 작업 공간마다 따로 보관합니다 (한 작업 공간의 업로드가 다른 작업 공간의 이력을 바꾸지 않음).
+
+    - save(): 업로드 데이터를 월별로 나눠 저장 (같은 달에 이미 있는 날짜는 새 데이터로 교체, 없는 날짜는 유지)
+    - partitions(): 저장된 (회사, 월) 목록
+    - query(): 날짜 범위에 걸치는 달의 파일만 읽어서 반환 (날짜/서비스 조건은 row group 통계로 거름)
+    - monthly_totals(): 월별 합계 (전월 대비, 연 누계 포함)
+    """
+
+    def __init__(self, root_dir: str = 'data/cost_history'):
+        """
+        Args:
+            root_dir: 파티션 파일과 목록 DB를 저장할 폴더
+        """
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(self.root_dir / 'partitions.db')
+
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: 트랜잭션을 BEGIN IMMEDIATE로 직접 시작
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_db(self):
+        """파티션 목록 테이블 생성 (작업 공간 구분이 없던 목록은 DEFAULT_WORKSPACE 이력으로 옮김)"""
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("BEGIN IMMEDIATE")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(cost_partitions)")]
+            if columns and 'workspace_id' not in columns:
+                conn.execute("ALTER TABLE cost_partitions RENAME TO cost_partitions_old")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cost_partitions (
+                    workspace_id TEXT NOT NULL,
+                    company TEXT NOT NULL,
+                    month TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    rows INTEGER NOT NULL,
+                    min_date TEXT NOT NULL,
+                    max_date TEXT NOT NULL,
+                    total_cost REAL NOT NULL,
+                    updated_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (workspace_id, company, month)
+                )
+            """)
+            if columns and 'workspace_id' not in columns:
+                conn.execute("""
+                    INSERT INTO cost_partitions
+                    SELECT ?, company, month, filename, rows, min_date, max_date, total_cost, updated_at
+                    FROM cost_partitions_old
+                """, (DEFAULT_WORKSPACE,))
+                conn.execute("DROP TABLE cost_partitions_old")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _check_company(company: str):
+        if company not in COMPANIES:
+            raise ValueError(f"잘못된 회사 구분입니다: {company}")
+
+    @staticmethod
+    def _check_workspace(workspace_id: str):
+        if workspace_id != DEFAULT_WORKSPACE and not WORKSPACE_ID_PATTERN.match(workspace_id or ''):
+            raise ValueError(f"잘못된 작업 공간 ID입니다: {workspace_id}")
+
+    def _company_dir(self, workspace_id: str, company: str) -> Path:
+        """파티션 파일 폴더 (작업 공간별 / 회사별)"""
+        if workspace_id == DEFAULT_WORKSPACE:
+            return self.root_dir / company
+        return self.root_dir / 'workspaces' / workspace_id / company
+
+    def save(self, company: str, df: pd.DataFrame, workspace_id: str = DEFAULT_WORKSPACE) -> List[str]:
+        """
+        업로드 데이터를 월별 파티션으로 저장
+
+        Args:
+            company: 'ciel' 또는 'segi'
+            df: 표준 데이터 DataFrame (KRW 컬럼 없이 USD 기준)
+            workspace_id: 작업 공간 ID
+
+        Returns:
+            List[str]: 저장한 월 목록 (YYYY-MM)
+        """
+        self._check_company(company)
+        self._check_workspace(workspace_id)
+        if df is None or len(df) == 0:
+            return []
+
+        company_dir = self._company_dir(workspace_id, company)
+        company_dir.mkdir(parents=True, exist_ok=True)
+        months = df['date'].dt.strftime('%Y-%m')
+
+        saved = []
+        written = []
+        replaced = []
+        conn = self._connect()
+        try:
+            # 다른 워커가 같은 달을 동시에 저장하지 않도록 쓰기 잠금을 먼저 잡음
+            conn.execute("BEGIN IMMEDIATE")
+            for month, month_df in df.groupby(months, sort=True):
+                row = conn.execute(
+                    "SELECT filename FROM cost_partitions WHERE workspace_id = ? AND company = ? AND month = ?",
+                    (workspace_id, company, month)
+                ).fetchone()
+
+                if row:
+                    # 새 데이터에 있는 날짜만 교체
+                    existing = pd.read_parquet(company_dir / row[0])
+                    new_days = month_df['date'].dt.normalize().unique()
+                    existing = existing[~existing['date'].dt.normalize().isin(new_days)]
+                    if len(existing):
+                        month_df = pd.concat([existing, month_df], ignore_index=True)
+
+                month_df = month_df.sort_values(SORT_COLUMNS, kind='stable').reset_index(drop=True)
+
+                filename = f'{month}-{uuid.uuid4().hex[:8]}.parquet'
+                tmp_path = company_dir / f'{filename}.tmp'
+                write_parquet(month_df, str(tmp_path), dictionary_ratio=0, row_group_size=ROW_GROUP_SIZE)
+                os.replace(tmp_path, company_dir / filename)
+                written.append(filename)
+
+                conn.execute("""
+                    INSERT OR REPLACE INTO cost_partitions
+                    (workspace_id, company, month, filename, rows, min_date, max_date, total_cost, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    workspace_id,
+                    company,
+                    month,
+                    filename,
+                    len(month_df),
+                    month_df['date'].min().strftime('%Y-%m-%d'),
+                    month_df['date'].max().strftime('%Y-%m-%d'),
+                    float(month_df['cost'].sum()),
+                    datetime.now().isoformat()
+                ))
+                if row:
+                    replaced.append(row[0])
+                saved.append(month)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            for filename in written:
+                (company_dir / filename).unlink(missing_ok=True)
+            raise
+        finally:
+            conn.close()
+
+        # 이전 파일 삭제 (목록 DB가 새 파일을 가리킨 뒤)
+        for filename in replaced:
+            try:
+                (company_dir / filename).unlink()
+            except OSError:
+                # 다른 프로세스가 읽는 중인 경우 (Windows) - 남은 파일은 목록에 없으므로 조회되지 않음
+                pass
+
+        print(f"[DEBUG] 비용 이력 저장 ({workspace_id or '-'}/{company}): {', '.join(saved)}")
+        return saved
+
+    def partitions(self, company: Optional[str] = None, workspace_id: str = DEFAULT_WORKSPACE) -> List[dict]:
+        """
+        저장된 파티션 목록
+
+        Args:
+            company: 회사 구분 (None이면 전체)
+            workspace_id: 작업 공간 ID
+
+        Returns:
+            List[dict]: company, month, rows, min_date, max_date, total_cost, updated_at
+        """
+        self._check_workspace(workspace_id)
+        query = (
+            "SELECT company, month, rows, min_date, max_date, total_cost, updated_at "
+            "FROM cost_partitions WHERE workspace_id = ?"
+        )
+        params = (workspace_id,)
+        if company:
+            self._check_company(company)
+            query += " AND company = ?"
+            params += (company,)
+        query += " ORDER BY month, company"
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+        columns = ['company', 'month', 'rows', 'min_date', 'max_date', 'total_cost', 'updated_at']
+        partitions = [dict(zip(columns, row)) for row in rows]
+        for partition in partitions:
+            partition['total_cost'] = round(partition['total_cost'], 2)
+        return partitions
+
+    def query(
+        self,
+        company: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        services: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        workspace_id: str = DEFAULT_WORKSPACE
+    ) -> pd.DataFrame:
+        """
+        날짜 범위 데이터 조회 (범위에 걸치는 달의 파일만 읽음)
+
+        Args:
+            company: 'ciel' 또는 'segi'
+            start_date: 시작 날짜 (YYYY-MM-DD, 포함)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            services: 서비스 이름 목록 (None이면 전체)
+            columns: 읽을 컬럼 (None이면 전체)
+            workspace_id: 작업 공간 ID
+
+        Returns:
+            pd.DataFrame: 조회 결과 (날짜, 서비스 순)
+        """
+        self._check_company(company)
+        self._check_workspace(workspace_id)
+        company_dir = self._company_dir(workspace_id, company)
+
+        filters = []
+        if start_date:
+            filters.append(('date', '>=', pd.Timestamp(start_date)))
+        if end_date:
+            filters.append(('date', '<', pd.Timestamp(end_date) + pd.Timedelta(days=1)))
+        if services:
+            filters.append(('service_name', 'in', list(services)))
+
+        for attempt in range(LOAD_RETRIES):
+            filenames = self._partition_files(workspace_id, company, start_date, end_date)
+            try:
+                frames = [
+                    pq.read_table(
+                        company_dir / filename,
+                        columns=columns,
+                        filters=filters or None,
+                        memory_map=True
+                    ).to_pandas()
+                    for filename in filenames
+                ]
+                break
+            except FileNotFoundError:
+                # 읽는 사이에 다른 워커가 같은 달을 새 파일로 교체함 - 목록부터 다시 조회
+                if attempt == LOAD_RETRIES - 1:
+                    raise
+
+        print(f"[DEBUG] 비용 이력 조회 ({company}, {start_date} ~ {end_date}): {len(filenames)}개 파티션")
+        if not frames:
+            return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def _partition_files(
+        self, workspace_id: str, company: str, start_date: Optional[str], end_date: Optional[str]
+    ) -> List[str]:
+        """날짜 범위와 겹치는 달의 파일 이름 (파티션 목록의 최소/최대 날짜로 선택)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT filename FROM cost_partitions
+                WHERE workspace_id = ? AND company = ? AND max_date >= ? AND min_date <= ?
+                ORDER BY month
+            """, (workspace_id, company, start_date or '0000-00-00', end_date or '9999-99-99')).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def monthly_totals(
+        self,
+        company: str,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        group_by: Optional[str] = None,
+        workspace_id: str = DEFAULT_WORKSPACE
+    ) -> List[dict]:
+        """
+        월별 합계 (전월 대비 증감, 연 누계 포함)
+
+        그룹 없이 전체 합계만 필요하면 파일을 읽지 않고 파티션 목록의 합계를 사용합니다.
+        전월 대비 증감은 바로 앞 달이 저장되어 있을 때만 계산합니다 (중간 달이 없으면 None).
+
+        Args:
+            company: 'ciel' 또는 'segi'
+            start_month: 시작 월 (YYYY-MM)
+            end_month: 종료 월 (YYYY-MM)
+            group_by: 월 안에서 나눌 컬럼 (service_name, environment 등, None이면 전체만)
+            workspace_id: 작업 공간 ID
+
+        Returns:
+            List[dict]: month, total_cost, change, change_pct, ytd_cost (+ group_by별 합계)
+        """
+        self._check_company(company)
+        # 연 누계 / 전월 대비는 범위 앞의 달도 포함해서 계산하고, 결과에는 범위 안의 달만 담음
+        all_partitions = self.partitions(company, workspace_id=workspace_id)
+        partitions = [
+            partition for partition in all_partitions
+            if (not start_month or partition['month'] >= start_month)
+            and (not end_month or partition['month'] <= end_month)
+        ]
+
+        groups = {}
+        if group_by and partitions:
+            df = self.query(
+                company,
+                start_date=partitions[0]['min_date'],
+                end_date=partitions[-1]['max_date'],
+                columns=['date', group_by, 'cost'],
+                workspace_id=workspace_id
+            )
+            df[group_by] = df[group_by].fillna('')
+            grouped = df.groupby([df['date'].dt.strftime('%Y-%m'), group_by])['cost'].sum().round(2)
+            for (month, key), cost in grouped.items():
+                groups.setdefault(month, {})[key] = float(cost)
+
+        totals = []
+        last = None
+        ytd = 0.0
+        for partition in all_partitions:
+            month = partition['month']
+            if end_month and month > end_month:
+                break
+            total = partition['total_cost']
+            if last is None or last['month'][:4] != month[:4]:
+                ytd = 0.0
+            ytd += total
+            previous = last if last is not None and last['month'] == _previous_month(month) else None
+            last = partition
+            if start_month and month < start_month:
+                continue
+
+            item = {
+                'month': month,
+                'total_cost': total,
+                'change': round(total - previous['total_cost'], 2) if previous else None,
+                'change_pct': (
+                    round((total - previous['total_cost']) / previous['total_cost'] * 100, 2)
+                    if previous and previous['total_cost'] else None
+                ),
+                'ytd_cost': round(ytd, 2),
+                'rows': partition['rows'],
+            }
+            if group_by:
+                item[group_by] = groups.get(month, {})
+            totals.append(item)
+        return totals
+
+
+def _previous_month(month: str) -> str:
+    """YYYY-MM의 전월"""
+    year, number = int(month[:4]), int(month[5:7])
+    return f'{year - 1}-12' if number == 1 else f'{year}-{number - 1:02d}'
@@ -0,0 +1,165 @@
+"""
+같은 기간 CloudCheckr 파일 두 버전 비교 (추가 / 삭제 / 비용 변경 라인)
+월을 다시 받은 경우(크레딧, 늦게 들어온 요금) 어떤 라인이 바뀌었는지 해시 조인으로 찾음
+"""
+from dataclasses import dataclass
+from typing import List
+
+import pandas as pd
+
+
+# 라인 매칭 키 (같은 키가 여러 건이면 개수만큼 짝지음)
+DIFF_KEY_COLUMNS = ['date', 'service_name', 'description', 'original_environment']
+
+# 같은 비용으로 보는 자릿수 (소수 넷째 자리까지 같으면 변경 없음)
+COST_DECIMALS = 4
+
+# 결과 라인에 포함하는 컬럼
+LINE_COLUMNS = DIFF_KEY_COLUMNS + ['environment']
+
+# 라인 변경 종류
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_CHANGED = 'changed'
+
+
+@dataclass
+class DatasetDiff:
+    """두 데이터셋 비교 결과"""
+
+    lines: pd.DataFrame  # 바뀐 라인 (LINE_COLUMNS + change, old_cost, new_cost, delta)
+    old_records: int = 0
+    new_records: int = 0
+    unchanged_records: int = 0  # 키와 비용이 같은 라인 수
+
+    def totals(self) -> dict:
+        """전체 건수 / 비용 증감"""
+        counts = self.lines['change'].value_counts()
+        return {
+            'old_records': self.old_records,
+            'new_records': self.new_records,
+            'unchanged': self.unchanged_records,
+            'added': int(counts.get(CHANGE_ADDED, 0)),
+            'removed': int(counts.get(CHANGE_REMOVED, 0)),
+            'changed': int(counts.get(CHANGE_CHANGED, 0)),
+            'delta': round(float(self.lines['delta'].sum()), 6),
+        }
+
+    def deltas_by(self, column: str) -> List[dict]:
+        """
+        컬럼 값별 비용 증감 (증감 절댓값 큰 순)
+
+        Args:
+            column: 묶을 컬럼 (service_name, date, environment 등)
+        """
+        if len(self.lines) == 0:
+            return []
+        grouped = self.lines.groupby(self.lines[column].fillna(''), sort=False).agg(
+            old_cost=('old_cost', 'sum'),
+            new_cost=('new_cost', 'sum'),
+            delta=('delta', 'sum'),
+            lines=('change', 'size'),
+        )
+        grouped = grouped.reindex(grouped['delta'].abs().sort_values(ascending=False).index)
+        return [
+            {column: key, **{name: round(float(value), 6) if name != 'lines' else int(value)
+                             for name, value in row.items()}}
+            for key, row in grouped.iterrows()
+        ]
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """매칭 키 정규화 (날짜는 'YYYY-MM-DD', 빈 값은 '') + 비용 비교값"""
+    prepared = pd.DataFrame({
+        'date': df['date'].astype(str).str[:10],
+        'service_name': df['service_name'].fillna('').astype(str),
+        'description': df['description'].fillna('').astype(str),
+        'original_environment': (
+            df['original_environment'].fillna('').astype(str)
+            if 'original_environment' in df.columns else ''
+        ),
+        'environment': df['environment'].fillna('').astype(str) if 'environment' in df.columns else '',
+        'cost': df['cost'].astype(float).fillna(0.0),
+    })
+    prepared['_cost_key'] = prepared['cost'].round(COST_DECIMALS)
+    return prepared.reset_index(drop=True)
+
+
+def _pair(old: pd.DataFrame, new: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """
+    키가 같은 라인을 개수만큼 짝지음 (각 키 안에서 n번째끼리 - 멀티셋 해시 조인)
+
+    Returns:
+        pd.DataFrame: _old_row, _new_row 컬럼 (짝이 없으면 -1)
+    """
+    if len(old) == 0 or len(new) == 0:
+        # 한쪽이 비어 있으면 짝이 없음 (빈 문자열 컬럼끼리는 merge할 수 없음)
+        return pd.DataFrame({
+            '_old_row': list(old.index) + [-1] * len(new),
+            '_new_row': [-1] * len(old) + list(new.index),
+        }, dtype='int64')
+
+    left = old[keys].assign(
+        _occurrence=old.groupby(keys, sort=False).cumcount().to_numpy(),
+        _old_row=old.index.to_numpy(),
+    )
+    right = new[keys].assign(
+        _occurrence=new.groupby(keys, sort=False).cumcount().to_numpy(),
+        _new_row=new.index.to_numpy(),
+    )
+    paired = left.merge(right, on=keys + ['_occurrence'], how='outer')
+    return paired[['_old_row', '_new_row']].fillna(-1).astype('int64')
+
+
+def diff_datasets(old_df: pd.DataFrame, new_df: pd.DataFrame) -> DatasetDiff:
+    """
+    두 데이터셋 비교
+
+    1. (키 + 비용)이 같은 라인을 개수만큼 짝지어 변경 없음으로 제외
+    2. 남은 라인을 키만으로 다시 짝지어 비용 변경 라인으로 처리
+    3. 짝이 없는 이전 라인은 삭제, 새 라인은 추가
+
+    Args:
+        old_df: 이전 버전 데이터 (표준 데이터)
+        new_df: 새 버전 데이터 (표준 데이터)
+
+    Returns:
+        DatasetDiff: 비교 결과
+    """
+    old = _prepare(old_df)
+    new = _prepare(new_df)
+
+    exact = _pair(old, new, DIFF_KEY_COLUMNS + ['_cost_key'])
+    matched = (exact['_old_row'] >= 0) & (exact['_new_row'] >= 0)
+    unchanged = int(matched.sum())
+
+    old_rest = old.loc[exact.loc[(exact['_old_row'] >= 0) & ~matched, '_old_row']]
+    new_rest = new.loc[exact.loc[(exact['_new_row'] >= 0) & ~matched, '_new_row']]
+    paired = _pair(old_rest, new_rest, DIFF_KEY_COLUMNS)
+
+    has_old = paired['_old_row'] >= 0
+    has_new = paired['_new_row'] >= 0
+
+    # 라인 정보는 새 라인 기준 (삭제 라인은 이전 라인)
+    old_lines = old.reindex(paired['_old_row'].to_numpy()).reset_index(drop=True)
+    new_lines = new.reindex(paired['_new_row'].to_numpy()).reset_index(drop=True)
+    lines = new_lines[LINE_COLUMNS].where(has_new, old_lines[LINE_COLUMNS], axis=0)
+
+    old_cost = old_lines['cost'].fillna(0.0)
+    new_cost = new_lines['cost'].fillna(0.0)
+    lines['change'] = CHANGE_CHANGED
+    lines.loc[~has_old.to_numpy(), 'change'] = CHANGE_ADDED
+    lines.loc[~has_new.to_numpy(), 'change'] = CHANGE_REMOVED
+    lines['old_cost'] = old_cost
+    lines['new_cost'] = new_cost
+    lines['delta'] = new_cost - old_cost
+
+    lines = lines.iloc[lines['delta'].abs().sort_values(ascending=False, kind='stable').index].reset_index(drop=True)
+
+    print(f"[DEBUG] 데이터셋 비교: {len(old)}건 -> {len(new)}건, 같은 라인 {unchanged}건, 바뀐 라인 {len(lines)}건")
+    return DatasetDiff(
+        lines=lines,
+        old_records=len(old),
+        new_records=len(new),
+        unchanged_records=unchanged,
+    )
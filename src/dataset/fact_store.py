@@ -0,0 +1,455 @@
+"""
+SQLite 비용 팩트 테이블 (DataFrame 대신 SQL로 조회하는 데이터셋 백엔드)
+문자열 컬럼은 값 사전(dim_*) 테이블의 ID로 저장하고, 날짜/환경/서비스 기준 커버링 인덱스로
+/api/data 필터·정렬·페이지와 /api/summary 집계를 테이블만으로 처리
+"""
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+# 사전 인코딩해서 저장하는 문자열 컬럼 (컬럼마다 dim_<컬럼> 테이블)
+DIMENSION_COLUMNS = (
+    'account_id', 'account_name', 'service_name', 'description', 'resource_id', 'region',
+    'currency', 'department', 'project', 'environment', 'original_environment',
+    'cost_center', 'usage_type', 'usage_unit', 'line_item_class',
+    'pricing_model', 'operating_system', 'database_engine', 'instance_type', 'instance_family', 'instance_size',
+)
+
+# 숫자 컬럼
+MEASURE_COLUMNS = ('cost', 'usage_amount', 'cost_krw', 'exchange_rate')
+
+# 날짜 컬럼 ('YYYY-MM-DD' 문자열로 저장 - date는 datetime64, exchange_date는 date 객체로 복원)
+DATE_COLUMNS = ('date', 'exchange_date')
+
+# 한 번에 넣는 행 수 (executemany)
+INSERT_BATCH_SIZE = 5000
+
+
+def sort_dataframe(df: pd.DataFrame, sort_by: str, ascending: bool) -> pd.DataFrame:
+    """
+    메모리 백엔드 정렬 (query_page의 ORDER BY 값, row_no와 같은 순서)
+
+    빈 값은 항상 마지막, 같은 값은 원래 행 순서를 유지하고 category 컬럼은 코드가 아닌 값으로 정렬
+
+    Args:
+        df: 정렬할 DataFrame
+        sort_by: 정렬 컬럼
+        ascending: 오름차순 여부
+    """
+    key = (lambda values: values.astype(object)) if isinstance(df[sort_by].dtype, pd.CategoricalDtype) else None
+    return df.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last', key=key)
+
+
+class FactVersionChanged(Exception):
+    """조회 중인 데이터셋이 요청한 스냅샷(token)이 아님 (다른 요청이 새 버전을 저장함)"""
+
+
+class CostFactStore:
+    """
+    작업 공간별 비용 팩트 테이블
+
+    - load(): 스냅샷 DataFrame을 한 트랜잭션으로 교체 저장 (사전 테이블 갱신 + executemany)
+    - dataset_info(): 저장된 데이터셋 버전 / 스냅샷 token (스냅샷을 읽지 않고 캐시 키를 만듦)
+    - query_page(): 필터 + 정렬 + 페이지 조회
+    - aggregate(): 필터 + GROUP BY 합계
+    (조회는 읽기 트랜잭션 하나에서 데이터셋 token 확인과 행 조회를 함께 처리)
+    """
+
+    def __init__(self, db_path: str = 'data/shared/cost_facts.db'):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: 트랜잭션을 BEGIN IMMEDIATE로 직접 시작
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_db(self):
+        """팩트/사전/데이터셋 테이블과 인덱스 생성"""
+        fact_columns = ',\n'.join(
+            [f'{column} TEXT' for column in DATE_COLUMNS]
+            + [f'{column}_id INTEGER' for column in DIMENSION_COLUMNS]
+            + [f'{column} REAL' for column in MEASURE_COLUMNS]
+        )
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fact_datasets (
+                    workspace_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    columns TEXT NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    updated_at TIMESTAMP NOT NULL
+                )
+            """)
+            if 'token' not in {row[1] for row in conn.execute("PRAGMA table_info(fact_datasets)")}:
+                conn.execute("ALTER TABLE fact_datasets ADD COLUMN token TEXT NOT NULL DEFAULT ''")
+            for column in DIMENSION_COLUMNS:
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS dim_{column} (
+                        id INTEGER PRIMARY KEY,
+                        value TEXT NOT NULL UNIQUE
+                    )
+                """)
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS cost_facts (
+                    workspace_id TEXT NOT NULL,
+                    row_no INTEGER NOT NULL,
+                    {fact_columns},
+                    PRIMARY KEY (workspace_id, row_no)
+                )
+            """)
+            # 이전 버전 파일에 없는 사전 컬럼 추가
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(cost_facts)")}
+            for column in DIMENSION_COLUMNS:
+                if f'{column}_id' not in existing:
+                    conn.execute(f"ALTER TABLE cost_facts ADD COLUMN {column}_id INTEGER")
+            # 기간 필터 + 환경/서비스 조건 (비용 컬럼까지 포함해서 테이블을 읽지 않음)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cost_facts_date
+                ON cost_facts(workspace_id, date, environment_id, service_name_id, cost, cost_krw)
+            """)
+            # 서비스/환경/프로젝트/라인 항목 분류별 집계
+            conn.execute("DROP INDEX IF EXISTS idx_cost_facts_service")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cost_facts_group
+                ON cost_facts(workspace_id, service_name_id, environment_id, project_id, line_item_class_id, cost, cost_krw)
+            """)
+        finally:
+            conn.close()
+
+    def _encode_dimension(self, conn: sqlite3.Connection, column: str, values: pd.Series) -> pd.Series:
+        """문자열 값을 사전 ID로 변환 (없는 값은 사전에 추가)"""
+        text = values.astype(object).where(values.notna(), None)
+        distinct = [value for value in pd.unique(text) if value is not None]
+        if not distinct:
+            return pd.Series([None] * len(values), index=values.index, dtype=object)
+
+        distinct = [str(value) for value in distinct]
+        conn.executemany(f"INSERT OR IGNORE INTO dim_{column} (value) VALUES (?)", [(value,) for value in distinct])
+        ids = {}
+        for start in range(0, len(distinct), 500):
+            chunk = distinct[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            ids.update(conn.execute(
+                f"SELECT value, id FROM dim_{column} WHERE value IN ({placeholders})", chunk
+            ).fetchall())
+
+        return text.map(lambda value: None if value is None else ids[str(value)]).astype(object)
+
+    def load(
+        self,
+        workspace_id: str,
+        version: int,
+        df: pd.DataFrame,
+        token: str = '',
+        newer_only: bool = False
+    ) -> bool:
+        """
+        작업 공간 데이터셋을 팩트 테이블에 교체 저장 (한 트랜잭션)
+
+        Args:
+            workspace_id: 작업 공간 ID
+            version: 데이터셋(스냅샷) 버전
+            df: 조회 대상 DataFrame
+            token: 스냅샷 token
+            newer_only: True면 더 새 버전이 이미 저장되어 있을 때 건너뜀
+                        (공유 저장소로 버전 번호가 워커 간에 이어질 때 - 늦게 끝난 이전 버전 저장이 덮어쓰지 않도록)
+
+        Returns:
+            bool: 저장했는지 여부
+        """
+        columns = [
+            column for column in df.columns
+            if column in DATE_COLUMNS or column in DIMENSION_COLUMNS or column in MEASURE_COLUMNS
+        ]
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if newer_only:
+                row = conn.execute(
+                    "SELECT version FROM fact_datasets WHERE workspace_id = ?", (workspace_id,)
+                ).fetchone()
+                if row is not None and row[0] > version:
+                    conn.execute("ROLLBACK")
+                    print(f"[DEBUG] 팩트 테이블 저장 건너뜀: 작업 공간 {workspace_id} 버전 {row[0]} > {version}")
+                    return False
+
+            encoded = {'workspace_id': [workspace_id] * len(df), 'row_no': range(len(df))}
+            for column in DATE_COLUMNS:
+                if column in df.columns:
+                    dates = pd.to_datetime(df[column], errors='coerce')
+                    encoded[column] = dates.dt.strftime('%Y-%m-%d').astype(object).where(dates.notna(), None)
+                else:
+                    encoded[column] = None
+            for column in DIMENSION_COLUMNS:
+                encoded[f'{column}_id'] = (
+                    self._encode_dimension(conn, column, df[column]) if column in df.columns else None
+                )
+            for column in MEASURE_COLUMNS:
+                if column in df.columns:
+                    values = pd.to_numeric(df[column], errors='coerce')
+                    encoded[column] = values.astype(object).where(values.notna(), None)
+                else:
+                    encoded[column] = None
+            rows = pd.DataFrame(encoded, index=df.index)
+
+            conn.execute("DELETE FROM cost_facts WHERE workspace_id = ?", (workspace_id,))
+            placeholders = ', '.join('?' * len(rows.columns))
+            insert = f"INSERT INTO cost_facts ({', '.join(rows.columns)}) VALUES ({placeholders})"
+            values = rows.itertuples(index=False, name=None)
+            batch = []
+            for row in values:
+                batch.append(row)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    conn.executemany(insert, batch)
+                    batch = []
+            if batch:
+                conn.executemany(insert, batch)
+
+            conn.execute("""
+                INSERT OR REPLACE INTO fact_datasets (workspace_id, version, columns, row_count, updated_at, token)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (workspace_id, version, json.dumps(columns), len(df), datetime.now().isoformat(), token))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        print(f"[DEBUG] 팩트 테이블 저장: 작업 공간 {workspace_id} 버전 {version} ({len(df)}건)")
+        return True
+
+    def dataset_version(self, workspace_id: str) -> Optional[int]:
+        """저장된 데이터셋 버전 (없으면 None)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT version FROM fact_datasets WHERE workspace_id = ?", (workspace_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def dataset_info(self, workspace_id: str) -> Optional[dict]:
+        """
+        저장된 데이터셋 정보
+
+        Returns:
+            Optional[dict]: version, token, row_count (없으면 None)
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT version, token, row_count FROM fact_datasets WHERE workspace_id = ?", (workspace_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return {'version': row[0], 'token': row[1], 'row_count': row[2]} if row else None
+
+    def invalidate(self, workspace_id: str):
+        """
+        저장된 데이터셋 정보만 삭제 (새 버전을 공개하는 동안 이전 버전을 조회하지 않도록 - 행은 load()가 교체)
+        """
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM fact_datasets WHERE workspace_id = ?", (workspace_id,))
+        finally:
+            conn.close()
+
+    def _columns(self, conn: sqlite3.Connection, workspace_id: str, token: Optional[str] = None) -> List[str]:
+        """저장된 컬럼 목록 (token을 지정하면 같은 스냅샷인지 확인 - 조회와 같은 읽기 트랜잭션에서 호출)"""
+        row = conn.execute(
+            "SELECT columns, token FROM fact_datasets WHERE workspace_id = ?", (workspace_id,)
+        ).fetchone()
+        if row is None:
+            if token is not None:
+                raise FactVersionChanged(workspace_id)
+            raise ValueError(f"팩트 테이블에 데이터가 없습니다: {workspace_id}")
+        if token is not None and row[1] != token:
+            raise FactVersionChanged(workspace_id)
+        return json.loads(row[0])
+
+    @staticmethod
+    def _select_expression(column: str) -> str:
+        """컬럼 값 표현식 (사전 컬럼은 값 테이블 조회)"""
+        if column in DIMENSION_COLUMNS:
+            return f"(SELECT value FROM dim_{column} WHERE id = f.{column}_id)"
+        return f"f.{column}"
+
+    def _where(self, workspace_id: str, filters: Optional[Dict]) -> Tuple[str, list]:
+        """
+        조회 조건 SQL
+
+        filters: services (목록), date_start, date_end ('YYYY-MM-DD'),
+                 사전 컬럼 이름 (environment, project, instance_family 등 - 값 하나 또는 목록)
+        """
+        clauses = ["f.workspace_id = ?"]
+        params: list = [workspace_id]
+        filters = filters or {}
+
+        if filters.get('services'):
+            services = list(filters['services'])
+            clauses.append(
+                f"f.service_name_id IN (SELECT id FROM dim_service_name WHERE value IN ({', '.join('?' * len(services))}))"
+            )
+            params.extend(services)
+        for column in DIMENSION_COLUMNS:
+            values = filters.get(column)
+            if values:
+                values = [values] if isinstance(values, str) else list(values)
+                clauses.append(
+                    f"f.{column}_id IN (SELECT id FROM dim_{column} WHERE value IN ({', '.join('?' * len(values))}))"
+                )
+                params.extend(values)
+        if filters.get('date_start'):
+            clauses.append("f.date >= ?")
+            params.append(filters['date_start'][:10])
+        if filters.get('date_end'):
+            clauses.append("f.date <= ?")
+            params.append(filters['date_end'][:10])
+
+        return ' AND '.join(clauses), params
+
+    def _to_frame(self, rows: list, columns: List[str]) -> pd.DataFrame:
+        """조회 결과를 스냅샷 DataFrame과 같은 타입으로 변환"""
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        for column in columns:
+            if column == 'date':
+                df[column] = pd.to_datetime(df[column])
+            elif column in DATE_COLUMNS:
+                df[column] = pd.to_datetime(df[column]).dt.date.astype(object).where(df[column].notna(), None)
+            elif column in MEASURE_COLUMNS:
+                df[column] = pd.to_numeric(df[column]).astype(float)
+        return df
+
+    def query_page(
+        self,
+        workspace_id: str,
+        filters: Optional[Dict] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = False,
+        offset: int = 0,
+        limit: int = 50,
+        token: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        필터 + 정렬 + 페이지 조회
+
+        Args:
+            workspace_id: 작업 공간 ID
+            filters: 조회 조건 (_where 참고)
+            sort_by: 정렬 컬럼 (데이터셋에 없는 컬럼이면 저장 순서)
+            ascending: 오름차순 여부 (빈 값은 항상 마지막)
+            offset: 건너뛸 행 수
+            limit: 가져올 행 수
+            token: 조회할 스냅샷 token (저장된 데이터셋이 다르면 FactVersionChanged, None이면 확인 안 함)
+
+        Returns:
+            Tuple[pd.DataFrame, int]: (페이지 DataFrame, 조건에 맞는 전체 행 수)
+        """
+        conn = self._connect()
+        try:
+            # 읽기 트랜잭션 - token 확인, 전체 행 수, 페이지가 모두 같은 버전 기준
+            conn.execute("BEGIN")
+            columns = self._columns(conn, workspace_id, token)
+            where, params = self._where(workspace_id, filters)
+
+            total = conn.execute(f"SELECT COUNT(*) FROM cost_facts f WHERE {where}", params).fetchone()[0]
+
+            order = "f.row_no"
+            if sort_by in columns:
+                expression = self._select_expression(sort_by)
+                order = f"{expression} IS NULL, {expression} {'ASC' if ascending else 'DESC'}, f.row_no"
+
+            select = ', '.join(f"{self._select_expression(column)} AS {column}" for column in columns)
+            rows = conn.execute(
+                f"SELECT {select} FROM cost_facts f WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [max(limit, 0), max(offset, 0)]
+            ).fetchall()
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        return self._to_frame(rows, columns), total
+
+    def aggregate(
+        self,
+        workspace_id: str,
+        group_by: List[str],
+        filters: Optional[Dict] = None,
+        token: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        GROUP BY 합계 (사전 ID로 묶은 뒤 값으로 변환)
+
+        Args:
+            workspace_id: 작업 공간 ID
+            group_by: 묶을 사전 컬럼 목록
+            filters: 조회 조건
+            token: 조회할 스냅샷 token (query_page 참고)
+
+        Returns:
+            pd.DataFrame: group_by 컬럼 + cost (+ cost_krw, 데이터셋에 있을 때) + records
+        """
+        unknown = [column for column in group_by if column not in DIMENSION_COLUMNS]
+        if unknown:
+            raise ValueError(f"묶을 수 없는 컬럼입니다: {', '.join(unknown)}")
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            columns = self._columns(conn, workspace_id, token)
+            where, params = self._where(workspace_id, filters)
+            measures = [column for column in ('cost', 'cost_krw') if column in columns]
+
+            keys = ', '.join(f"f.{column}_id" for column in group_by)
+            # TOTAL: 빈 값만 있는 그룹도 0.0 (pandas sum과 같음)
+            sums = ', '.join(f"TOTAL(f.{column})" for column in measures)
+            grouped = conn.execute(
+                f"SELECT {keys}, {sums}, COUNT(*) FROM cost_facts f WHERE {where} GROUP BY {keys}",
+                params
+            ).fetchall()
+
+            # 사전 ID → 값
+            names = {}
+            for index, column in enumerate(group_by):
+                ids = sorted({row[index] for row in grouped if row[index] is not None})
+                names[column] = dict(conn.execute(
+                    f"SELECT id, value FROM dim_{column} WHERE id IN ({', '.join('?' * len(ids))})", ids
+                ).fetchall()) if ids else {}
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        df = pd.DataFrame.from_records(grouped, columns=group_by + measures + ['records'])
+        for column in group_by:
+            df[column] = df[column].map(names[column]).astype(object).where(df[column].notna(), None)
+        for column in measures:
+            df[column] = df[column].astype(float)
+        return df
+
+    def remove(self, workspace_id: str):
+        """작업 공간 데이터 삭제"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cost_facts WHERE workspace_id = ?", (workspace_id,))
+            conn.execute("DELETE FROM fact_datasets WHERE workspace_id = ?", (workspace_id,))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
@@ -0,0 +1,328 @@
+"""
+조회 필터 식 (/api/data 등의 filter 파라미터)
+식을 한 번 파싱해서 실행 계획으로 만들고(식 문자열 기준 캐시), 컬럼 단위 불리언 연산으로 평가
+
+문법 (키워드는 대소문자 구분 없음):
+    식      := 조건 (and | or) 조건 ... / not 조건 / ( 식 )
+    조건    := 컬럼 = 값 | 컬럼 != 값 | 컬럼 > 값 | >= | < | <=
+              | 컬럼 in (값, ...) | 컬럼 not in (값, ...)
+              | 컬럼 between 값 and 값
+              | 컬럼 contains '문자열' | startswith | endswith   (대소문자 구분 없음)
+              | 컬럼 is null | 컬럼 is not null
+    값      := '문자열' | "문자열" | 숫자
+
+예: service_name in ('EC2', 'RDS') and cost >= 10 and not description contains 'transfer'
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# 식 최대 길이 / 괄호·not 최대 중첩
+MAX_EXPRESSION_LENGTH = 2000
+MAX_NESTING_DEPTH = 32
+
+# 캐시할 실행 계획 수
+PLAN_CACHE_SIZE = 256
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*'|"(?:[^"]|"")*")
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+      | (?P<op>>=|<=|!=|<>|==|=|>|<)
+      | (?P<punct>[(),])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE)
+
+KEYWORDS = {'and', 'or', 'not', 'in', 'between', 'contains', 'startswith', 'endswith', 'is', 'null'}
+
+TEXT_OPERATORS = ('contains', 'startswith', 'endswith')
+
+Value = Union[str, float]
+
+
+@dataclass(frozen=True)
+class Condition:
+    """컬럼 조건 하나"""
+
+    column: str
+    operator: str  # =, !=, >, >=, <, <=, in, between, contains, startswith, endswith, is_null
+    values: Tuple[Value, ...] = ()
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    """and / or / not"""
+
+    operator: str
+    operands: Tuple[Union['BoolOp', Condition], ...]
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"필터 식을 해석할 수 없습니다 ({position + 1}번째 글자): {text[position:position + 20]}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = value[1:-1].replace(value[0] * 2, value[0])
+        elif kind == 'name' and value.lower() in KEYWORDS:
+            kind, value = 'keyword', value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """재귀 하강 파서 (토큰 목록 → 실행 계획)"""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else ('end', '')
+
+    def take(self, kind: str, value: str = None) -> str:
+        token_kind, token_value = self.peek()
+        if token_kind != kind or (value is not None and token_value != value):
+            expected = value or kind
+            raise ValueError(f"필터 식 오류: '{expected}'이(가) 필요한 위치에 '{token_value or '끝'}'이(가) 있습니다")
+        self.position += 1
+        return token_value
+
+    def accept(self, kind: str, value: str = None) -> bool:
+        token_kind, token_value = self.peek()
+        if token_kind == kind and (value is None or token_value == value):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek()[0] != 'end':
+            raise ValueError(f"필터 식 오류: 해석할 수 없는 부분이 있습니다: '{self.peek()[1]}'")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.accept('keyword', 'or'):
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else BoolOp('or', tuple(operands))
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while self.accept('keyword', 'and'):
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else BoolOp('and', tuple(operands))
+
+    def parse_not(self):
+        if self.accept('keyword', 'not'):
+            return BoolOp('not', (self.nested(self.parse_not),))
+        if self.accept('punct', '('):
+            node = self.nested(self.parse_or)
+            self.take('punct', ')')
+            return node
+        return self.parse_condition()
+
+    def nested(self, parse):
+        self.depth += 1
+        if self.depth > MAX_NESTING_DEPTH:
+            raise ValueError(f"필터 식의 괄호/not 중첩은 {MAX_NESTING_DEPTH}단계까지 가능합니다")
+        try:
+            return parse()
+        finally:
+            self.depth -= 1
+
+    def parse_value(self) -> Value:
+        kind, value = self.peek()
+        if kind == 'string':
+            self.position += 1
+            return value
+        if kind == 'number':
+            self.position += 1
+            return float(value)
+        raise ValueError(f"필터 식 오류: 값(문자열 또는 숫자)이 필요한 위치에 '{value or '끝'}'이(가) 있습니다")
+
+    def parse_condition(self) -> Condition:
+        column = self.take('name')
+        kind, value = self.peek()
+
+        if kind == 'op':
+            self.position += 1
+            operator = {'==': '=', '<>': '!='}.get(value, value)
+            return Condition(column, operator, (self.parse_value(),))
+
+        if self.accept('keyword', 'is'):
+            negate = self.accept('keyword', 'not')
+            self.take('keyword', 'null')
+            condition = Condition(column, 'is_null')
+            return BoolOp('not', (condition,)) if negate else condition
+
+        negate = self.accept('keyword', 'not')
+        if self.accept('keyword', 'in'):
+            self.take('punct', '(')
+            values = [self.parse_value()]
+            while self.accept('punct', ','):
+                values.append(self.parse_value())
+            self.take('punct', ')')
+            condition = Condition(column, 'in', tuple(values))
+        elif not negate and self.accept('keyword', 'between'):
+            low = self.parse_value()
+            self.take('keyword', 'and')
+            condition = Condition(column, 'between', (low, self.parse_value()))
+        elif not negate and kind == 'keyword' and value in TEXT_OPERATORS:
+            self.position += 1
+            text = self.parse_value()
+            if not isinstance(text, str):
+                raise ValueError(f"필터 식 오류: {value}에는 문자열이 필요합니다")
+            condition = Condition(column, value, (text,))
+        else:
+            raise ValueError(f"필터 식 오류: '{column}' 다음에 비교 연산자가 필요합니다")
+
+        return BoolOp('not', (condition,)) if negate else condition
+
+
+@dataclass(frozen=True)
+class FilterPlan:
+    """파싱한 필터 식 (여러 요청이 함께 사용 - 바뀌지 않음)"""
+
+    expression: str
+    root: Union[BoolOp, Condition]
+
+    @property
+    def columns(self) -> List[str]:
+        """식에서 사용하는 컬럼"""
+        columns = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Condition):
+                if node.column not in columns:
+                    columns.append(node.column)
+            else:
+                stack.extend(node.operands)
+        return columns
+
+    def evaluate(self, df: pd.DataFrame) -> pd.Series:
+        """
+        DataFrame에 대한 불리언 마스크
+
+        Args:
+            df: 조회 대상 DataFrame
+
+        Returns:
+            pd.Series: 조건에 맞는 행 (df와 같은 index)
+        """
+        unknown = [column for column in self.columns if column not in df.columns]
+        if unknown:
+            raise ValueError(f"필터 식에 알 수 없는 컬럼이 있습니다: {', '.join(unknown)}")
+        return pd.Series(_evaluate(self.root, df), index=df.index)
+
+
+def _evaluate(node, df: pd.DataFrame) -> np.ndarray:
+    if isinstance(node, Condition):
+        return _evaluate_condition(node, df[node.column])
+    if node.operator == 'not':
+        return ~_evaluate(node.operands[0], df)
+    masks = [_evaluate(operand, df) for operand in node.operands]
+    return np.logical_and.reduce(masks) if node.operator == 'and' else np.logical_or.reduce(masks)
+
+
+def _text_match(values: pd.Series, operator: str, text: str) -> np.ndarray:
+    """문자열 조건 (대소문자 구분 없음)"""
+    lowered = values.astype(str).str.lower()
+    text = text.lower()
+    if operator == 'contains':
+        matched = lowered.str.contains(text, regex=False)
+    elif operator == 'startswith':
+        matched = lowered.str.startswith(text)
+    else:
+        matched = lowered.str.endswith(text)
+    return matched.fillna(False).to_numpy(dtype=bool) & values.notna().to_numpy()
+
+
+def _comparable(series: pd.Series) -> pd.Series:
+    """비교용 컬럼 (date 객체 컬럼은 filter_dataframe과 같이 'YYYY-MM-DD' 문자열로 비교)"""
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ('date', 'datetime'):
+        return series.astype(str).str[:10].where(series.notna())
+    return series
+
+
+def _coerce(series: pd.Series, values: Tuple[Value, ...], column: str) -> list:
+    """비교 값을 컬럼 타입으로 변환"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        try:
+            return [pd.Timestamp(str(value)) for value in values]
+        except ValueError:
+            raise ValueError(f"{column}에는 날짜(YYYY-MM-DD)를 사용하세요")
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        if not all(isinstance(value, float) for value in values):
+            raise ValueError(f"{column}에는 숫자를 사용하세요")
+        return list(values)
+    return [value if isinstance(value, str) else f'{value:g}' for value in values]
+
+
+def _evaluate_condition(condition: Condition, series: pd.Series) -> np.ndarray:
+    operator = condition.operator
+
+    if operator == 'is_null':
+        blank = series.isna()
+        if not pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_datetime64_any_dtype(series):
+            blank |= series.astype(str).str.strip() == ''
+        return blank.to_numpy(dtype=bool)
+
+    if operator in TEXT_OPERATORS:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # 고유값(category)에만 조건을 적용한 뒤 코드로 펼침 (코드 -1 = 빈 값)
+            categories = pd.Series(series.cat.categories)
+            hits = np.append(_text_match(categories, operator, condition.values[0]), False)
+            return hits[series.cat.codes.to_numpy()]
+        return _text_match(series, operator, condition.values[0])
+
+    series = _comparable(series)
+    values = _coerce(series, condition.values, condition.column)
+
+    if operator in ('=', '!=', 'in'):
+        matched = series.isin(values).to_numpy(dtype=bool)
+        return ~matched if operator == '!=' else matched
+
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series):
+        raise ValueError(f"{condition.column}은(는) 크기 비교를 할 수 없는 컬럼입니다")
+
+    # 문자열 컬럼은 사전순 비교 (날짜 문자열 'YYYY-MM-DD' 기간 조건)
+    if operator == 'between':
+        matched = series.ge(values[0]) & series.le(values[1])
+    else:
+        comparisons = {'>': series.gt, '>=': series.ge, '<': series.lt, '<=': series.le}
+        matched = comparisons[operator](values[0])
+    return matched.fillna(False).to_numpy(dtype=bool)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_filter(expression: str) -> FilterPlan:
+    """
+    필터 식 파싱 (같은 식은 캐시된 실행 계획 사용)
+
+    Args:
+        expression: 필터 식
+
+    Returns:
+        FilterPlan: 실행 계획
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"필터 식은 {MAX_EXPRESSION_LENGTH}자까지 가능합니다")
+    tokens = _tokenize(expression)
+    if not tokens:
+        raise ValueError("필터 식이 비어 있습니다")
+    return FilterPlan(expression, _Parser(tokens).parse())
@@ -0,0 +1,189 @@
+"""
+기간이 겹치는 CloudCheckr 파일의 증분 반영 (날짜별 파티션 교체)
+월중에 같은 달 파일을 다시 받는 경우(251201-251213 → 251201-251226 → 251201-251231)
+이미 반영한 날짜 중 내용이 바뀐 날짜만 다시 변환하고, 새 날짜는 추가함
+"""
+import io
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+
+import pandas as pd
+
+from src.converters.line_items import with_line_item_class
+from src.parsers.description_attributes import with_description_attributes
+
+
+# 날짜별 파티션 정보 컬럼 (day: 'YYYY-MM-DD', content_hash: 원본 행 해시 합, rows: 행 수)
+PARTITION_COLUMNS = ['day', 'content_hash', 'rows']
+
+
+@dataclass
+class IncrementalResult:
+    """증분 반영 결과"""
+
+    df: pd.DataFrame  # 반영 후 전체 데이터
+    partitions: pd.DataFrame  # 반영 후 날짜별 파티션 정보
+    unchanged_days: List[str] = field(default_factory=list)  # 내용이 같아서 유지한 날짜
+    replaced_days: List[str] = field(default_factory=list)  # 내용이 바뀌어서 다시 변환한 날짜
+    added_days: List[str] = field(default_factory=list)  # 새로 추가한 날짜
+    converted_records: int = 0  # 새로 변환한 레코드 수
+
+    def stats(self) -> dict:
+        return {
+            'unchanged_days': len(self.unchanged_days),
+            'replaced_days': self.replaced_days,
+            'added_days': self.added_days,
+            'converted_records': self.converted_records,
+        }
+
+
+def parse_raw_sources(converter, sources: List[Union[str, bytes]]) -> pd.DataFrame:
+    """
+    CSV 파일들을 변환하지 않고 원본 행 그대로 읽어서 합침 (컬럼명만 정규화)
+
+    Args:
+        converter: DataConverter
+        sources: CSV 파일 경로 또는 파일 내용(bytes) 목록
+
+    Returns:
+        pd.DataFrame: 원본 행 DataFrame
+    """
+    frames = []
+    for source in sources:
+        if isinstance(source, bytes):
+            raw_df = converter.parser.parse_csv_stream(io.BytesIO(source))
+        else:
+            raw_df = converter.parser.parse_csv(source)
+
+        is_valid, missing_columns = converter.parser.validate_required_columns(raw_df)
+        if not is_valid:
+            raise ValueError(f"필수 컬럼이 누락되었습니다: {', '.join(missing_columns)}")
+        frames.append(converter.parser.normalize_columns(raw_df))
+
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def raw_row_days(parser, raw_df: pd.DataFrame) -> pd.Series:
+    """원본 행의 날짜 ('YYYY-MM-DD', 날짜가 아닌 집계 행은 None) - 고유값만 파싱"""
+    days = {}
+    for value in raw_df['date'].unique():
+        parsed = parser.parse_date(value)
+        days[value] = parsed.strftime('%Y-%m-%d') if parsed else None
+    return raw_df['date'].map(days)
+
+
+def day_partitions(raw_df: pd.DataFrame, days: pd.Series) -> pd.DataFrame:
+    """
+    날짜별 원본 내용 해시
+
+    행 해시(컬럼 이름 순서로 고정)의 합과 행 수를 사용하므로 파일 안의 행 순서가 바뀌어도 같은 값입니다.
+
+    Args:
+        raw_df: 원본 행 DataFrame
+        days: 행별 날짜 (raw_row_days 결과)
+
+    Returns:
+        pd.DataFrame: day, content_hash, rows 컬럼
+    """
+    row_hashes = pd.util.hash_pandas_object(raw_df[sorted(raw_df.columns)], index=False)
+    partitions = (
+        pd.DataFrame({'day': days, 'content_hash': row_hashes})
+        .dropna(subset=['day'])
+        .groupby('day', sort=True)['content_hash']
+        .agg(content_hash='sum', rows='size')
+        .reset_index()
+    )
+    return partitions[PARTITION_COLUMNS]
+
+
+def source_partitions(converter, sources: List[Union[str, bytes]]) -> pd.DataFrame:
+    """
+    파일들의 날짜별 파티션 정보 (교체 업로드 후 다음 증분 반영의 기준)
+
+    Args:
+        converter: DataConverter
+        sources: CSV 파일 경로 또는 파일 내용(bytes) 목록
+
+    Returns:
+        pd.DataFrame: day, content_hash, rows 컬럼
+    """
+    raw_df = parse_raw_sources(converter, sources)
+    return day_partitions(raw_df, raw_row_days(converter.parser, raw_df))
+
+
+def incremental_update(
+    converter,
+    sources: List[Union[str, bytes]],
+    existing_df: Optional[pd.DataFrame],
+    existing_partitions: Optional[pd.DataFrame]
+) -> IncrementalResult:
+    """
+    새 파일을 기존 데이터에 날짜 단위로 반영
+
+    1. 새 파일을 원본 행 그대로 읽고 날짜별 내용 해시 계산 (변환 전이라 빠름)
+    2. 기존 파티션과 해시가 같은 날짜는 기존 데이터 유지
+    3. 해시가 다른 날짜 / 새 날짜의 행만 표준 데이터로 변환해서 교체/추가
+    (새 파일에 없는 기존 날짜는 그대로 유지, 기존 파티션 정보가 없으면 새 파일의 모든 날짜를 교체)
+
+    Args:
+        converter: DataConverter
+        sources: CSV 파일 경로 또는 파일 내용(bytes) 목록
+        existing_df: 기존 데이터 (없으면 None)
+        existing_partitions: 기존 날짜별 파티션 정보 (없으면 None)
+
+    Returns:
+        IncrementalResult: 반영 결과
+    """
+    raw_df = parse_raw_sources(converter, sources)
+    days = raw_row_days(converter.parser, raw_df)
+    partitions = day_partitions(raw_df, days)
+
+    known_hashes = {}
+    if existing_df is not None and len(existing_df) and existing_partitions is not None:
+        known_hashes = dict(zip(existing_partitions['day'], existing_partitions['content_hash']))
+    existing_days = set()
+    if existing_df is not None and len(existing_df):
+        existing_days = set(existing_df['date'].dt.strftime('%Y-%m-%d').unique())
+
+    result = IncrementalResult(df=existing_df, partitions=partitions)
+    for day, content_hash in zip(partitions['day'], partitions['content_hash']):
+        if known_hashes.get(day) == content_hash:
+            result.unchanged_days.append(day)
+        elif day in existing_days:
+            result.replaced_days.append(day)
+        else:
+            result.added_days.append(day)
+
+    changed_days = set(result.replaced_days) | set(result.added_days)
+    new_df = converter.to_dataframe(converter.convert_dataframe(raw_df[days.isin(changed_days)]))
+    result.converted_records = len(new_df)
+
+    frames = []
+    if existing_df is not None and len(existing_df):
+        # 이전 버전에서 만든 데이터면 속성 컬럼이 없으므로 먼저 추가
+        frames.append(with_description_attributes(
+            existing_df[~existing_df['date'].dt.strftime('%Y-%m-%d').isin(changed_days)]
+        ))
+    if len(new_df):
+        frames.append(new_df)
+    if frames:
+        result.df = with_line_item_class(with_description_attributes(
+            pd.concat(frames, ignore_index=True)
+            .sort_values('date', kind='stable')
+            .reset_index(drop=True)
+        ))
+
+    # 새 파일에 없는 기존 날짜의 파티션 정보는 유지
+    if existing_partitions is not None and known_hashes:
+        kept = existing_partitions[~existing_partitions['day'].isin(partitions['day'])]
+        result.partitions = (
+            pd.concat([kept, partitions], ignore_index=True)
+            .sort_values('day')
+            .reset_index(drop=True)
+        )
+
+    print(
+        f"[DEBUG] 증분 반영: 유지 {len(result.unchanged_days)}일, 교체 {len(result.replaced_days)}일, "
+        f"추가 {len(result.added_days)}일 (변환 {result.converted_records}건)"
+    )
+    return result
@@ -0,0 +1,78 @@
+"""
+씨엘모빌리티 / 세기모빌리티 데이터 합치기 (DataFrame 벡터 연산)
+"""
+import pandas as pd
+
+from src.settlement.allocation import default_allocation
+
+
+# 씨엘 파일에서 세기 파일과 같은 레코드를 찾을 때 사용하는 키
+MATCH_KEY_COLUMNS = ['_day', 'service_name', 'description', '_cost_rounded']
+
+# 합친 뒤 파일별 중복 제거에 사용하는 키
+DEDUP_KEY_COLUMNS = ['date', 'service_name', 'description', '_original_env', 'cost', '_source']
+
+
+def _with_match_key(df: pd.DataFrame) -> pd.DataFrame:
+    """(날짜, 서비스, 설명, 비용 소수 둘째 자리) 매칭 키 컬럼 추가"""
+    return df.assign(
+        _day=df['date'].astype(str).str[:10],
+        _cost_rounded=df['cost'].astype(float).round(2),
+    )
+
+
+def merge_company_frames(ciel_df: pd.DataFrame, segi_df: pd.DataFrame, allocation=None) -> pd.DataFrame:
+    """
+    씨엘 데이터와 세기 데이터 합치기
+
+    1. 씨엘 데이터에서 자회사 테넌트 환경 레코드 제외 (env 태그가 테넌트 이름으로 정규화된 경우, 기본 규칙은 smartmobility)
+    2. 씨엘 데이터에서 세기 데이터와 같은 레코드를 개수만큼 제외
+       (씨엘 파일이 전체 청구서인 경우 - 같은 키가 세기에 n건 있으면 씨엘의 앞쪽 n건 제외)
+    3. 씨엘(필터링) + 세기 데이터를 합친 뒤 파일별 중복만 제거 (원본 환경값 기준)
+
+    Args:
+        ciel_df: 씨엘모빌리티 파일 데이터
+        segi_df: 세기모빌리티 파일 데이터
+        allocation: 테넌트 배분 엔진 (None이면 기본 규칙)
+
+    Returns:
+        pd.DataFrame: 합쳐진 데이터
+    """
+    allocation = allocation or default_allocation()
+    subsidiaries = [tenant for tenant in allocation.tenants if tenant != allocation.default_tenant]
+    ciel = _with_match_key(ciel_df[~ciel_df['environment'].isin(subsidiaries)])
+    segi = _with_match_key(segi_df)
+
+    # 세기 데이터의 키별 개수
+    segi_counts = (
+        segi.groupby(MATCH_KEY_COLUMNS, dropna=False, sort=False)
+        .size()
+        .rename('_segi_count')
+        .reset_index()
+    )
+
+    # 씨엘 레코드가 같은 키 안에서 몇 번째인지 (원래 순서 기준)
+    occurrence = ciel.groupby(MATCH_KEY_COLUMNS, dropna=False, sort=False).cumcount().to_numpy()
+    segi_count = (
+        ciel[MATCH_KEY_COLUMNS]
+        .merge(segi_counts, on=MATCH_KEY_COLUMNS, how='left')['_segi_count']
+        .fillna(0)
+        .to_numpy()
+    )
+    ciel_filtered = ciel[occurrence >= segi_count]
+
+    print(f"[DEBUG] 씨엘 데이터에서 자회사({', '.join(subsidiaries)})/세기 중복 제외: {len(ciel_df)} -> {len(ciel_filtered)}건")
+
+    # 필터링된 씨엘 데이터 + 세기 데이터 합침 (출처를 키에 포함하여 각 파일 내 중복만 제거)
+    combined = pd.concat(
+        [ciel_filtered.assign(_source='ciel'), segi.assign(_source='segi')],
+        ignore_index=True,
+    )
+    combined['_original_env'] = combined['original_environment'].fillna('')
+    combined = combined.drop_duplicates(subset=DEDUP_KEY_COLUMNS, keep='first')
+
+    merged = combined.drop(columns=['_day', '_cost_rounded', '_source', '_original_env'])
+    merged = merged.reset_index(drop=True)
+
+    print(f"[DEBUG] 합쳐진 데이터: {len(merged)}건")
+    return merged
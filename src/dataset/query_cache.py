@@ -0,0 +1,152 @@
+"""
+조회 결과 캐시 모듈
+데이터셋 버전 + 정규화된 조회 조건을 키로 하는 LRU 캐시 (ETag 지원)
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Tuple
+
+
+class QueryResultCache:
+    """
+    API 응답 캐시
+
+    같은 데이터셋 버전에 같은 조회 조건이면 직렬화된 응답 본문을 그대로 재사용합니다.
+    데이터셋 버전이 바뀌면(업로드, 합치기, 환율 변경) 키가 달라지므로 따로 무효화할 필요가 없고,
+    오래된 항목은 LRU 순서로 밀려납니다.
+    """
+
+    # 쉼표로 구분된 다중 선택 파라미터 (순서가 달라도 같은 조회)
+    LIST_PARAMS = {'services'}
+
+    # 쉼표로 구분된 순서 있는 목록 파라미터 (응답 컬럼 순서가 달라지므로 공백만 정리)
+    ORDERED_LIST_PARAMS = {'fields'}
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries: 최대 캐시 항목 수
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[tuple, Tuple[str, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def normalize_params(cls, params) -> tuple:
+        """
+        조회 파라미터 정규화 (빈 값 제거, 키 정렬, 다중 선택 값 정렬 - fields는 순서 유지)
+
+        Args:
+            params: request.args 같은 MultiDict 또는 dict
+
+        Returns:
+            tuple: 정렬된 (키, 값) 튜플
+        """
+        items = params.items(multi=True) if hasattr(params, 'getlist') else params.items()
+
+        normalized = []
+        for key, value in items:
+            value = str(value).strip()
+            if value == '':
+                continue
+            if key in cls.LIST_PARAMS:
+                value = ','.join(sorted(v.strip() for v in value.split(',') if v.strip()))
+            elif key in cls.ORDERED_LIST_PARAMS:
+                value = ','.join(v.strip() for v in value.split(',') if v.strip())
+            normalized.append((key, value))
+
+        return tuple(sorted(normalized))
+
+    def make_key(self, version, endpoint: str, params=None) -> tuple:
+        """
+        캐시 키 생성
+
+        Args:
+            version: 데이터셋 구분 값 (작업 공간 ID, 버전, 스냅샷 token - 재시작 후에도 다른 데이터셋과 겹치지 않아야 함)
+            endpoint: API 구분 이름 (예: 'data', 'summary')
+            params: 조회 파라미터
+
+        Returns:
+            tuple: 캐시 키
+        """
+        return (version, endpoint, self.normalize_params(params or {}))
+
+    @staticmethod
+    def make_etag(key: tuple) -> str:
+        """캐시 키로부터 ETag 값 생성 (키의 스냅샷 token이 달라지면 버전 번호가 같아도 다른 값)"""
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]
+
+    def get(self, key: tuple) -> Optional[Tuple[str, bytes]]:
+        """
+        캐시 조회
+
+        Returns:
+            tuple: (ETag, 응답 본문) 또는 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, body: bytes) -> Tuple[str, bytes]:
+        """
+        캐시 저장 (최대 개수 초과 시 가장 오래 사용되지 않은 항목 제거)
+
+        Returns:
+            tuple: (ETag, 응답 본문)
+        """
+        entry = (self.make_etag(key), body)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], bytes]) -> Tuple[str, bytes]:
+        """
+        캐시에 있으면 반환하고, 없으면 계산 후 저장
+
+        Args:
+            key: 캐시 키
+            compute: 응답 본문(bytes)을 만드는 함수
+
+        Returns:
+            tuple: (ETag, 응답 본문)
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        return self.put(key, compute())
+
+    def invalidate(self, versions: Optional[Iterable] = None):
+        """
+        캐시 항목 제거
+
+        Args:
+            versions: 제거할 데이터셋 버전 목록 (None이면 전체)
+        """
+        with self._lock:
+            if versions is None:
+                self._entries.clear()
+                return
+            versions = set(versions)
+            for key in [k for k in self._entries if k[0] in versions]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """캐시 사용 통계"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,348 @@
+"""
+작업 공간(세션)별 데이터셋 레지스트리
+메모리 사용량을 추적하고, 예산을 넘으면 오래 사용하지 않은 데이터셋을 디스크로 내보냄
+공유 저장소가 설정되면 다른 워커 프로세스가 저장한 새 버전도 가져옴
+"""
+import os
+import pickle
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.dataset.shared_store import SharedDatasetStore
+from src.dataset.snapshot import DatasetSnapshot, EMPTY_SNAPSHOT
+
+
+# 작업 공간 ID 형식 (파일 이름으로도 사용되므로 제한)
+WORKSPACE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def estimate_dataframe_memory(df) -> int:
+    """DataFrame 메모리 사용량 (문자열 포함)"""
+    if df is None:
+        return 0
+    return int(df.memory_usage(deep=True).sum())
+
+
+class Workspace:
+    """
+    작업 공간 하나의 데이터셋 상태
+
+    한 사용자(세션) 또는 팀 작업 공간이 정산 중인 데이터를 보관합니다.
+    데이터는 바뀌지 않는 스냅샷(DatasetSnapshot)으로 보관하며,
+    - 읽기 요청은 잠금 없이 workspace.snapshot 참조를 한 번 가져가서 끝까지 사용하고
+    - 쓰기 요청(업로드, 환율 변경)은 lock으로 서로 직렬화한 뒤 새 스냅샷을 만들어 publish()로 교체합니다.
+    """
+
+    def __init__(self, workspace_id: str):
+        self.workspace_id = workspace_id
+        self.snapshot = EMPTY_SNAPSHOT  # 현재 공개된 데이터셋 버전
+        self.memory_bytes = 0
+        self.last_access = time.time()
+        self.lock = threading.RLock()  # 쓰기 요청 직렬화용 (읽기 요청은 사용하지 않음)
+
+    @property
+    def has_data(self) -> bool:
+        return self.snapshot.has_data
+
+    def publish(self, snapshot: DatasetSnapshot):
+        """새 스냅샷 공개 (참조 교체 - 이미 읽고 있는 요청은 이전 스냅샷을 계속 사용)"""
+        self.snapshot = snapshot
+
+    def measure_memory(self) -> int:
+        """메모리 사용량 재계산"""
+        self.memory_bytes = sum(estimate_dataframe_memory(frame) for frame in self.snapshot.frames())
+        return self.memory_bytes
+
+    def get_state(self) -> DatasetSnapshot:
+        return self.snapshot
+
+    def set_state(self, snapshot: DatasetSnapshot):
+        self.snapshot = snapshot
+
+    def clear_state(self, keep_version: bool = True):
+        # 버전 유지: 다시 읽어오면 같은 버전 / 유지 안 함: 공유 저장소에서 다시 읽도록 0으로
+        self.snapshot = DatasetSnapshot(version=self.snapshot.version if keep_version else 0)
+        self.memory_bytes = 0
+
+
+class DatasetRegistry:
+    """
+    작업 공간 ID별 데이터셋 레지스트리
+
+    - 작업 공간마다 메모리 사용량을 기록하고, 전체가 예산을 넘으면
+      가장 오래 사용하지 않은 작업 공간부터 디스크로 내보냅니다 (LRU).
+    - 내보낸 작업 공간은 다음 접근 시 디스크에서 다시 읽어옵니다.
+    - idle_ttl_seconds 동안 접근하지 않은 작업 공간은 목록에서 삭제하고 내보낸 파일도 지웁니다
+      (세션이 끝난 작업 공간이 계속 쌓이지 않게 함 - 공유 저장소가 있으면 다음 접근 시 저장소에서 다시 읽음).
+    - 공유 저장소(store)가 있으면 새 스냅샷을 저장소에 기록하고, 접근할 때마다
+      다른 워커가 더 새 버전을 저장했는지 확인해서 가져옵니다.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int = 512 * 1024 * 1024,
+        spill_dir: str = 'data/workspaces',
+        store: Optional[SharedDatasetStore] = None,
+        idle_ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            memory_budget_bytes: 메모리에 유지할 전체 데이터셋 크기 한도
+            spill_dir: 내보낸 데이터셋을 저장할 폴더
+            store: 워커 간 공유 저장소 (None이면 프로세스 안에서만 유지)
+            idle_ttl_seconds: 이 시간 동안 접근하지 않은 작업 공간 삭제 (None이면 삭제 안 함)
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self.spill_dir = Path(spill_dir)
+        self.store = store
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._workspaces: 'OrderedDict[str, Workspace]' = OrderedDict()
+        self._spilled: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def is_valid_id(workspace_id: Optional[str]) -> bool:
+        return bool(workspace_id) and bool(WORKSPACE_ID_PATTERN.match(workspace_id))
+
+    def _spill_path(self, workspace_id: str) -> Path:
+        return self.spill_dir / f'{workspace_id}.pkl'
+
+    def get(self, workspace_id: str) -> Workspace:
+        """
+        작업 공간 조회 (없으면 생성, 디스크로 내보낸 상태면 다시 읽기)
+
+        Args:
+            workspace_id: 작업 공간 ID
+
+        Returns:
+            Workspace: 작업 공간
+        """
+        if not self.is_valid_id(workspace_id):
+            raise ValueError(f"잘못된 작업 공간 ID입니다: {workspace_id}")
+
+        with self._lock:
+            workspace = self._workspaces.get(workspace_id)
+            created = workspace is None
+            if created:
+                workspace = Workspace(workspace_id)
+                self._workspaces[workspace_id] = workspace
+
+            self._workspaces.move_to_end(workspace_id)
+            workspace.last_access = time.time()
+            needs_restore = workspace_id in self._spilled
+
+        if needs_restore:
+            with workspace.lock:
+                with self._lock:
+                    path = self._spilled.pop(workspace_id, None)
+                if path:
+                    self._restore(workspace, path)
+
+        refreshed = self.refresh(workspace)
+
+        if needs_restore or refreshed or created:
+            # 다시 읽어온 만큼 다른 작업 공간을 내보내야 할 수 있음 (새 작업 공간이 생기면 오래된 작업 공간 정리)
+            self._evict_if_needed(keep=workspace_id)
+
+        return workspace
+
+    def refresh(self, workspace: Workspace) -> bool:
+        """
+        공유 저장소에 더 새 버전이 있으면 가져오기
+
+        Args:
+            workspace: 작업 공간
+
+        Returns:
+            bool: 새 버전을 가져왔는지 여부
+        """
+        if self.store is None:
+            return False
+        if self.store.latest_version(workspace.workspace_id) <= workspace.snapshot.version:
+            return False
+
+        with workspace.lock:
+            # 잠금을 기다리는 동안 다른 요청이 이미 가져왔을 수 있음
+            if self.store.latest_version(workspace.workspace_id) <= workspace.snapshot.version:
+                return False
+            snapshot = self.store.load(workspace.workspace_id)
+            if snapshot is None:
+                return False
+            workspace.publish(snapshot)
+            workspace.measure_memory()
+        return True
+
+    def publish(self, workspace: Workspace, snapshot: DatasetSnapshot) -> DatasetSnapshot:
+        """
+        새 스냅샷 공개 (공유 저장소가 있으면 먼저 저장해서 다른 워커도 볼 수 있게 함)
+        작업 공간 lock을 잡은 상태에서 호출 - 스냅샷마다 새 token을 정함 (캐시 키 / ETag 구분용)
+
+        Args:
+            workspace: 작업 공간
+            snapshot: 새 스냅샷
+
+        Returns:
+            DatasetSnapshot: 공개된 스냅샷 (공유 저장소 버전 번호 적용)
+        """
+        snapshot = replace(snapshot, token=uuid.uuid4().hex)
+        if self.store is not None:
+            snapshot = self.store.publish(workspace.workspace_id, snapshot)
+        workspace.publish(snapshot)
+        return snapshot
+
+    def update(self, workspace: Workspace):
+        """
+        작업 공간 데이터가 바뀐 뒤 호출 - 메모리 사용량을 다시 계산하고 예산 초과 시 내보내기
+        (작업 공간 lock을 잡은 상태에서 호출하지 않음)
+
+        Args:
+            workspace: 변경된 작업 공간
+        """
+        with workspace.lock:
+            workspace.measure_memory()
+        self._evict_if_needed(keep=workspace.workspace_id)
+
+    def release(self, workspace: Workspace):
+        """
+        작업 공간 데이터를 예산과 관계없이 메모리에서 내보냄 (다음 접근 시 다시 읽음)
+        조회를 팩트 테이블로 처리해서 워커가 DataFrame을 들고 있을 필요가 없을 때 사용
+        (작업 공간 lock을 잡은 상태에서 호출하지 않음)
+
+        Args:
+            workspace: 작업 공간
+        """
+        with workspace.lock:
+            with self._lock:
+                snapshot = self._detach(workspace) if workspace.has_data else None
+            if snapshot is not None:
+                self._write_spill(workspace, snapshot)
+
+    def _evict_if_needed(self, keep: Optional[str] = None):
+        """
+        오래 접근하지 않은 작업 공간을 삭제한 뒤, 예산을 넘는 동안 가장 오래 사용하지 않은 작업 공간을 디스크로 내보냄
+
+        레지스트리 lock 안에서는 스냅샷을 메모리에서 떼어내기만 하고, 파일 저장(pickle)은 lock을 놓은 뒤 처리
+        (저장하는 동안 다른 작업 공간 조회가 멈추지 않음 - 내보내는 작업 공간의 lock은 저장이 끝날 때까지 유지해서
+        같은 작업 공간을 복원하려는 요청은 파일이 완성된 뒤에 읽음)
+        """
+        self._drop_idle(keep)
+
+        detached = []
+        with self._lock:
+            for workspace_id in list(self._workspaces.keys()):
+                if self.total_memory() <= self.memory_budget_bytes:
+                    break
+                if workspace_id == keep:
+                    continue
+
+                workspace = self._workspaces[workspace_id]
+                # 업로드 등으로 사용 중인 작업 공간은 건너뜀
+                if not workspace.lock.acquire(blocking=False):
+                    continue
+                snapshot = self._detach(workspace) if workspace.has_data else None
+                if snapshot is None:
+                    workspace.lock.release()
+                else:
+                    detached.append((workspace, snapshot))
+
+        for workspace, snapshot in detached:
+            try:
+                self._write_spill(workspace, snapshot)
+            finally:
+                workspace.lock.release()
+
+    def _drop_idle(self, keep: Optional[str] = None):
+        """idle_ttl_seconds 동안 접근하지 않은 작업 공간을 목록에서 삭제하고 내보낸 파일도 삭제"""
+        if not self.idle_ttl_seconds:
+            return
+
+        cutoff = time.time() - self.idle_ttl_seconds
+        spill_paths = []
+        with self._lock:
+            # 접근 순서로 정렬되어 있으므로 최근에 접근한 작업 공간이 나오면 중단
+            for workspace_id, workspace in list(self._workspaces.items()):
+                if workspace.last_access >= cutoff:
+                    break
+                if workspace_id == keep:
+                    continue
+                # 업로드 등으로 사용 중인 작업 공간은 건너뜀
+                if not workspace.lock.acquire(blocking=False):
+                    continue
+                del self._workspaces[workspace_id]
+                path = self._spilled.pop(workspace_id, None)
+                if path:
+                    spill_paths.append(path)
+                workspace.lock.release()
+                print(f"[DEBUG] 작업 공간 {workspace_id} 삭제 ({self.idle_ttl_seconds:.0f}초 동안 접근 없음)")
+
+        for path in spill_paths:
+            Path(path).unlink(missing_ok=True)
+
+    def _detach(self, workspace: Workspace) -> Optional[DatasetSnapshot]:
+        """
+        작업 공간 데이터를 메모리에서 해제 (레지스트리/작업 공간 lock 필요)
+
+        Returns:
+            Optional[DatasetSnapshot]: 디스크에 저장해야 할 스냅샷 (공유 저장소에 같은 버전이 있으면 None)
+        """
+        if self.store is not None and self.store.latest_version(workspace.workspace_id) == workspace.snapshot.version:
+            # 공유 저장소에 이미 같은 버전이 있으므로 메모리에서만 해제 (다음 접근 시 다시 매핑)
+            workspace.clear_state(keep_version=False)
+            print(f"[DEBUG] 작업 공간 {workspace.workspace_id} 데이터를 메모리에서 해제 (공유 저장소에 보관)")
+            return None
+
+        snapshot = workspace.get_state()
+        self._spilled[workspace.workspace_id] = str(self._spill_path(workspace.workspace_id))
+        workspace.clear_state()
+        return snapshot
+
+    def _write_spill(self, workspace: Workspace, snapshot: DatasetSnapshot):
+        """떼어낸 스냅샷을 디스크에 저장 (작업 공간 lock만 필요 - 실패하면 메모리로 되돌림)"""
+        path = self._spill_path(workspace.workspace_id)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[ERROR] 작업 공간 {workspace.workspace_id} 데이터 내보내기 실패: {e}")
+            tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                self._spilled.pop(workspace.workspace_id, None)
+            workspace.set_state(snapshot)
+            workspace.measure_memory()
+            return
+
+        print(f"[DEBUG] 작업 공간 {workspace.workspace_id} 데이터를 디스크로 내보냄: {path}")
+
+    def _restore(self, workspace: Workspace, path: str):
+        """디스크로 내보낸 작업 공간 데이터를 다시 읽기 (작업 공간 lock 필요)"""
+        with open(path, 'rb') as f:
+            workspace.set_state(pickle.load(f))
+        os.unlink(path)
+        workspace.measure_memory()
+        print(f"[DEBUG] 작업 공간 {workspace.workspace_id} 데이터를 디스크에서 복원")
+
+    def total_memory(self) -> int:
+        """메모리에 올라와 있는 전체 데이터셋 크기"""
+        with self._lock:
+            return sum(ws.memory_bytes for ws in self._workspaces.values())
+
+    def stats(self) -> dict:
+        """레지스트리 상태"""
+        with self._lock:
+            return {
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'memory_bytes': self.total_memory(),
+                'workspaces': len(self._workspaces),
+                'in_memory': sum(1 for ws in self._workspaces.values() if ws.has_data),
+                'spilled': len(self._spilled),
+            }
@@ -0,0 +1,213 @@
+"""
+Description / 서비스명 검색 역색인
+고유값만 토큰으로 나눠 (용어 → 고유값 ID) 목록을 만들고, 고유값별 행 번호는 정렬된 배열 구간으로 보관해서
+검색할 때 설명 문자열 전체를 훑지 않고 행 번호 목록을 바로 합침 (접두사 검색 지원)
+"""
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# 색인하는 컬럼
+SEARCH_COLUMNS = ['service_name', 'description']
+
+# 접두사 하나가 펼칠 수 있는 최대 용어 수 (너무 짧은 접두사로 전체를 펼치지 않도록)
+MAX_PREFIX_TERMS = 2000
+
+WORD_PATTERN = re.compile(r'[0-9A-Za-z]+')
+# 대소문자 경계 (NatGateway → Nat, Gateway / AWSDataTransfer → AWS, Data, Transfer - 숫자 경계는 나누지 않음)
+CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+# 부분 단어 최소 길이 (FSx → F, Sx 같은 조각은 색인하지 않음)
+MIN_PART_LENGTH = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    색인 용어 (소문자 - 영숫자 단어와 대소문자 경계로 나눈 부분 단어)
+
+    예: "APN2-NatGateway-Hours" → apn2, natgateway, nat, gateway, hours
+    """
+    terms = []
+    for word in WORD_PATTERN.findall(text or ''):
+        terms.append(word.lower())
+        terms.extend(_camel_parts(word))
+    return list(dict.fromkeys(terms))
+
+
+def _camel_parts(word: str) -> List[str]:
+    """대소문자 경계로 나눈 부분 단어 (소문자, 나뉘지 않으면 빈 목록)"""
+    parts = CAMEL_BOUNDARY.split(word)
+    if len(parts) < 2:
+        return []
+    return [part.lower() for part in parts if len(part) >= MIN_PART_LENGTH]
+
+
+class _ColumnIndex:
+    """컬럼 하나의 고유값 → 행 번호 (정렬된 행 번호 배열의 구간)"""
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        self.uniques = [str(value) for value in uniques]
+        order = np.argsort(codes, kind='stable').astype(np.int64)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self.rows = order[len(codes) - int(counts.sum()):]  # 빈 값(-1)은 앞쪽에 모이므로 제외
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def value_rows(self, value_ids: np.ndarray) -> np.ndarray:
+        """고유값 ID 목록 → 행 번호"""
+        if len(value_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        # 구간 [offsets[v], offsets[v + 1])을 한 번에 펼침
+        starts = self.offsets[value_ids]
+        lengths = self.offsets[value_ids + 1] - starts
+        total = int(lengths.sum())
+        positions = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return self.rows[positions]
+
+
+class SearchIndex:
+    """
+    서비스명 / Description 역색인
+
+    용어마다 (컬럼, 고유값 ID) 목록을 가지고, 검색하면 고유값별 행 번호 구간을 이어 붙여 행 번호를 만듭니다.
+    행 번호는 색인을 만든 DataFrame의 위치(iloc)입니다.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Optional[List[str]] = None):
+        """
+        Args:
+            df: 조회 대상 DataFrame
+            columns: 색인할 컬럼 (기본: SEARCH_COLUMNS 중 있는 컬럼)
+        """
+        self.row_count = len(df)
+        self.columns = [c for c in (columns or SEARCH_COLUMNS) if c in df.columns]
+        self._columns = {column: _ColumnIndex(df[column]) for column in self.columns}
+
+        postings: Dict[str, Dict[str, list]] = {}
+        for column, index in self._columns.items():
+            for value_id, value in enumerate(index.uniques):
+                for term in tokenize(value):
+                    postings.setdefault(term, {}).setdefault(column, []).append(value_id)
+
+        self.terms = sorted(postings)
+        self._postings = {
+            term: {column: np.asarray(ids, dtype=np.int64) for column, ids in by_column.items()}
+            for term, by_column in postings.items()
+        }
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """접두사로 시작하는 색인 용어 (사전순)"""
+        start = bisect_left(self.terms, prefix)
+        matched = []
+        for term in self.terms[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            matched.append(term)
+        return matched
+
+    def term_rows(self, terms: List[str]) -> np.ndarray:
+        """용어 중 하나라도 포함하는 행 번호 (정렬, 중복 없음)"""
+        rows = []
+        for column, index in self._columns.items():
+            value_ids = [self._postings[term][column] for term in terms if column in self._postings[term]]
+            if value_ids:
+                # 고유값이 다르면 행도 다르므로 컬럼 안에서는 고유값 ID만 중복 제거
+                rows.append(index.value_rows(np.unique(np.concatenate(value_ids))))
+        if not rows:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(rows[0]) if len(rows) == 1 else np.union1d(rows[0], np.concatenate(rows[1:]))
+
+    def _match(self, word: str, prefix: bool) -> List[str]:
+        if prefix:
+            return self.expand_prefix(word)
+        return [word] if word in self._postings else []
+
+    def search(self, query: str, prefix: bool = True) -> dict:
+        """
+        검색 (검색어의 단어를 모두 포함하는 행 - 단어마다 서비스명/Description 중 어디든)
+
+        대소문자가 섞인 단어는 부분 단어를 모두 포함하는 행도 일치
+        (DataTransfer → "DataTransfer-Out" 용어 또는 "data transfer out" 설명)
+
+        Args:
+            query: 검색어 (예: "natgate", "DataTransfer-Out")
+            prefix: True면 단어로 시작하는 용어도 일치 (natgate → natgateway)
+
+        Returns:
+            dict: rows (행 번호 배열), terms (일치한 색인 용어)
+        """
+        words = list(dict.fromkeys(WORD_PATTERN.findall(query or '')))
+        if not words:
+            raise ValueError("검색어가 없습니다")
+
+        rows = None
+        matched_terms = []
+        for word in words:
+            terms = self._match(word.lower(), prefix)
+            word_rows = self.term_rows(terms)
+
+            parts = _camel_parts(word)
+            if parts:
+                part_terms = [self._match(part, prefix) for part in parts]
+                part_rows = [self.term_rows(found) for found in part_terms]
+                both = part_rows[0]
+                for found in part_rows[1:]:
+                    both = np.intersect1d(both, found, assume_unique=True)
+                if len(both):
+                    word_rows = np.union1d(word_rows, both)
+                    terms = terms + [term for found in part_terms for term in found]
+
+            matched_terms.extend(terms)
+            rows = word_rows if rows is None else np.intersect1d(rows, word_rows, assume_unique=True)
+            if len(rows) == 0:
+                break
+
+        return {'rows': rows, 'terms': list(dict.fromkeys(matched_terms))}
+
+
+class SearchIndexCache:
+    """
+    작업 공간 + 데이터셋 버전별 검색 색인 (LRU)
+
+    데이터셋을 공개할 때 만들어 두고, 다른 워커가 공개했거나 밀려난 경우에는 처음 검색할 때 만듭니다.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Args:
+            max_entries: 최대 색인 수
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[tuple, SearchIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: tuple, index: SearchIndex):
+        """색인 저장 (가장 오래 사용하지 않은 색인부터 제거)"""
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key: tuple, df: pd.DataFrame) -> SearchIndex:
+        """
+        색인 조회 (없으면 만들어서 저장)
+
+        Args:
+            key: (작업 공간 ID, 데이터셋 버전, 스냅샷 token)
+            df: 색인할 DataFrame
+        """
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+        index = SearchIndex(df)
+        self.put(key, index)
+        return index
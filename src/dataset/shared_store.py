@@ -0,0 +1,236 @@
+"""
+워커 프로세스 간 공유 데이터셋 저장소
+스냅샷 DataFrame을 압축하지 않은 Arrow IPC 파일로 저장하고, 작업 공간별 최신 버전은 SQLite에 기록
+(gunicorn 워커마다 같은 파일을 memory-map으로 읽으므로 워커 수만큼 메모리가 늘지 않음)
+"""
+import json
+import os
+import sqlite3
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.converters.arrow_io import map_arrow_ipc, write_arrow_ipc
+from src.dataset.snapshot import DatasetSnapshot
+
+
+# 스냅샷에서 파일로 저장하는 DataFrame 필드
+FRAME_FIELDS = ('ciel_df', 'segi_df', 'df', 'ciel_days', 'segi_days')
+
+# 보관할 버전 수 (직전 버전은 다른 워커가 아직 읽고 있을 수 있으므로 유지)
+KEEP_VERSIONS = 2
+
+# 파일 읽기 중 새 버전이 올라와 이전 파일이 지워졌을 때 다시 시도하는 횟수
+LOAD_RETRIES = 3
+
+# 이 시간보다 오래된 임시 파일은 저장 도중 종료된 워커가 남긴 것으로 보고 삭제 (초)
+STALE_TEMP_SECONDS = 3600
+
+
+class SharedDatasetStore:
+    """
+    작업 공간 데이터셋 공유 저장소
+
+    - publish(): 스냅샷을 파일로 저장하고 버전 기록 (워커 간 쓰기는 SQLite 쓰기 잠금으로 직렬화)
+    - latest_version(): 최신 버전 번호 조회 (요청마다 호출해도 될 만큼 가벼움)
+    - load(): 최신 버전 파일을 memory-map으로 읽어 스냅샷 생성
+    """
+
+    def __init__(self, root_dir: str = 'data/shared'):
+        """
+        Args:
+            root_dir: 데이터셋 파일과 버전 DB를 저장할 폴더 (모든 워커가 같은 로컬 경로를 사용)
+        """
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(self.root_dir / 'versions.db')
+
+        self._init_db()
+        self._remove_stale_temp_files()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: 트랜잭션을 BEGIN IMMEDIATE로 직접 시작
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_db(self):
+        """버전 테이블 생성"""
+        conn = self._connect()
+        try:
+            # WAL 모드 - 버전 조회가 다른 워커의 쓰기를 기다리지 않음
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dataset_versions (
+                    workspace_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    frames TEXT NOT NULL,
+                    exchange_rate REAL,
+                    updated_at TIMESTAMP NOT NULL
+                )
+            """)
+            # 이전 버전 파일에 없는 컬럼 추가 (스냅샷 고유 값 - 캐시 키 / ETag용)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(dataset_versions)")}
+            if 'token' not in existing:
+                conn.execute("ALTER TABLE dataset_versions ADD COLUMN token TEXT NOT NULL DEFAULT ''")
+        finally:
+            conn.close()
+
+    def _workspace_dir(self, workspace_id: str) -> Path:
+        return self.root_dir / workspace_id
+
+    def latest_version(self, workspace_id: str) -> int:
+        """
+        작업 공간의 최신 버전 번호
+
+        Args:
+            workspace_id: 작업 공간 ID
+
+        Returns:
+            int: 버전 번호 (저장된 적 없으면 0)
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT version FROM dataset_versions WHERE workspace_id = ?",
+                (workspace_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else 0
+
+    def publish(self, workspace_id: str, snapshot: DatasetSnapshot) -> DatasetSnapshot:
+        """
+        스냅샷을 새 버전으로 저장
+
+        버전 번호는 저장소의 최신 버전 + 1로 다시 매깁니다 (다른 워커가 먼저 저장한 경우에도 번호가 겹치지 않음).
+
+        Args:
+            workspace_id: 작업 공간 ID
+            snapshot: 저장할 스냅샷
+
+        Returns:
+            DatasetSnapshot: 저장된 버전 번호가 적용된 스냅샷
+        """
+        workspace_dir = self._workspace_dir(workspace_id)
+        workspace_dir.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            # 다른 워커의 저장과 겹치지 않도록 쓰기 잠금을 먼저 잡음
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT version FROM dataset_versions WHERE workspace_id = ?",
+                (workspace_id,)
+            ).fetchone()
+            version = (row[0] if row else 0) + 1
+
+            frames = self._write_frames(workspace_dir, version, snapshot)
+            conn.execute("""
+                INSERT OR REPLACE INTO dataset_versions
+                (workspace_id, version, frames, exchange_rate, updated_at, token)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                workspace_id,
+                version,
+                json.dumps(frames),
+                snapshot.exchange_rate,
+                datetime.now().isoformat(),
+                snapshot.token
+            ))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        self._remove_old_versions(workspace_dir, version)
+        print(f"[DEBUG] 작업 공간 {workspace_id} 데이터셋 버전 {version} 저장")
+        return replace(snapshot, version=version)
+
+    def _write_frames(self, workspace_dir: Path, version: int, snapshot: DatasetSnapshot) -> dict:
+        """스냅샷 DataFrame을 Arrow IPC 파일로 저장 (같은 DataFrame은 한 번만)"""
+        frames = {}
+        written = {}
+        for field in FRAME_FIELDS:
+            frame = getattr(snapshot, field)
+            if frame is None:
+                continue
+
+            if id(frame) not in written:
+                filename = f'v{version:08d}-{field}.arrow'
+                tmp_path = workspace_dir / f'{filename}.tmp'
+                # memory-map으로 복사 없이 읽도록 압축/사전 인코딩 없이 저장
+                write_arrow_ipc(frame, str(tmp_path), compression=None, dictionary_ratio=0)
+                os.replace(tmp_path, workspace_dir / filename)
+                written[id(frame)] = filename
+            frames[field] = written[id(frame)]
+        return frames
+
+    def load(self, workspace_id: str) -> Optional[DatasetSnapshot]:
+        """
+        최신 버전 스냅샷 읽기 (파일은 memory-map으로 읽음)
+
+        Args:
+            workspace_id: 작업 공간 ID
+
+        Returns:
+            Optional[DatasetSnapshot]: 스냅샷 (저장된 적 없으면 None)
+        """
+        for attempt in range(LOAD_RETRIES):
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT version, frames, exchange_rate, token FROM dataset_versions WHERE workspace_id = ?",
+                    (workspace_id,)
+                ).fetchone()
+            finally:
+                conn.close()
+
+            if not row:
+                return None
+
+            version, frames_json, exchange_rate, token = row
+            try:
+                changes = {}
+                mapped = {}
+                for field, filename in json.loads(frames_json).items():
+                    if filename not in mapped:
+                        mapped[filename] = map_arrow_ipc(str(self._workspace_dir(workspace_id) / filename))
+                    changes[field] = mapped[filename]
+            except FileNotFoundError as e:
+                # 읽는 사이에 더 새 버전이 저장되어 파일이 정리됨 - 최신 버전으로 다시 시도
+                if attempt == LOAD_RETRIES - 1:
+                    # 버전 기록만 남고 파일이 없는 경우 (폴더 일부만 복원 등) - 빈 작업 공간으로 시작
+                    print(f"[ERROR] 작업 공간 {workspace_id} 데이터셋 버전 {version} 파일 없음: {e}")
+                    return None
+                continue
+
+            print(f"[DEBUG] 작업 공간 {workspace_id} 데이터셋 버전 {version} 매핑")
+            return DatasetSnapshot(version=version, exchange_rate=exchange_rate, token=token, **changes)
+
+    def _remove_stale_temp_files(self):
+        """저장 도중 종료된 워커가 남긴 임시 파일 삭제 (다른 워커가 지금 쓰는 파일은 건드리지 않도록 오래된 것만)"""
+        cutoff = time.time() - STALE_TEMP_SECONDS
+        for path in self.root_dir.glob('*/v*.arrow.tmp'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def _remove_old_versions(self, workspace_dir: Path, version: int):
+        """보관 버전 수를 넘는 이전 파일 삭제"""
+        for path in workspace_dir.glob('v*-*.arrow'):
+            try:
+                file_version = int(path.name[1:9])
+            except ValueError:
+                continue
+
+            if file_version <= version - KEEP_VERSIONS:
+                try:
+                    path.unlink()
+                except OSError:
+                    # Windows에서는 다른 프로세스가 매핑 중인 파일을 지울 수 없음 - 다음 저장 때 다시 시도
+                    pass
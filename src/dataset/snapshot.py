@@ -0,0 +1,57 @@
+"""
+데이터셋 스냅샷
+한 번 만들어진 뒤에는 바뀌지 않는 데이터셋 버전 (읽기 요청은 시작할 때 받은 스냅샷을 끝까지 사용)
+"""
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """
+    작업 공간 데이터셋의 한 버전
+
+    새 데이터(업로드, 합치기, 환율 변경)는 기존 스냅샷을 고치지 않고
+    next_version()으로 새 스냅샷을 만든 뒤 참조를 한 번에 바꿔서 공개합니다.
+    스냅샷이 가진 DataFrame은 읽기 전용으로 취급합니다.
+    """
+
+    version: int = 0
+    ciel_df: Optional[pd.DataFrame] = None  # 씨엘모빌리티 파일 데이터
+    segi_df: Optional[pd.DataFrame] = None  # 세기모빌리티 파일 데이터
+    df: Optional[pd.DataFrame] = None  # 조회 대상 데이터 (합쳐진 데이터, 환율 적용 시 KRW 컬럼 포함)
+    exchange_rate: Optional[float] = None  # 적용된 환율 (없으면 USD만)
+    ciel_days: Optional[pd.DataFrame] = None  # 씨엘 데이터 날짜별 원본 해시 (증분 업로드용)
+    segi_days: Optional[pd.DataFrame] = None  # 세기 데이터 날짜별 원본 해시 (증분 업로드용)
+    token: str = ''  # 공개할 때 정하는 고유 값 (저장소를 비우거나 재시작해서 버전 번호가 다시 시작되어도 구분)
+
+    @property
+    def has_data(self) -> bool:
+        return self.df is not None
+
+    def next_version(self, **changes) -> 'DatasetSnapshot':
+        """
+        변경 사항을 반영한 다음 버전 스냅샷 생성
+
+        Args:
+            **changes: 바꿀 필드 (ciel_df, segi_df, df, exchange_rate, ciel_days, segi_days)
+
+        Returns:
+            DatasetSnapshot: 버전이 1 증가한 새 스냅샷 (token은 공개할 때 새로 정함)
+        """
+        return replace(self, version=self.version + 1, token='', **changes)
+
+    def frames(self) -> list:
+        """스냅샷이 가진 DataFrame 목록 (같은 객체는 한 번만)"""
+        seen = set()
+        frames = []
+        for frame in (self.ciel_df, self.segi_df, self.df, self.ciel_days, self.segi_days):
+            if frame is not None and id(frame) not in seen:
+                seen.add(id(frame))
+                frames.append(frame)
+        return frames
+
+
+EMPTY_SNAPSHOT = DatasetSnapshot()
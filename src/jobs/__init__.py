@@ -0,0 +1,7 @@
+"""
+__init__.py for jobs package
+"""
+from src.jobs.manager import JobManager
+from src.jobs.upload_spool import ChunkedUploadStore, ChunkOffsetError, UploadFinalizingError
+
+__all__ = ['JobManager', 'ChunkedUploadStore', 'ChunkOffsetError', 'UploadFinalizingError']
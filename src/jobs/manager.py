@@ -0,0 +1,277 @@
+"""
+백그라운드 작업 관리
+업로드 처리처럼 오래 걸리는 작업을 스레드 풀에서 실행하고 진행 상태를 SQLite에 기록
+(gunicorn 워커가 여러 개여도 어느 워커에서든 같은 작업 상태를 조회할 수 있음)
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+FINISHED_STATUSES = (JOB_DONE, JOB_FAILED)
+
+# 다른 워커에서 실행 중인 작업을 기다릴 때 상태 확인 간격 (초)
+POLL_INTERVAL = 0.2
+
+
+def process_alive(pid: int) -> bool:
+    """같은 서버의 프로세스가 살아 있는지 (확인할 수 없는 환경이면 True)"""
+    if pid == os.getpid():
+        return True
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _json_default(value):
+    """numpy 숫자 등 json 모듈이 모르는 값 변환"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class JobManager:
+    """
+    백그라운드 작업 실행 및 상태 관리
+
+    작업 함수는 report(stage, progress, message=None) 키워드 인자를 받아 진행 상태를 알리고,
+    JSON으로 저장 가능한 dict를 결과로 반환합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str = 'data/shared/jobs.db',
+        max_workers: int = 2,
+        retention_hours: int = 24
+    ):
+        """
+        Args:
+            db_path: 작업 상태 SQLite 파일 경로
+            max_workers: 동시에 실행할 작업 수
+            retention_hours: 끝난 작업 상태를 보관할 시간
+        """
+        self.db_path = db_path
+        self.retention_hours = retention_hours
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        """작업 상태 테이블 생성"""
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    workspace_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at TIMESTAMP NOT NULL,
+                    updated_at TIMESTAMP NOT NULL
+                )
+            """)
+            # 작업을 실행하는 워커 프로세스 (워커가 재시작되면 실행 중이던 작업을 실패로 표시)
+            columns = [row['name'] for row in conn.execute("PRAGMA table_info(jobs)")]
+            if 'owner_pid' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner_pid INTEGER")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _update(self, job_id: str, **fields):
+        """작업 상태 컬럼 갱신"""
+        fields['updated_at'] = datetime.now().isoformat()
+        assignments = ', '.join(f'{column} = ?' for column in fields)
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                (*fields.values(), job_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def submit(self, workspace_id: str, kind: str, func: Callable, *args) -> str:
+        """
+        작업 등록 및 실행
+
+        Args:
+            workspace_id: 작업을 요청한 작업 공간 ID (조회 권한 확인용)
+            kind: 작업 종류 (예: 'upload')
+            func: 실행할 함수 - func(*args, report=...) 형태로 호출
+            *args: 함수 인자
+
+        Returns:
+            str: 작업 ID
+        """
+        self._prune()
+
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT INTO jobs (job_id, workspace_id, kind, status, stage, progress, created_at, updated_at, owner_pid)
+                VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)
+            """, (job_id, workspace_id, kind, JOB_QUEUED, 'queued', now, now, os.getpid()))
+            conn.commit()
+        finally:
+            conn.close()
+
+        future = self.executor.submit(self._run, job_id, func, args)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+
+        print(f"[DEBUG] 작업 등록: {job_id} ({kind})")
+        return job_id
+
+    def _forget(self, job_id: str):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _run(self, job_id: str, func: Callable, args: tuple):
+        """작업 실행 (스레드 풀에서 호출)"""
+        def report(stage: str, progress: int, message: Optional[str] = None):
+            self._update(
+                job_id,
+                status=JOB_RUNNING,
+                stage=stage,
+                progress=max(0, min(100, int(progress))),
+                message=message
+            )
+
+        report('start', 0)
+        try:
+            result = func(*args, report=report)
+        except Exception as e:
+            print(f"[ERROR] 작업 실패: {job_id} - {e}")
+            self._update(job_id, status=JOB_FAILED, error=str(e))
+            return
+
+        self._update(
+            job_id,
+            status=JOB_DONE,
+            stage='done',
+            progress=100,
+            message='완료',
+            result=json.dumps(result, ensure_ascii=False, default=_json_default)
+        )
+        print(f"[DEBUG] 작업 완료: {job_id}")
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        작업 상태 조회
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            Optional[dict]: 작업 상태 (없으면 None)
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        if job['status'] not in FINISHED_STATUSES and job['owner_pid'] and not process_alive(job['owner_pid']):
+            # 실행하던 워커가 재시작/종료됨 - 끝나지 않을 작업을 기다리지 않도록 실패로 기록
+            job['status'] = JOB_FAILED
+            job['error'] = '작업을 실행하던 서버 프로세스가 재시작되어 작업이 중단되었습니다. 다시 업로드하세요'
+            self._update(job_id, status=job['status'], error=job['error'])
+            print(f"[DEBUG] 중단된 작업: {job_id} (프로세스 {job['owner_pid']} 없음)")
+
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def is_active(self, job_id: str) -> bool:
+        """
+        대기 중이거나 실행 중인 작업인지 (실행하던 프로세스가 없으면 실패로 기록하므로 False)
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            bool: 아직 끝나지 않은 작업이면 True
+        """
+        job = self.get(job_id)
+        return job is not None and job['status'] not in FINISHED_STATUSES
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        작업이 끝날 때까지 기다린 뒤 상태 반환
+
+        Args:
+            job_id: 작업 ID
+            timeout: 최대 대기 시간 (초, None이면 계속 대기)
+
+        Returns:
+            Optional[dict]: 작업 상태
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+            return self.get(job_id)
+
+        # 다른 워커에서 실행 중인 작업 - 상태가 끝날 때까지 확인
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in FINISHED_STATUSES:
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(POLL_INTERVAL)
+
+    def _prune(self):
+        """보관 기간이 지난 끝난 작업 삭제"""
+        cutoff = (datetime.now() - timedelta(hours=self.retention_hours)).isoformat()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (*FINISHED_STATUSES, cutoff)
+            )
+            conn.commit()
+        finally:
+            conn.close()
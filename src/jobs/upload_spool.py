@@ -0,0 +1,449 @@
+"""
+분할(chunk) 업로드 저장소
+큰 파일을 여러 요청으로 나눠 받아 로컬 디스크에 이어 붙이고, 끊긴 위치부터 다시 보낼 수 있게 함
+(gunicorn 워커가 여러 개여도 같은 폴더를 사용하므로 어느 워커가 받아도 이어짐)
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+from src.jobs.manager import process_alive
+
+
+# 분할 크기 기본값 (요청 하나의 크기 - MAX_CONTENT_LENGTH보다 작아야 함)
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 업로드 ID 형식 (폴더 이름으로 사용)
+UPLOAD_ID_LENGTH = 32
+
+# 받는 중인 파일을 미리 읽을 때 새 분할을 기다리는 최대 시간 (초) - 넘으면 미리 변환 중단 (완료 요청 후 변환)
+INGEST_IDLE_TIMEOUT = 60
+
+# 완료 요청 후 다른 워커의 미리 변환이 끝나기를 기다리는 최대 시간 (초)
+INGEST_WAIT_TIMEOUT = 600
+
+# 받은 크기 / 미리 변환 상태 확인 간격 (초)
+POLL_INTERVAL = 0.2
+
+
+class ChunkOffsetError(ValueError):
+    """받은 위치와 다른 위치의 분할을 보낸 경우 (클라이언트는 received 위치부터 다시 보내면 됨)"""
+
+    def __init__(self, message: str, received: int):
+        super().__init__(message)
+        self.received = received
+
+
+class UploadFinalizingError(ValueError):
+    """이미 완료 요청을 받아 변환 중인 업로드 (다시 완료하거나 분할을 보낼 수 없음)"""
+
+
+class _ReceivingFile(io.RawIOBase):
+    """
+    받는 중인 data.part를 처음부터 읽는 스트림
+
+    아직 받지 않은 위치를 읽거나 그 위치로 이동하면 분할이 도착할 때까지 기다립니다
+    (idle_timeout 동안 받은 크기가 늘지 않으면 TimeoutError - 전송 중단/업로드 삭제).
+    """
+
+    def __init__(self, path: Path, size: int, idle_timeout: float):
+        super().__init__()
+        self._file = open(path, 'rb')
+        self._size = size
+        self._idle_timeout = idle_timeout
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def _wait_for(self, end: int) -> int:
+        """end 위치까지 받을 때까지 기다린 뒤 받은 크기 반환"""
+        received = os.fstat(self._file.fileno()).st_size
+        deadline = time.time() + self._idle_timeout
+        while received < end:
+            if time.time() >= deadline:
+                raise TimeoutError(f'{self._idle_timeout}초 동안 새 분할을 받지 못했습니다 ({received:,}/{self._size:,} bytes)')
+            time.sleep(POLL_INTERVAL)
+            current = os.fstat(self._file.fileno()).st_size
+            if current > received:
+                received = current
+                deadline = time.time() + self._idle_timeout
+        return received
+
+    def readinto(self, buffer) -> int:
+        position = self._file.tell()
+        wanted = min(len(buffer), self._size - position)
+        if wanted <= 0:
+            return 0
+        received = self._wait_for(position + 1)
+        return self._file.readinto(memoryview(buffer)[:min(wanted, received - position)])
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            offset, whence = self._size + offset, io.SEEK_SET
+        elif whence == io.SEEK_CUR:
+            offset, whence = self._file.tell() + offset, io.SEEK_SET
+        self._wait_for(min(offset, self._size))
+        return self._file.seek(offset)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class ChunkedUploadStore:
+    """
+    분할 업로드 저장소
+
+    1. create(): 업로드 시작 (파일 이름, 전체 크기, 전체 SHA-256 선택)
+    2. write_chunk(): offset 위치에 분할 저장 (분할별 SHA-256 선택) - 받은 크기 이후 위치만 허용
+    3. claim(): 모두 받았는지 확인하고 완료 표시 (한 번만 성공) 후 파일 경로 반환
+       attach_job(): 완료 표시에 변환 작업 ID 기록
+    4. verify(): 전체 체크섬 확인 (파일 전체를 읽으므로 변환 작업에서 호출)
+    5. discard(): 변환이 끝나면 삭제
+
+    받는 동안 open_received()로 도착한 분할부터 읽어서 미리 변환할 수 있습니다
+    (start_ingest/finish_ingest로 표시 - 완료 요청 후 변환 작업은 wait_ingest로 끝나기를 기다림).
+
+    완료 표시에는 표시한 프로세스와 변환 작업 ID를 기록하므로, 변환하던 워커가 종료되어 표시가 남아 있으면
+    (프로세스가 없거나 작업이 끝남) 만료 시간을 기다리지 않고 다시 완료할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        root_dir: str = 'data/shared/uploads',
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: int = 1024 * 1024 * 1024,
+        expire_hours: int = 24,
+        job_active: Optional[Callable[[str], bool]] = None
+    ):
+        """
+        Args:
+            root_dir: 분할 파일을 모을 폴더
+            chunk_size: 클라이언트에 알려줄 분할 크기
+            max_size: 업로드 파일 최대 크기
+            expire_hours: 이 시간 동안 새 분할이 없으면 삭제
+            job_active: 변환 작업 ID → 아직 끝나지 않았는지 (예: JobManager.is_active, None이면 프로세스만 확인)
+        """
+        self.root_dir = Path(root_dir)
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.expire_hours = expire_hours
+        self.job_active = job_active
+
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if len(upload_id) != UPLOAD_ID_LENGTH or not upload_id.isalnum():
+            raise KeyError(upload_id)
+        return self.root_dir / upload_id
+
+    def _read_meta(self, upload_id: str) -> dict:
+        meta_path = self._upload_dir(upload_id) / 'meta.json'
+        if not meta_path.exists():
+            raise KeyError(upload_id)
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _finalizing_path(self, upload_id: str) -> Path:
+        return self._upload_dir(upload_id) / 'finalizing'
+
+    def _ingest_path(self, upload_id: str) -> Path:
+        return self._upload_dir(upload_id) / 'ingesting'
+
+    @staticmethod
+    def _read_marker(path: Path) -> Optional[dict]:
+        """완료/미리 변환 표시 내용 (없으면 None, 만드는 중이라 아직 비어 있으면 빈 dict)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return {}
+
+    def _marker_stale(self, marker: dict) -> bool:
+        """완료 표시한 프로세스가 종료되었거나 기록된 변환 작업이 이미 끝난 경우"""
+        if not marker:
+            return False
+        if not process_alive(marker['pid']):
+            return True
+        return bool(marker.get('job_id')) and self.job_active is not None and not self.job_active(marker['job_id'])
+
+    def _finalizing(self, upload_id: str) -> bool:
+        """변환 중인 업로드인지 (남아 있는 완료 표시는 제외)"""
+        marker = self._read_marker(self._finalizing_path(upload_id))
+        return marker is not None and not self._marker_stale(marker)
+
+    def _write_marker(self, upload_id: str, marker: dict):
+        """완료 표시 내용을 임시 파일에 쓴 뒤 교체"""
+        path = self._finalizing_path(upload_id)
+        tmp_path = path.with_name(f'finalizing.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(marker, f)
+        os.replace(tmp_path, path)
+
+    def _received(self, upload_id: str) -> int:
+        data_path = self._upload_dir(upload_id) / 'data.part'
+        return data_path.stat().st_size if data_path.exists() else 0
+
+    def create(self, workspace_id: str, filename: str, size: int, checksum: Optional[str] = None) -> dict:
+        """
+        분할 업로드 시작
+
+        Args:
+            workspace_id: 작업 공간 ID (다른 작업 공간에서는 이어 보낼 수 없음)
+            filename: 원본 파일 이름
+            size: 전체 크기 (bytes)
+            checksum: 전체 파일 SHA-256 (hex, 선택)
+
+        Returns:
+            dict: 업로드 상태 (upload_id, chunk_size, received ...)
+        """
+        if size <= 0:
+            raise ValueError('파일 크기가 올바르지 않습니다')
+        if size > self.max_size:
+            raise ValueError(f'파일이 너무 큽니다 (최대 {self.max_size // (1024 * 1024)}MB)')
+
+        self.cleanup_expired()
+
+        upload_id = uuid.uuid4().hex
+        upload_dir = self._upload_dir(upload_id)
+        upload_dir.mkdir(parents=True)
+        (upload_dir / 'data.part').touch()
+
+        meta = {
+            'upload_id': upload_id,
+            'workspace_id': workspace_id,
+            'filename': filename,
+            'size': size,
+            'checksum': checksum.lower() if checksum else None,
+            'created_at': time.time(),
+        }
+        with open(upload_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        print(f"[DEBUG] 분할 업로드 시작: {upload_id} ({filename}, {size:,} bytes)")
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> dict:
+        """
+        업로드 상태 (이어 보낼 위치 = received)
+
+        Raises:
+            KeyError: 없는 업로드 ID
+        """
+        meta = self._read_meta(upload_id)
+        received = self._received(upload_id)
+        return {
+            **meta,
+            'chunk_size': self.chunk_size,
+            'received': received,
+            'complete': received == meta['size'],
+            'finalizing': self._finalizing(upload_id),
+        }
+
+    def write_chunk(self, upload_id: str, offset: int, data: bytes, checksum: Optional[str] = None) -> int:
+        """
+        분할 저장
+
+        이미 받은 위치의 분할을 다시 보내면(응답을 못 받고 재전송한 경우) 저장하지 않고 현재 상태를 돌려줍니다.
+
+        Args:
+            upload_id: 업로드 ID
+            offset: 분할 시작 위치
+            data: 분할 내용
+            checksum: 분할 SHA-256 (hex, 선택)
+
+        Returns:
+            int: 지금까지 받은 크기
+
+        Raises:
+            KeyError: 없는 업로드 ID
+            ChunkOffsetError: 받은 크기와 다른 위치
+            UploadFinalizingError: 이미 완료 요청을 받은 업로드
+            ValueError: 체크섬 불일치 / 전체 크기 초과
+        """
+        meta = self._read_meta(upload_id)
+        received = self._received(upload_id)
+        if self._finalizing(upload_id):
+            raise UploadFinalizingError(f"{meta['filename']}: 이미 변환 중인 업로드입니다")
+
+        if checksum and hashlib.sha256(data).hexdigest() != checksum.lower():
+            raise ValueError('분할 체크섬이 일치하지 않습니다')
+
+        # 재전송된 분할 (이미 받은 범위)
+        if offset + len(data) <= received:
+            return received
+
+        if offset != received:
+            raise ChunkOffsetError(f'{received} 위치부터 보내야 합니다 (요청 위치: {offset})', received)
+        if offset + len(data) > meta['size']:
+            raise ValueError('전체 파일 크기를 넘었습니다')
+
+        with open(self._upload_dir(upload_id) / 'data.part', 'r+b') as f:
+            f.seek(offset)
+            f.write(data)
+        return offset + len(data)
+
+    def claim(self, upload_id: str) -> str:
+        """
+        완료 표시 후 파일 경로 반환 (표시 파일을 O_EXCL로 만들어 같은 업로드는 한 요청만 성공)
+
+        종료된 워커가 남긴 표시는 다시 가져옵니다 (남은 표시마다 takeover 파일을 O_EXCL로 만들어 한 요청만 성공).
+
+        Raises:
+            KeyError: 없는 업로드 ID
+            UploadFinalizingError: 이미 완료 요청을 받은 업로드
+            ValueError: 아직 다 받지 못함
+        """
+        status = self.status(upload_id)
+        if not status['complete']:
+            raise ValueError(f"{status['filename']}: 아직 다 받지 못했습니다 ({status['received']:,}/{status['size']:,} bytes)")
+
+        marker = {'pid': os.getpid(), 'job_id': None, 'claim_id': uuid.uuid4().hex, 'claimed_at': time.time()}
+        path = self._finalizing_path(upload_id)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            stale = self._read_marker(path)
+            if stale is None or not self._marker_stale(stale):
+                raise UploadFinalizingError(f"{status['filename']}: 이미 변환 중인 업로드입니다")
+            try:
+                os.close(os.open(
+                    self._upload_dir(upload_id) / f"takeover.{stale['claim_id']}",
+                    os.O_CREAT | os.O_EXCL | os.O_WRONLY
+                ))
+            except FileExistsError:
+                raise UploadFinalizingError(f"{status['filename']}: 이미 변환 중인 업로드입니다")
+            self._write_marker(upload_id, marker)
+            print(f"[DEBUG] 중단된 완료 표시 다시 가져옴: {upload_id} (프로세스 {stale['pid']}, 작업 {stale.get('job_id')})")
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(marker, f)
+
+        return str(self._upload_dir(upload_id) / 'data.part')
+
+    def attach_job(self, upload_id: str, job_id: str):
+        """
+        완료 표시에 변환 작업 ID 기록 (작업이 끝났는데 표시가 남아 있으면 다시 완료할 수 있게 함)
+
+        Args:
+            upload_id: claim()으로 완료 표시한 업로드 ID
+            job_id: 변환 작업 ID
+        """
+        marker = self._read_marker(self._finalizing_path(upload_id))
+        if not marker or marker['pid'] != os.getpid():
+            return
+        try:
+            self._write_marker(upload_id, {**marker, 'job_id': job_id})
+        except OSError:
+            # 작업이 벌써 끝나서 업로드 폴더가 삭제된 경우
+            pass
+
+    def release(self, upload_id: str):
+        """완료 표시 취소 (같은 요청의 다른 업로드를 완료하지 못한 경우)"""
+        try:
+            self._finalizing_path(upload_id).unlink()
+        except (KeyError, FileNotFoundError):
+            pass
+
+    def data_path(self, upload_id: str) -> str:
+        """받은 내용을 모으는 파일 경로"""
+        return str(self._upload_dir(upload_id) / 'data.part')
+
+    def open_received(self, upload_id: str, idle_timeout: float = INGEST_IDLE_TIMEOUT) -> BinaryIO:
+        """
+        받는 중인 파일을 처음부터 읽는 스트림 (아직 받지 않은 부분은 도착할 때까지 기다림)
+
+        Raises:
+            KeyError: 없는 업로드 ID
+        """
+        meta = self._read_meta(upload_id)
+        return io.BufferedReader(_ReceivingFile(self._upload_dir(upload_id) / 'data.part', meta['size'], idle_timeout))
+
+    def start_ingest(self, upload_id: str) -> bool:
+        """
+        미리 변환 시작 표시
+
+        Returns:
+            bool: 표시했으면 True (다른 워커가 이미 변환 중이거나 완료 요청을 받은 업로드면 False)
+
+        Raises:
+            KeyError: 없는 업로드 ID
+        """
+        self._read_meta(upload_id)
+        if self._finalizing(upload_id):
+            return False
+        try:
+            fd = os.open(self._ingest_path(upload_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'pid': os.getpid()}, f)
+        return True
+
+    def finish_ingest(self, upload_id: str):
+        """미리 변환 표시 삭제"""
+        try:
+            self._ingest_path(upload_id).unlink()
+        except (KeyError, FileNotFoundError):
+            pass
+
+    def wait_ingest(self, upload_id: str, timeout: float = INGEST_WAIT_TIMEOUT):
+        """미리 변환이 끝날 때까지 대기 (변환하던 프로세스가 종료되었거나 timeout이 지나면 바로 반환)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            marker = self._read_marker(self._ingest_path(upload_id))
+            if marker is None or (marker and not process_alive(marker['pid'])):
+                return
+            time.sleep(POLL_INTERVAL)
+
+    def verify(self, upload_id: str):
+        """
+        전체 체크섬 확인 (create에서 체크섬을 받은 경우)
+
+        Raises:
+            KeyError: 없는 업로드 ID
+            ValueError: 체크섬 불일치
+        """
+        meta = self._read_meta(upload_id)
+        if not meta['checksum']:
+            return
+
+        digest = hashlib.sha256()
+        with open(self._upload_dir(upload_id) / 'data.part', 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        if digest.hexdigest() != meta['checksum']:
+            raise ValueError(f"{meta['filename']}: 파일 체크섬이 일치하지 않습니다")
+
+    def discard(self, upload_id: str):
+        """업로드 삭제"""
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+    def cleanup_expired(self):
+        """오래된(새 분할이 없는) 업로드 삭제"""
+        cutoff = time.time() - self.expire_hours * 3600
+        for upload_dir in self.root_dir.iterdir():
+            data_path = upload_dir / 'data.part'
+            try:
+                last_modified = data_path.stat().st_mtime if data_path.exists() else upload_dir.stat().st_mtime
+            except OSError:
+                continue
+            if last_modified < cutoff:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+                print(f"[DEBUG] 만료된 분할 업로드 삭제: {upload_dir.name}")
@@ -1,15 +1,96 @@
 """
 클라우드체커 CSV 파일 파서
 """
+import gzip
+import io
+import zipfile
+from contextlib import contextmanager
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional
 from datetime import datetime
 import re
 
+from src.settlement.allocation import default_allocation
+
+
+# 압축 형식 확인용 파일 앞부분 바이트
+GZIP_MAGIC = b'\x1f\x8b'
+ZIP_MAGIC = b'PK\x03\x04'
+
+
+class _DataSectionLines:
+    """
+    CSV 텍스트에서 데이터 섹션 줄만 차례로 돌려주는 이터레이터
+
+    - 빈 줄은 건너뜀
+    - 'Cost by Group'이 나오면 그 이후는 모두 무시
+    - 읽은 글자 수가 max_size를 넘으면 중단 (압축 폭탄 방지)
+    """
+
+    def __init__(self, text, max_size: int):
+        self._text = text
+        self._max_size = max_size
+        self._size = 0
+        self.count = 0
+
+    def __iter__(self):
+        for i, line in enumerate(self._text):
+            self._size += len(line)
+            if self._size > self._max_size:
+                raise ValueError(f"파일이 너무 큽니다 (최대 {self._max_size // (1024 * 1024)}MB)")
+            
+            line_stripped = line.strip()
+            
+            # Cost by Group이 나오면 즉시 중단 (이후 데이터는 모두 무시)
+            if 'cost by group' in line_stripped.lower():
+                print(f"[DEBUG] Cost by Group 발견 - {i+1}번째 줄에서 파싱 중단")
+                return
+            
+            # 빈 줄은 건너뛰기 (데이터 사이에 빈 줄이 있을 수 있음)
+            if not line_stripped:
+                continue
+            
+            # 헤더 또는 데이터 라인
+            self.count += 1
+            yield line
+
+
+class _LineReader(io.TextIOBase):
+    """줄 이터레이터를 read()로 읽는 텍스트 스트림으로 감쌈 (pd.read_csv가 필요한 만큼씩 가져감)"""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._pending = ''
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            data = self._pending + ''.join(self._lines)
+            self._pending = ''
+            return data
+
+        chunks = [self._pending]
+        length = len(self._pending)
+        while length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+
+        data = ''.join(chunks)
+        self._pending = data[size:]
+        return data[:size]
+
 
 class CloudCheckerParser:
     """클라우드체커 CSV 파일을 파싱하는 클래스"""
     
+    # 압축을 푼 CSV 최대 크기 (글자 수)
+    MAX_UNCOMPRESSED_SIZE = 1024 * 1024 * 1024
+    
     # 클라우드체커 CSV의 컬럼 매핑 (실제 CSV 형식 기반)
     COLUMN_MAPPING = {
         # 날짜 관련
@@ -74,6 +155,7 @@ class CloudCheckerParser:
         """
         self.encoding = encoding
         self.skip_footer_lines = skip_footer_lines
+        self.allocation = default_allocation()  # 환경값 → 테넌트 정규화 규칙
     
     def parse_csv(self, file_path: str) -> pd.DataFrame:
         """
@@ -86,46 +168,37 @@ class CloudCheckerParser:
             pd.DataFrame: 파싱된 데이터프레임
         """
         try:
-            # CSV 파일을 텍스트로 먼저 읽어서 데이터 섹션만 추출
-            with open(file_path, 'r', encoding=self.encoding) as f:
-                lines = f.readlines()
-            
-            # Cost by Group 이전까지만 데이터로 사용
-            data_lines = []
-            header_found = False
-            
-            for i, line in enumerate(lines):
-                line_stripped = line.strip()
-                
-                # Cost by Group이 나오면 즉시 중단 (이후 데이터는 모두 무시)
-                if 'cost by group' in line_stripped.lower():
-                    print(f"[DEBUG] Cost by Group 발견 - {i+1}번째 줄에서 파싱 중단")
-                    break
-                
-                # 빈 줄은 건너뛰기 (데이터 사이에 빈 줄이 있을 수 있음)
-                if not line_stripped:
-                    continue
-                
-                # 헤더 또는 데이터 라인
-                data_lines.append(line)
-                if not header_found and 'Date' in line:
-                    header_found = True
-            
-            print(f"[DEBUG] 파싱된 데이터 라인 수: {len(data_lines)}")
+            with open(file_path, 'rb') as f:
+                return self.parse_csv_stream(f)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"CSV 파일 읽기 실패: {str(e)}")
+    
+    def parse_csv_stream(self, stream: BinaryIO) -> pd.DataFrame:
+        """
+        CSV 바이너리 스트림(업로드 스트림, 메모리 버퍼 등)을 읽어서 DataFrame으로 반환
+        
+        gzip(.csv.gz) / zip 압축은 자동으로 인식해서 압축을 풀면서 읽고,
+        데이터 섹션만 골라낸 줄을 pd.read_csv가 필요한 만큼씩 가져가므로 전체 내용을 한 번에 메모리에 올리지 않습니다.
+        
+        Args:
+            stream: CSV 바이너리 스트림 (읽은 뒤에도 닫지 않음)
             
-            # 임시 파일에 데이터 섹션만 저장
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8') as tmp:
-                tmp.writelines(data_lines)
-                tmp_path = tmp.name
+        Returns:
+            pd.DataFrame: 파싱된 데이터프레임
+        """
+        try:
+            with self._open_decompressed(stream) as binary:
+                text = io.TextIOWrapper(binary, encoding=self.encoding)
+                try:
+                    lines = _DataSectionLines(text, self.MAX_UNCOMPRESSED_SIZE)
+                    df = pd.read_csv(_LineReader(lines))
+                finally:
+                    # 호출한 쪽의 스트림은 닫지 않음
+                    text.detach()
             
-            try:
-                # 정리된 CSV 읽기
-                df = pd.read_csv(tmp_path, encoding='utf-8')
-            finally:
-                # 임시 파일 삭제
-                import os
-                os.unlink(tmp_path)
+            print(f"[DEBUG] 파싱된 데이터 라인 수: {lines.count}")
             
             # 컬럼명 정리 (공백 제거)
             df.columns = df.columns.str.strip()
@@ -147,6 +220,50 @@ class CloudCheckerParser:
         except Exception as e:
             raise ValueError(f"CSV 파일 읽기 실패: {str(e)}")
     
+    @contextmanager
+    def _open_decompressed(self, stream: BinaryIO):
+        """
+        압축 형식(앞부분 바이트)을 확인해서 압축을 풀면서 읽는 스트림 제공
+        
+        - gzip: 스트림 그대로 압축 해제
+        - zip: 안에 있는 CSV 파일 하나를 압축 해제
+        - 그 외: 원래 스트림
+        """
+        wrapper = None
+        if not hasattr(stream, 'peek'):
+            stream = wrapper = io.BufferedReader(stream)
+        magic = stream.peek(4)[:4]
+        
+        try:
+            with self._decompress(stream, magic) as decompressed:
+                yield decompressed
+        finally:
+            if wrapper is not None:
+                # 감싼 버퍼만 떼어내고 원래 스트림은 닫지 않음
+                wrapper.detach()
+    
+    @contextmanager
+    def _decompress(self, stream: BinaryIO, magic: bytes):
+        """형식별 압축 해제 스트림"""
+        if magic[:2] == GZIP_MAGIC:
+            with gzip.GzipFile(fileobj=stream, mode='rb') as decompressed:
+                yield decompressed
+        elif magic == ZIP_MAGIC:
+            with zipfile.ZipFile(stream) as archive:
+                members = [
+                    info for info in archive.infolist()
+                    if not info.is_dir()
+                    and info.filename.lower().endswith('.csv')
+                    and not info.filename.startswith('__MACOSX/')
+                ]
+                if len(members) != 1:
+                    raise ValueError(f"zip 파일에는 CSV 파일이 하나만 있어야 합니다 (발견: {len(members)}개)")
+                print(f"[DEBUG] zip 파일에서 읽기: {members[0].filename}")
+                with archive.open(members[0]) as decompressed:
+                    yield decompressed
+        else:
+            yield stream
+    
     def _remove_cost_by_group_rows(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Cost by Group 이후 모든 행 제거
@@ -362,10 +479,10 @@ class CloudCheckerParser:
             # environment가 없거나 빈 값이면 cielmobility
             tags['environment'] = 'cielmobility'
             tags['original_environment'] = ''
-        elif env_value in ['dev-smartmobility', 'prd-smartmobility']:
-            # dev-smartmobility, prd-smartmobility -> smartmobility
-            tags['environment'] = 'smartmobility'
+        else:
+            # 배분 규칙에 있는 환경값은 테넌트 이름으로 (예: dev-smartmobility, prd-smartmobility -> smartmobility)
             # original_environment는 원본 값 유지 (dev-smartmobility 또는 prd-smartmobility)
+            tags['environment'] = self.allocation.normalize_environment(env_value)
         
         # Environment에서 프로젝트명 추출 (예: prd-smartmobility -> smartmobility)
         if tags.get('environment'):
@@ -0,0 +1,132 @@
+"""
+Description에서 정산 기준 속성 추출 (요금 방식, OS, DB 엔진, 인스턴스 타입/패밀리/크기)
+예: "On Demand RHEL c6i.2xlarge Instance Hour" -> On Demand / RHEL / c6i.2xlarge / c6i / 2xlarge
+정규식은 고유 Description 값마다 한 번만 적용하고 코드로 펼쳐서 category 컬럼으로 저장
+"""
+import re
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+# 추출하는 속성 컬럼
+ATTRIBUTE_COLUMNS = [
+    'pricing_model', 'operating_system', 'database_engine',
+    'instance_type', 'instance_family', 'instance_size',
+]
+
+# 요금 방식 (명시되지 않은 인스턴스 사용 시간은 On Demand)
+PRICING_MODEL_PATTERNS = [
+    ('Savings Plan', re.compile(r'savings\s*plan', re.I)),
+    ('Reserved', re.compile(r'\breserved\b|\bRI\b|\bupfront\b', re.I)),
+    ('Spot', re.compile(r'\bspot\b', re.I)),
+    ('On Demand', re.compile(r'\bon[\s-]?demand\b|instance[\s-]hour', re.I)),
+]
+
+OPERATING_SYSTEM_PATTERNS = [
+    ('RHEL', re.compile(r'\bRHEL\b|red\s*hat', re.I)),
+    ('SUSE', re.compile(r'\bSUSE\b|\bSLES\b', re.I)),
+    ('Ubuntu', re.compile(r'\bubuntu\b', re.I)),
+    ('Windows', re.compile(r'\bwindows\b', re.I)),
+    ('Linux', re.compile(r'\blinux\b|\bunix\b', re.I)),
+]
+
+DATABASE_ENGINE_PATTERNS = [
+    ('SQL Server', re.compile(r'sql\s*server', re.I)),
+    ('Aurora PostgreSQL', re.compile(r'aurora\s*postgres', re.I)),
+    ('Aurora MySQL', re.compile(r'\baurora\b', re.I)),
+    ('PostgreSQL', re.compile(r'postgres', re.I)),
+    ('MariaDB', re.compile(r'mariadb', re.I)),
+    ('MySQL', re.compile(r'mysql', re.I)),
+    ('Oracle', re.compile(r'\boracle\b', re.I)),
+]
+
+# 인스턴스 타입 (db./cache. 접두사 포함 가능, 예: db.r6i.2xlarge, c6i.2xlarge, t3.micro)
+INSTANCE_TYPE_PATTERN = re.compile(
+    r'\b(?:(db|cache)\.)?([a-z][a-z0-9-]*\d[a-z0-9-]*)\.(nano|micro|small|medium|large|\d*xlarge|metal(?:-\d+xl)?)\b',
+    re.I,
+)
+
+
+def _first_match(patterns, text: str) -> Optional[str]:
+    for name, pattern in patterns:
+        if pattern.search(text):
+            return name
+    return None
+
+
+def parse_description(description: str) -> Dict[str, Optional[str]]:
+    """
+    Description 하나에서 속성 추출
+
+    Args:
+        description: Description 값
+
+    Returns:
+        dict: ATTRIBUTE_COLUMNS별 값 (찾지 못하면 None)
+    """
+    attributes = dict.fromkeys(ATTRIBUTE_COLUMNS)
+    if not description:
+        return attributes
+
+    match = INSTANCE_TYPE_PATTERN.search(description)
+    if match:
+        prefix, family, size = match.group(1), match.group(2).lower(), match.group(3).lower()
+        attributes['instance_family'] = family
+        attributes['instance_size'] = size
+        attributes['instance_type'] = f"{prefix.lower()}.{family}.{size}" if prefix else f"{family}.{size}"
+
+    attributes['pricing_model'] = _first_match(PRICING_MODEL_PATTERNS, description)
+    attributes['operating_system'] = _first_match(OPERATING_SYSTEM_PATTERNS, description)
+    attributes['database_engine'] = _first_match(DATABASE_ENGINE_PATTERNS, description)
+    return attributes
+
+
+def extract_description_attributes(descriptions: pd.Series) -> pd.DataFrame:
+    """
+    Description 컬럼에서 속성 컬럼 추출 (고유값마다 한 번만 파싱)
+
+    Args:
+        descriptions: Description 컬럼
+
+    Returns:
+        pd.DataFrame: ATTRIBUTE_COLUMNS (category 타입, descriptions와 같은 index)
+    """
+    codes, uniques = pd.factorize(descriptions, use_na_sentinel=True)
+    parsed = pd.DataFrame([parse_description(str(value)) for value in uniques], columns=ATTRIBUTE_COLUMNS)
+
+    columns = {}
+    for column in ATTRIBUTE_COLUMNS:
+        # 고유값별 결과를 category 코드로 바꾼 뒤 행 코드로 펼침 (빈 Description은 -1 → 빈 값)
+        value_codes, categories = pd.factorize(parsed[column], use_na_sentinel=True)
+        row_codes = value_codes[codes] if len(value_codes) else codes
+        row_codes = row_codes.copy()
+        row_codes[codes < 0] = -1
+        columns[column] = pd.Categorical.from_codes(row_codes, categories=pd.Index(categories, dtype=object))
+
+    return pd.DataFrame(columns, index=descriptions.index)
+
+
+def with_description_attributes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    속성 컬럼 추가 (이미 있으면 category 타입으로만 맞춤 - 여러 파일을 합친 경우)
+
+    Args:
+        df: 표준 데이터 DataFrame (description 컬럼)
+
+    Returns:
+        pd.DataFrame: 속성 컬럼이 있는 DataFrame
+    """
+    if 'description' not in df.columns:
+        return df
+
+    if all(column in df.columns for column in ATTRIBUTE_COLUMNS):
+        retyped = {
+            column: df[column].astype('category')
+            for column in ATTRIBUTE_COLUMNS
+            if not isinstance(df[column].dtype, pd.CategoricalDtype)
+        }
+        return df.assign(**retyped) if retyped else df
+
+    attributes = extract_description_attributes(df['description'])
+    return df.assign(**{column: attributes[column] for column in ATTRIBUTE_COLUMNS})
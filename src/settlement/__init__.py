@@ -0,0 +1,7 @@
+"""
+__init__.py for settlement package
+"""
+from src.settlement.msp import calculate_msp_costs
+from src.settlement.allocation import AllocationEngine, default_allocation
+
+__all__ = ['calculate_msp_costs', 'AllocationEngine', 'default_allocation']
@@ -0,0 +1,237 @@
+"""
+비용 라인 → 회사(테넌트) 배분 규칙
+환경/서비스 규칙을 비용 테이블 전체에 대한 마스크로 만들어 한 번에 라인별 테넌트를 정하고,
+테넌트별 사용료 / Custom Charge / MSP 분담액을 한 번의 groupby로 집계
+"""
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.settlement.msp import custom_charge_mask
+
+
+# 규칙에 맞지 않는 라인의 테넌트 (청구서 전체를 받는 회사)
+DEFAULT_TENANT = 'cielmobility'
+
+# 규칙 파일 경로 환경 변수 (JSON)
+TENANT_RULES_ENV = 'TENANT_RULES'
+
+
+@dataclass(frozen=True)
+class TenantRule:
+    """
+    테넌트 하나의 배분 규칙 (조건은 대소문자 구분 없음)
+
+    - environments: 이 값이면 파싱할 때 environment를 테넌트 이름으로 정규화 (예: prd-smartmobility)
+    - environment_contains: environment에 포함되면 이 테넌트 (정규화한 테넌트 이름은 항상 포함)
+    - services: 비어 있지 않으면 서비스명에 이 중 하나가 포함된 라인만 해당
+    """
+
+    tenant: str
+    environments: Tuple[str, ...] = ()
+    environment_contains: Tuple[str, ...] = ()
+    services: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TenantRule':
+        if not data.get('tenant'):
+            raise ValueError(f"테넌트 이름이 없는 규칙입니다: {data}")
+        return cls(
+            tenant=str(data['tenant']),
+            environments=tuple(data.get('environments', ())),
+            environment_contains=tuple(data.get('environment_contains', ())),
+            services=tuple(data.get('services', ())),
+        )
+
+
+# 기본 규칙: dev-/prd-smartmobility 환경은 세기모빌리티, 나머지는 씨엘모빌리티
+DEFAULT_TENANT_RULES = (
+    TenantRule(
+        tenant='smartmobility',
+        environments=('dev-smartmobility', 'prd-smartmobility'),
+        environment_contains=('smartmobility',),
+    ),
+)
+
+
+def _contains_pattern(values: Tuple[str, ...]) -> Optional[str]:
+    """포함 조건 목록 → 정규식 (없으면 None)"""
+    values = [value.lower() for value in values if value]
+    return '|'.join(re.escape(value) for value in values) if values else None
+
+
+@dataclass
+class AllocationEngine:
+    """
+    테넌트 배분 엔진
+
+    규칙은 위에서부터 먼저 맞는 규칙의 테넌트로 배분하고, 어느 규칙에도 맞지 않으면 default_tenant입니다.
+    조건은 고유 환경값/서비스명에 대해서만 계산한 뒤 코드로 펼쳐서 라인 수와 관계없이 문자열 비교 횟수가 적습니다.
+    """
+
+    rules: Tuple[TenantRule, ...] = DEFAULT_TENANT_RULES
+    default_tenant: str = DEFAULT_TENANT
+    _environment_map: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.rules = tuple(self.rules)
+        self._environment_map = {
+            environment.lower(): rule.tenant
+            for rule in reversed(self.rules)  # 앞 규칙 우선
+            for environment in rule.environments
+        }
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'AllocationEngine':
+        """
+        설정 dict로 생성
+
+        {"default_tenant": "cielmobility",
+         "tenants": [{"tenant": "smartmobility", "environments": ["prd-smartmobility"], ...}, ...]}
+        """
+        return cls(
+            rules=tuple(TenantRule.from_dict(rule) for rule in config.get('tenants', ())),
+            default_tenant=config.get('default_tenant', DEFAULT_TENANT),
+        )
+
+    @property
+    def tenants(self) -> List[str]:
+        """전체 테넌트 이름 (기본 테넌트 먼저)"""
+        names = [self.default_tenant]
+        for rule in self.rules:
+            if rule.tenant not in names:
+                names.append(rule.tenant)
+        return names
+
+    @property
+    def fingerprint(self) -> str:
+        """규칙 해시 (규칙이 바뀌면 파싱 결과 캐시도 새로 만듦)"""
+        config = {
+            'default_tenant': self.default_tenant,
+            'tenants': [rule.__dict__ for rule in self.rules],
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True, default=list).encode()).hexdigest()[:16]
+
+    def normalize_environment(self, environment: Optional[str]) -> Optional[str]:
+        """원본 환경값 → 정규화한 environment (규칙의 environments에 있으면 테넌트 이름)"""
+        if not environment:
+            return environment
+        return self._environment_map.get(str(environment).strip().lower(), environment)
+
+    def assign(self, df: pd.DataFrame) -> pd.Series:
+        """
+        라인별 테넌트
+
+        Args:
+            df: 표준 데이터 DataFrame (environment, service_name 컬럼)
+
+        Returns:
+            pd.Series: 테넌트 이름 (df와 같은 index)
+        """
+        env_codes, env_values = pd.factorize(df['environment'].fillna('').astype(str).str.lower())
+        service_codes, service_values = pd.factorize(df['service_name'].fillna('').astype(str).str.lower())
+        env_values = pd.Series(env_values, dtype=object)
+        service_values = pd.Series(service_values, dtype=object)
+
+        masks = []
+        for rule in self.rules:
+            # 고유값 기준 조건 → 라인 마스크
+            env_match = env_values.isin([rule.tenant.lower()] + [e.lower() for e in rule.environments])
+            pattern = _contains_pattern(rule.environment_contains)
+            if pattern:
+                env_match |= env_values.str.contains(pattern, regex=True)
+            mask = env_match.to_numpy()[env_codes]
+
+            pattern = _contains_pattern(rule.services)
+            if pattern:
+                mask &= service_values.str.contains(pattern, regex=True).to_numpy()[service_codes]
+            masks.append(mask)
+
+        if not masks:
+            return pd.Series(self.default_tenant, index=df.index, dtype=object)
+        tenants = np.select(masks, [rule.tenant for rule in self.rules], default=self.default_tenant)
+        return pd.Series(tenants, index=df.index, dtype=object)
+
+    def tenant_costs(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        테넌트별 비용 (Custom Charge 구분) - 한 번의 groupby
+
+        Args:
+            df: 표준 데이터 DataFrame (environment, service_name, cost 컬럼,
+                이미 묶인 집계 결과면 records 컬럼을 라인 수로 사용)
+
+        Returns:
+            pd.DataFrame: index=테넌트 (전체 테넌트 포함), 컬럼 custom_charge_usd, non_custom_charge_usd, total_usd, records
+        """
+        frame = pd.DataFrame({
+            'tenant': self.assign(df).to_numpy(),
+            'custom': custom_charge_mask(df).to_numpy(),
+            'cost': df['cost'].astype(float).fillna(0.0).to_numpy(),
+            'records': df['records'].to_numpy() if 'records' in df.columns else 1,
+        })
+        grouped = frame.groupby(['tenant', 'custom'])[['cost', 'records']].sum()
+
+        tenants = self.tenants + sorted(set(frame['tenant']) - set(self.tenants))
+        costs = grouped['cost'].unstack('custom').reindex(index=tenants, columns=[True, False]).fillna(0.0)
+        records = grouped['records'].unstack('custom').reindex(index=tenants, columns=[True, False]).fillna(0)
+
+        result = pd.DataFrame({
+            'custom_charge_usd': costs[True].astype(float),
+            'non_custom_charge_usd': costs[False].astype(float),
+        }, index=tenants)
+        result['total_usd'] = result['custom_charge_usd'] + result['non_custom_charge_usd']
+        result['records'] = records.sum(axis=1).astype(int)
+        return result
+
+    def allocate(self, df: pd.DataFrame, msp_invoice_amount: float = 0.0) -> List[dict]:
+        """
+        테넌트별 합계와 MSP 분담액 (사용료 비율로 M2를 나눔)
+
+        Args:
+            df: 표준 데이터 DataFrame
+            msp_invoice_amount: 세금계산서 발행 MSP 금액 (M2)
+
+        Returns:
+            List[dict]: tenant, usage_usd, custom_charge_usd, total_usd, records, usage_share, msp_share_usd
+        """
+        costs = self.tenant_costs(df)
+        usage_total = costs['non_custom_charge_usd'].sum()
+        shares = costs['non_custom_charge_usd'] / usage_total if usage_total else costs['non_custom_charge_usd'] * 0.0
+
+        return [
+            {
+                'tenant': tenant,
+                'usage_usd': round(float(row['non_custom_charge_usd']), 2),
+                'custom_charge_usd': round(float(row['custom_charge_usd']), 2),
+                'total_usd': round(float(row['total_usd']), 2),
+                'records': int(row['records']),
+                'usage_share': round(float(shares[tenant]), 6),
+                'msp_share_usd': round(float(shares[tenant]) * msp_invoice_amount, 2),
+            }
+            for tenant, row in costs.iterrows()
+        ]
+
+
+_default_engine: Optional[AllocationEngine] = None
+
+
+def default_allocation() -> AllocationEngine:
+    """
+    기본 배분 엔진 (TENANT_RULES 환경 변수에 JSON 규칙 파일 경로가 있으면 그 규칙, 없으면 기본 규칙)
+    """
+    global _default_engine
+    if _default_engine is None:
+        path = os.environ.get(TENANT_RULES_ENV)
+        if path:
+            with open(path, encoding='utf-8') as f:
+                _default_engine = AllocationEngine.from_config(json.load(f))
+            print(f"[DEBUG] 테넌트 배분 규칙: {path} ({', '.join(_default_engine.tenants)})")
+        else:
+            _default_engine = AllocationEngine()
+    return _default_engine
@@ -0,0 +1,107 @@
+"""
+MSP 비용 계산
+"""
+import pandas as pd
+
+from src.converters.line_items import LINE_ITEM_CUSTOM_CHARGE, line_item_mask
+
+
+def calculate_msp_costs(non_custom_charge_usd, custom_charge_usd=0.0):
+    """
+    MSP 비용 계산
+
+    우선순위 1 - CSV에 실제 Custom Charge가 $2,000 이상인 경우:
+      - M2 = CSV Custom Charge 값 그대로
+      - M1 = $1,000 (고정, segimobility 청구)
+      - cielmobility Custom Charge = M2 - M1
+
+    우선순위 2 - CSV Custom Charge가 없거나 $2,000 미만인 경우 (AWS 사용료 기준 계산):
+      - $20,000 미만: M2 = $2,000 (고정), M1 = $1,000 (고정)
+      - $20,000 이상: M2 = 사용료 * 20%, M1 = 사용료 * 5%
+    """
+    THRESHOLD = 20000.0
+    M2_RATE = 0.20
+    M2_FIXED = 2000.0
+    M1_FIXED = 1000.0
+    M1_RATE = 0.05
+    CSV_CUSTOM_CHARGE_THRESHOLD = 2000.0
+
+    if custom_charge_usd >= CSV_CUSTOM_CHARGE_THRESHOLD:
+        # CSV에 실제 Custom Charge가 있는 경우: 그 값을 그대로 M2로 사용
+        msp_invoice_amount = custom_charge_usd
+        msp_segi_amount = M1_FIXED
+    elif non_custom_charge_usd >= THRESHOLD:
+        msp_invoice_amount = non_custom_charge_usd * M2_RATE
+        msp_segi_amount = non_custom_charge_usd * M1_RATE
+    else:
+        msp_invoice_amount = M2_FIXED
+        msp_segi_amount = M1_FIXED
+
+    # 씨엘모빌리티 사용 MSP = M2 - M1
+    msp_ciel_usage = msp_invoice_amount - msp_segi_amount
+
+    return {
+        'threshold': THRESHOLD,
+        'is_over_threshold': non_custom_charge_usd >= THRESHOLD,
+        'has_csv_custom_charge': custom_charge_usd >= CSV_CUSTOM_CHARGE_THRESHOLD,
+        'msp_invoice_amount': round(msp_invoice_amount, 2),  # M2: 세금계산서 발행 MSP
+        'msp_segi_amount': round(msp_segi_amount, 2),  # M1: 세기모빌리티 MSP
+        'msp_ciel_usage': round(msp_ciel_usage, 2)  # 씨엘모빌리티 사용 MSP
+    }
+
+
+def custom_charge_mask(df: pd.DataFrame) -> pd.Series:
+    """Custom Charge 레코드 여부 (line_item_class 코드 비교 - 컬럼이 없으면 서비스명으로 분류)"""
+    return line_item_mask(df, LINE_ITEM_CUSTOM_CHARGE)
+
+
+def split_environment_costs(df: pd.DataFrame, allocation=None) -> dict:
+    """
+    환경별 / Custom Charge 구분 비용 합계
+
+    배분 규칙(allocation)으로 라인별 테넌트를 정한 뒤, 기본 테넌트(cielmobility)가 아닌 비용은 자회사 비용
+    (기본 규칙에서는 smartmobility)이며, 기본 테넌트 비용은 Custom Charge와 그 외 사용료로 나눕니다.
+
+    Args:
+        df: 표준 데이터 DataFrame (environment, service_name, cost 컬럼 필요)
+        allocation: 테넌트 배분 엔진 (None이면 기본 규칙)
+
+    Returns:
+        dict: cielmobility_usd, smartmobility_usd, custom_charge_usd, non_custom_charge_usd, has_smartmobility,
+              tenants (테넌트별 합계)
+    """
+    from src.settlement.allocation import default_allocation
+
+    allocation = allocation or default_allocation()
+    costs = allocation.tenant_costs(df)
+    payer = costs.loc[allocation.default_tenant]
+    others = costs.drop(index=allocation.default_tenant)
+
+    return {
+        'cielmobility_usd': float(payer['total_usd']),
+        'smartmobility_usd': float(others['total_usd'].sum()),
+        'custom_charge_usd': float(payer['custom_charge_usd']),
+        'non_custom_charge_usd': float(payer['non_custom_charge_usd']),
+        'has_smartmobility': bool((others['records'] > 0).any()),
+        'tenants': {tenant: float(total) for tenant, total in costs['total_usd'].items()},
+    }
+
+
+def summarize_msp(df: pd.DataFrame) -> dict:
+    """
+    DataFrame에서 cielmobility 환경의 Custom Charge / 사용료를 집계하여 MSP 비용 계산
+
+    Args:
+        df: 표준 데이터 DataFrame (environment, service_name, cost 컬럼 필요)
+
+    Returns:
+        dict: calculate_msp_costs 결과 + custom_charge_usd, non_custom_charge_usd
+    """
+    costs = split_environment_costs(df)
+    custom_charge_usd = costs['custom_charge_usd']
+    non_custom_charge_usd = costs['non_custom_charge_usd']
+
+    msp_info = calculate_msp_costs(non_custom_charge_usd, custom_charge_usd)
+    msp_info['custom_charge_usd'] = round(custom_charge_usd, 2)
+    msp_info['non_custom_charge_usd'] = round(non_custom_charge_usd, 2)
+    return msp_info
@@ -0,0 +1,144 @@
+"""
+정산 워크북 생성
+상세 데이터 + 환경별/서비스별/일별 환경별/MSP 집계 시트를 하나의 Excel 파일로 작성
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Union
+
+import pandas as pd
+
+from src.converters.excel_writer import write_excel
+from src.settlement.msp import custom_charge_mask, summarize_msp
+
+
+DEFAULT_ENVIRONMENT = 'cielmobility'
+
+# 시트 이름 (작성 순서)
+DETAIL_SHEET = '비용데이터'
+ENVIRONMENT_SHEET = '환경별'
+SERVICE_SHEET = '서비스별'
+DAILY_SHEET = '일별_환경별'
+MSP_SHEET = 'MSP'
+
+
+def _with_default_environment(df: pd.DataFrame) -> pd.DataFrame:
+    """environment가 비어있으면 cielmobility로 채운 복사본"""
+    env = df['environment'].astype(object).where(df['environment'].notna(), '')
+    env = env.astype(str).str.strip().replace('', DEFAULT_ENVIRONMENT)
+    return df.assign(environment=env)
+
+
+def _cost_columns(df: pd.DataFrame) -> list:
+    """집계 대상 금액 컬럼 (환율 적용 시 cost_krw 포함)"""
+    return ['cost', 'cost_krw'] if 'cost_krw' in df.columns else ['cost']
+
+
+def _grouped_costs(df: pd.DataFrame, key: str, label: str) -> pd.DataFrame:
+    """key 컬럼 기준 비용 합계 + 레코드 수 (비용 내림차순)"""
+    value_columns = _cost_columns(df)
+    grouped = df.groupby(key, dropna=False)[value_columns].sum()
+    grouped['records'] = df.groupby(key, dropna=False).size()
+    grouped = grouped.sort_values('cost', ascending=False).reset_index()
+    return grouped.rename(columns={
+        key: label,
+        'cost': '비용(USD)',
+        'cost_krw': '비용(KRW)',
+        'records': '레코드 수',
+    })
+
+
+def build_environment_sheet(df: pd.DataFrame) -> pd.DataFrame:
+    """환경별 집계"""
+    return _grouped_costs(_with_default_environment(df), 'environment', '환경')
+
+
+def build_service_sheet(df: pd.DataFrame) -> pd.DataFrame:
+    """서비스별 집계"""
+    return _grouped_costs(df, 'service_name', '서비스')
+
+
+def build_daily_sheet(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    일별 환경별 비용 (USD, Custom Charge 제외 - 대시보드 일별 차트와 동일 기준)
+    """
+    df = _with_default_environment(df)
+    df = df[~custom_charge_mask(df)]
+
+    daily = df.assign(day=df['date'].astype(str).str[:10]).pivot_table(
+        index='day',
+        columns='environment',
+        values='cost',
+        aggfunc='sum',
+        fill_value=0.0,
+    )
+    daily.columns = [str(col) for col in daily.columns]
+    daily['합계'] = daily.sum(axis=1)
+    return daily.reset_index().rename(columns={'day': '날짜'})
+
+
+def build_msp_sheet(df: pd.DataFrame) -> pd.DataFrame:
+    """MSP 비용 내역 (calculate_msp_costs 결과)"""
+    msp_info = summarize_msp(df)
+
+    rows = [
+        ('Custom Charge (cielmobility)', msp_info['custom_charge_usd']),
+        ('사용료 (cielmobility, Custom Charge 제외)', msp_info['non_custom_charge_usd']),
+        ('기준 금액', msp_info['threshold']),
+        ('M2: 세금계산서 발행 MSP', msp_info['msp_invoice_amount']),
+        ('M1: 세기모빌리티 MSP', msp_info['msp_segi_amount']),
+        ('씨엘모빌리티 사용 MSP (M2 - M1)', msp_info['msp_ciel_usage']),
+    ]
+    sheet = pd.DataFrame(rows, columns=['항목', '금액(USD)'])
+
+    # 환율이 적용된 경우 KRW 금액도 표시
+    if 'exchange_rate' in df.columns and df['exchange_rate'].notna().any():
+        rate = float(df['exchange_rate'].dropna().iloc[0])
+        sheet['금액(KRW)'] = sheet['금액(USD)'] * rate
+
+    return sheet
+
+
+# 집계 시트 생성 함수 (서로 독립적이므로 병렬로 계산)
+SUMMARY_SHEET_BUILDERS: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    ENVIRONMENT_SHEET: build_environment_sheet,
+    SERVICE_SHEET: build_service_sheet,
+    DAILY_SHEET: build_daily_sheet,
+    MSP_SHEET: build_msp_sheet,
+}
+
+
+def build_settlement_sheets(df: pd.DataFrame, max_workers: int = 4) -> Dict[str, pd.DataFrame]:
+    """
+    정산 워크북 시트 생성 (집계 시트는 스레드 풀에서 동시에 계산)
+
+    Args:
+        df: 표준 데이터 DataFrame
+        max_workers: 동시에 계산할 시트 수
+
+    Returns:
+        Dict[str, pd.DataFrame]: {시트 이름: 데이터} (상세 시트가 첫 번째)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            name: executor.submit(builder, df)
+            for name, builder in SUMMARY_SHEET_BUILDERS.items()
+        }
+        summaries = {name: future.result() for name, future in futures.items()}
+
+    return {DETAIL_SHEET: df, **summaries}
+
+
+def write_settlement_workbook(
+    df: pd.DataFrame,
+    output: Union[str, BinaryIO],
+    max_workers: int = 4
+):
+    """
+    정산 워크북을 Excel 파일로 저장
+
+    Args:
+        df: 표준 데이터 DataFrame
+        output: 파일 경로 또는 바이너리 버퍼
+        max_workers: 집계 시트 동시 계산 수
+    """
+    write_excel(build_settlement_sheets(df, max_workers=max_workers), output)
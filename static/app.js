@@ -226,6 +226,188 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 });
 
+// 업로드 요청 후 백그라운드 작업이 끝날 때까지 상태 확인 (작업 결과 = 업로드 결과)
+const JOB_POLL_INTERVAL = 500;
+
+// 전체 크기가 이보다 크면 분할 업로드 사용 (서버 요청 한도 16MB)
+const CHUNKED_UPLOAD_THRESHOLD = 15 * 1024 * 1024;
+const CHUNK_MAX_RETRIES = 5;
+
+async function uploadAndWait(formData) {
+    const response = await fetch('/api/upload', {
+        method: 'POST',
+        body: formData
+    });
+    return waitForJob(await response.json());
+}
+
+async function waitForJob(accepted) {
+    if (!accepted.success || !accepted.job_id) {
+        return accepted;
+    }
+    
+    const progressText = document.getElementById('progressText');
+    
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+        
+        const job = await (await fetch(`/api/jobs/${accepted.job_id}`)).json();
+        
+        if (!job.success) {
+            return job;
+        }
+        if (job.status === 'done') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            return { success: false, error: job.error };
+        }
+        
+        // 진행 단계 표시
+        if (job.message) {
+            progressText.textContent = `${job.message} (${job.progress}%)`;
+        }
+    }
+}
+
+// 파일 업로드 (큰 파일은 분할 업로드, 아니면 한 번에)
+async function uploadFilesAndWait(files, type) {
+    let totalSize = 0;
+    for (let i = 0; i < files.length; i++) {
+        totalSize += files[i].size;
+    }
+    
+    // 월중 갱신: 바뀐 날짜만 교체 (체크하지 않으면 기존 데이터 교체)
+    const incrementalCheckbox = document.getElementById('incrementalUpload');
+    const mode = incrementalCheckbox && incrementalCheckbox.checked ? 'incremental' : 'replace';
+    
+    if (totalSize > CHUNKED_UPLOAD_THRESHOLD) {
+        return chunkedUploadAndWait(files, type, mode);
+    }
+    
+    const formData = new FormData();
+    for (let i = 0; i < files.length; i++) {
+        formData.append('files', files[i]);
+    }
+    if (type) {
+        formData.append('data_type', type);
+    }
+    formData.append('mode', mode);
+    return uploadAndWait(formData);
+}
+
+async function sha256Hex(blob) {
+    // HTTPS(또는 localhost)가 아니면 crypto.subtle이 없으므로 체크섬 생략
+    if (!window.crypto || !window.crypto.subtle) {
+        return null;
+    }
+    const digest = await window.crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// 분할 업로드: 시작 → 분할 전송 (실패하면 서버가 받은 위치부터 다시) → 완료 후 변환 작업 대기
+async function chunkedUploadAndWait(files, type, mode) {
+    const progressText = document.getElementById('progressText');
+    const uploadIds = [];
+    
+    for (let i = 0; i < files.length; i++) {
+        const file = files[i];
+        const created = await (await fetch('/api/uploads', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ filename: file.name, size: file.size })
+        })).json();
+        
+        if (!created.success) {
+            return created;
+        }
+        
+        let offset = 0;
+        let retries = 0;
+        
+        while (offset < file.size) {
+            const chunk = file.slice(offset, offset + created.chunk_size);
+            const headers = { 'Content-Type': 'application/octet-stream' };
+            const checksum = await sha256Hex(chunk);
+            if (checksum) {
+                headers['X-Chunk-Sha256'] = checksum;
+            }
+            
+            try {
+                const response = await fetch(`/api/uploads/${created.upload_id}?offset=${offset}`, {
+                    method: 'PUT',
+                    headers: headers,
+                    body: chunk
+                });
+                const result = await response.json();
+                
+                if (response.ok) {
+                    offset = result.received;
+                    retries = 0;
+                } else if (response.status === 409) {
+                    offset = result.received;
+                } else if (++retries > CHUNK_MAX_RETRIES) {
+                    return result;
+                }
+            } catch (error) {
+                // 연결이 끊긴 경우 서버가 받은 위치를 확인하고 이어서 전송
+                if (++retries > CHUNK_MAX_RETRIES) {
+                    throw error;
+                }
+                await new Promise(resolve => setTimeout(resolve, 1000 * retries));
+                const status = await (await fetch(`/api/uploads/${created.upload_id}`)).json();
+                if (!status.success) {
+                    return status;
+                }
+                offset = status.received;
+            }
+            
+            const percent = Math.round(100 * offset / file.size);
+            progressText.textContent = `${file.name} 전송 중 (${percent}%)`;
+        }
+        
+        uploadIds.push(created.upload_id);
+    }
+    
+    const response = await fetch('/api/uploads/finalize', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ upload_ids: uploadIds, data_type: type || 'ciel', mode: mode || 'replace' })
+    });
+    return waitForJob(await response.json());
+}
+
+// 이전 작업 복원 (페이지를 다시 열거나 서버가 재시작된 뒤에도 다시 업로드하지 않도록)
+async function restoreDataset() {
+    try {
+        const state = await (await fetch('/api/dataset')).json();
+        if (!state.success || !state.has_data) return;
+        
+        if (state.ciel) {
+            cielData = state.ciel;
+            showSuccess('uploadStatusCiel', `✅ ${state.ciel.summary.total_records}개 레코드 로드됨 (이전 작업 복원)`);
+        }
+        if (state.segi) {
+            segiData = state.segi;
+            showSuccess('uploadStatusSegi', `✅ ${state.segi.summary.total_records}개 레코드 로드됨 (이전 작업 복원)`);
+        }
+        if (!cielData || !segiData) return;
+        
+        displayCombinedSummary();
+        
+        // 환율까지 적용된 상태였으면 KRW 요약과 데이터 테이블도 복원
+        if (state.rate_summary) {
+            document.getElementById('exchangeRate').value = state.exchange_rate;
+            updateSummaryWithKRW(state.rate_summary);
+            loadData();
+        }
+    } catch (error) {
+        console.error('이전 작업 복원 실패:', error);
+    }
+}
+
+document.addEventListener('DOMContentLoaded', restoreDataset);
+
 // 타입별 파일 업로드 처리
 async function handleFileSelectForType(type) {
     const fileInputId = type === 'ciel' ? 'fileInputCiel' : 'fileInputSegi';
@@ -237,15 +419,6 @@ async function handleFileSelectForType(type) {
     
     if (!files || files.length === 0) return;
     
-    const formData = new FormData();
-    
-    // 여러 파일 추가
-    for (let i = 0; i < files.length; i++) {
-        formData.append('files', files[i]);
-    }
-    // 타입 정보 추가
-    formData.append('data_type', type);
-    
     // 프로그레스 바 표시
     const uploadDuration = Math.min(1 + files.length * 0.3, 2);
     const progressInterval = showProgressModal(
@@ -257,12 +430,7 @@ async function handleFileSelectForType(type) {
     showLoading(statusId, `${files.length}개 파일 업로드 중...`);
     
     try {
-        const response = await fetch('/api/upload', {
-            method: 'POST',
-            body: formData
-        });
-        
-        const result = await response.json();
+        const result = await uploadFilesAndWait(files, type);
         
         // 프로그레스 바 완료
         hideProgressModal(progressInterval);
@@ -585,13 +753,6 @@ async function handleFileSelect() {
     
     if (!files || files.length === 0) return;
     
-    const formData = new FormData();
-    
-    // 여러 파일 추가
-    for (let i = 0; i < files.length; i++) {
-        formData.append('files', files[i]);
-    }
-    
     // 프로그레스 바 표시 (파일 개수에 따라 1~2초)
     const uploadDuration = Math.min(1 + files.length * 0.3, 2);
     const progressInterval = showProgressModal(
@@ -603,12 +764,7 @@ async function handleFileSelect() {
     showLoading('uploadStatus', `${files.length}개 파일 업로드 중...`);
     
     try {
-        const response = await fetch('/api/upload', {
-            method: 'POST',
-            body: formData
-        });
-        
-        const result = await response.json();
+        const result = await uploadFilesAndWait(files);
         
         // 프로그레스 바 완료
         hideProgressModal(progressInterval);
@@ -0,0 +1,79 @@
+"""
+테넌트 배분 엔진 테스트
+"""
+import pandas as pd
+
+from src.dataset.merge import merge_company_frames
+from src.settlement.allocation import AllocationEngine
+from src.settlement.msp import split_environment_costs
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=['date', 'service_name', 'description', 'environment', 'original_environment', 'cost'])
+
+
+def test_allocation():
+    """기본 규칙(씨엘/세기) / N개 테넌트 규칙 / 테넌트별 MSP 분담"""
+
+    print("=" * 60)
+    print("테넌트 배분 엔진 테스트")
+    print("=" * 60)
+
+    df = _frame([
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', '', 10.0),
+        ('2025-12-01', 'Custom Charge', 'MSP', 'cielmobility', '', 2500.0),
+        ('2025-12-01', 'RDS', 'db.t3', 'smartmobility', 'prd-smartmobility', 5.0),
+        ('2025-12-01', 'S3', 'storage', 'prd-newco', 'prd-newco', 30.0),
+        ('2025-12-02', 'S3', 'storage', None, '', 0.5),
+    ])
+
+    # 1. 기본 규칙은 기존 씨엘/세기 구분과 같음
+    print("\n[1단계] 기본 규칙")
+    engine = AllocationEngine()
+    assert engine.normalize_environment('dev-smartmobility') == 'smartmobility'
+    assert engine.normalize_environment('prd-newco') == 'prd-newco'
+    assert list(engine.assign(df)) == ['cielmobility', 'cielmobility', 'smartmobility', 'cielmobility', 'cielmobility']
+    costs = split_environment_costs(df, engine)
+    assert costs['smartmobility_usd'] == 5.0 and costs['custom_charge_usd'] == 2500.0
+    assert costs['non_custom_charge_usd'] == 40.5
+    print(f"✓ {costs['tenants']}")
+
+    # 2. 설정으로 테넌트 추가 (환경값 정규화 + 서비스 조건)
+    print("\n[2단계] 테넌트 추가")
+    engine = AllocationEngine.from_config({
+        'default_tenant': 'cielmobility',
+        'tenants': [
+            {'tenant': 'smartmobility', 'environments': ['dev-smartmobility', 'prd-smartmobility']},
+            {'tenant': 'newco', 'environments': ['prd-newco'], 'environment_contains': ['newco'], 'services': ['s3']},
+            {'tenant': 'ops', 'environment_contains': ['ops']},
+        ]
+    })
+    assert engine.tenants == ['cielmobility', 'smartmobility', 'newco', 'ops']
+    assert engine.normalize_environment('PRD-NEWCO') == 'newco'
+    assert list(engine.assign(df)) == ['cielmobility', 'cielmobility', 'smartmobility', 'newco', 'cielmobility']
+    # 서비스 조건에 맞지 않으면 다음 규칙 / 기본 테넌트
+    assert engine.assign(_frame([('2025-12-01', 'EC2', 'x', 'prd-newco', 'prd-newco', 1.0)])).iloc[0] == 'cielmobility'
+    print(f"✓ {engine.tenants}")
+
+    # 3. 테넌트별 합계와 MSP 분담 (사용료 비율)
+    print("\n[3단계] MSP 분담")
+    shares = {row['tenant']: row for row in engine.allocate(df, msp_invoice_amount=2500.0)}
+    assert shares['newco']['usage_usd'] == 30.0 and shares['newco']['records'] == 1
+    assert shares['cielmobility']['custom_charge_usd'] == 2500.0
+    assert shares['ops']['records'] == 0 and shares['ops']['msp_share_usd'] == 0.0
+    assert round(sum(row['msp_share_usd'] for row in shares.values()), 2) == 2500.0
+    print(f"✓ newco MSP {shares['newco']['msp_share_usd']}")
+
+    # 4. 씨엘 데이터에서 자회사 테넌트 라인 제외
+    print("\n[4단계] 합치기")
+    merged = merge_company_frames(df.assign(environment=df['environment'].replace('prd-newco', 'newco')), df.iloc[:0], engine)
+    assert sorted(merged['environment'].fillna('')) == ['', 'cielmobility', 'cielmobility']
+    print(f"✓ {len(merged)}건")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_allocation()
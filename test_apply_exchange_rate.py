@@ -0,0 +1,47 @@
+"""
+작업 공간별 환율 적용 테스트
+"""
+from datetime import date
+
+import pandas as pd
+
+from src.converters.currency_converter_integration import CostDataConverterWithCurrency
+
+
+def test_apply_exchange_rate():
+    """요청한 환율로만 KRW 환산 (공유 환율 저장소와 무관)"""
+
+    print("=" * 60)
+    print("작업 공간별 환율 적용 테스트")
+    print("=" * 60)
+
+    df = pd.DataFrame({
+        'date': [date(2025, 12, 1), date(2025, 12, 31), date(2025, 12, 2), date(2025, 12, 3)],
+        'cost': [10.0, 2.5, 1000.0, 1.0],
+        'currency': ['USD', 'USD', 'KRW', None],
+    })
+
+    # 1. 작업 공간 두 곳이 다른 환율 설정 (날짜와 관계없이 각자의 환율)
+    print("\n[1단계] 환율별 KRW 환산")
+    first = CostDataConverterWithCurrency.apply_exchange_rate(df, 1400.0, date(2025, 12, 31))
+    second = CostDataConverterWithCurrency.apply_exchange_rate(df, 1350.0, date(2025, 12, 1))
+    assert list(first['cost_krw']) == [14000.0, 3500.0, 1000.0, 1400.0]
+    assert list(second['cost_krw']) == [13500.0, 3375.0, 1000.0, 1350.0]
+    assert list(first['exchange_rate']) == [1400.0, 1400.0, 1.0, 1400.0]
+    assert first['exchange_date'].iloc[0] == date(2025, 12, 31)
+    assert 'cost_krw' not in df.columns
+    print(f"✓ 1400: {first['cost_krw'].sum():,.0f} KRW / 1350: {second['cost_krw'].sum():,.0f} KRW")
+
+    # 2. 다른 통화는 환산하지 않음
+    print("\n[2단계] 다른 통화")
+    other = CostDataConverterWithCurrency.apply_exchange_rate(df.assign(currency='EUR'), 1400.0)
+    assert other['cost_krw'].isna().all()
+    print("✓ EUR 라인은 빈 값")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_apply_exchange_rate()
@@ -0,0 +1,163 @@
+"""
+분할(chunk) 업로드 저장소 테스트
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from src.jobs.upload_spool import ChunkedUploadStore, ChunkOffsetError, UploadFinalizingError
+
+
+def test_chunked_upload():
+    """분할 저장 / 재전송 / 이어 보내기 / 완료 표시 / 체크섬 / 남은 완료 표시 / 받는 중 읽기 테스트"""
+
+    print("=" * 60)
+    print("분할 업로드 테스트")
+    print("=" * 60)
+
+    content = b'date,service,cost\n' + b'2025-12-01,EC2,1.0\n' * 100
+    checksum = hashlib.sha256(content).hexdigest()
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        running_jobs = set()
+        store = ChunkedUploadStore(
+            root_dir=root_dir, chunk_size=500, max_size=10_000, job_active=lambda job_id: job_id in running_jobs
+        )
+
+        # 1. 업로드 시작
+        print("\n[1단계] 업로드 시작")
+        status = store.create('ws1', 'billing.csv', len(content), checksum)
+        upload_id = status['upload_id']
+        assert status['received'] == 0 and not status['complete']
+        print(f"✓ 업로드 ID: {upload_id}")
+
+        # 2. 분할 전송 - 같은 분할 재전송은 무시, 건너뛴 위치는 거부
+        print("\n[2단계] 분할 전송")
+        first = content[:500]
+        assert store.write_chunk(upload_id, 0, first, hashlib.sha256(first).hexdigest()) == 500
+        assert store.write_chunk(upload_id, 0, first) == 500
+        try:
+            store.write_chunk(upload_id, 1000, content[1000:1500])
+            assert False, '건너뛴 위치가 허용됨'
+        except ChunkOffsetError as e:
+            assert e.received == 500
+        try:
+            store.write_chunk(upload_id, 500, content[500:1000], checksum='0' * 64)
+            assert False, '체크섬 불일치가 허용됨'
+        except ValueError:
+            pass
+        print("✓ 재전송/위치 오류/체크섬 오류 처리")
+
+        # 3. 끊긴 위치부터 이어서 전송 후 완료
+        print("\n[3단계] 이어 보내기")
+        try:
+            store.claim(upload_id)
+            assert False, '다 받지 않았는데 완료됨'
+        except ValueError:
+            pass
+        offset = store.status(upload_id)['received']
+        while offset < len(content):
+            offset = store.write_chunk(upload_id, offset, content[offset:offset + 500])
+        path = store.claim(upload_id)
+        store.verify(upload_id)
+        with open(path, 'rb') as f:
+            assert f.read() == content
+        print(f"✓ 전체 {len(content)} bytes 수신, 체크섬 일치")
+
+        # 완료 표시는 한 번만 (동시에 완료 요청 → 두 번째는 거부), 이후 분할 전송도 거부
+        for attempt in (lambda: store.claim(upload_id), lambda: store.write_chunk(upload_id, 0, first)):
+            try:
+                attempt()
+                assert False, '변환 중인 업로드가 허용됨'
+            except UploadFinalizingError:
+                pass
+        assert store.status(upload_id)['finalizing']
+        print("✓ 두 번째 완료 요청 거부")
+
+        # 체크섬이 다르면 verify에서 오류 / release 후 다시 완료 가능
+        other = store.create('ws1', 'other.csv', 3, '0' * 64)['upload_id']
+        store.write_chunk(other, 0, b'abc')
+        store.claim(other)
+        try:
+            store.verify(other)
+            assert False, '체크섬 불일치가 허용됨'
+        except ValueError:
+            pass
+        store.release(other)
+        store.claim(other)
+        print("✓ 체크섬 불일치 / 완료 표시 취소")
+
+        # 변환 작업이 끝났는데 남은 표시 / 표시한 프로세스가 종료된 경우 다시 완료 가능 (한 요청만 성공)
+        running_jobs.add('job-1')
+        store.attach_job(other, 'job-1')
+        assert store.status(other)['finalizing']
+        running_jobs.clear()
+        assert not store.status(other)['finalizing']
+        store.claim(other)
+        try:
+            store.claim(other)
+            assert False, '다시 가져온 표시가 두 번 허용됨'
+        except UploadFinalizingError:
+            pass
+
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        with open(os.path.join(root_dir, other, 'finalizing'), 'w', encoding='utf-8') as f:
+            json.dump({'pid': exited.pid, 'job_id': None, 'claim_id': 'killed', 'claimed_at': 0}, f)
+        assert not store.status(other)['finalizing']
+        store.claim(other)
+        print("✓ 종료된 작업/프로세스의 완료 표시 다시 가져옴")
+
+        # 4. 삭제 후에는 찾을 수 없음
+        print("\n[4단계] 삭제")
+        store.discard(upload_id)
+        try:
+            store.status(upload_id)
+            assert False, '삭제된 업로드가 조회됨'
+        except KeyError:
+            pass
+        print("✓ 삭제 완료")
+
+        # 5. 받는 중인 파일을 분할이 도착하는 대로 읽기 (미리 변환은 한 번만, 완료 요청 전에 표시)
+        print("\n[5단계] 받는 중 읽기")
+        receiving = store.create('ws1', 'receiving.csv', len(content))['upload_id']
+        assert store.start_ingest(receiving) and not store.start_ingest(receiving)
+
+        def send():
+            offset = 0
+            while offset < len(content):
+                time.sleep(0.01)
+                offset = store.write_chunk(receiving, offset, content[offset:offset + 500])
+
+        sender = threading.Thread(target=send)
+        sender.start()
+        with store.open_received(receiving, idle_timeout=5) as stream:
+            assert stream.read() == content
+        sender.join()
+        store.finish_ingest(receiving)
+        store.wait_ingest(receiving, timeout=1)
+        print("✓ 전송과 함께 읽음")
+
+        # 새 분할이 오지 않으면 중단
+        stalled = store.create('ws1', 'stalled.csv', len(content))['upload_id']
+        store.write_chunk(stalled, 0, first)
+        with store.open_received(stalled, idle_timeout=0.3) as stream:
+            try:
+                stream.read()
+                assert False, '받지 않은 부분을 기다리지 않음'
+            except TimeoutError:
+                pass
+        print("✓ 전송 중단 시 읽기 중단")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_chunked_upload()
@@ -0,0 +1,92 @@
+"""
+DataFrame JSON 직렬화 테스트 (행/컬럼 형식)
+"""
+import io
+import json
+from datetime import date, datetime
+
+import pandas as pd
+
+from src.converters.columnar import project_columns, to_records, to_columnar, iter_ndjson, iter_csv
+
+
+def create_sample_dataframe():
+    """샘플 표준 데이터 DataFrame 생성"""
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2025-12-01', '2025-12-01', '2025-12-02', '2025-12-03']),
+        'service_name': ['EC2', 'EC2', 'RDS', 'EC2'],
+        'environment': ['smartmobility', '', None, 'smartmobility'],
+        'cost': [19.01, 2.5, float('nan'), 4.0],
+        'exchange_date': [date(2025, 12, 31)] * 4,
+        'resource_id': [None, 'i-1', 'i-2', 'i-3'],
+    })
+
+
+def test_columnar_serialization():
+    """행 단위/컬럼 단위 직렬화 테스트"""
+
+    print("=" * 60)
+    print("DataFrame JSON 직렬화 테스트")
+    print("=" * 60)
+
+    df = create_sample_dataframe()
+
+    # 1. 행 단위 형식 (기존 /api/data 응답과 동일한 값)
+    print("\n[1단계] 행 단위 형식")
+    records = to_records(df)
+    assert records[0]['date'] == str(datetime(2025, 12, 1))
+    assert records[0]['exchange_date'] == '2025-12-31'
+    assert records[1]['environment'] == 'cielmobility'
+    assert records[2]['environment'] == 'cielmobility'
+    assert records[2]['cost'] is None
+    assert records[0]['resource_id'] is None
+    print(f"✓ 첫 번째 레코드: {records[0]}")
+
+    # 2. 컬럼 선택
+    print("\n[2단계] 컬럼 선택")
+    projected = project_columns(df, ['service_name', 'cost'])
+    assert list(projected.columns) == ['service_name', 'cost']
+    try:
+        project_columns(df, ['unknown'])
+        assert False, "알 수 없는 컬럼은 오류가 나야 합니다"
+    except ValueError as e:
+        print(f"✓ 잘못된 컬럼 오류: {e}")
+
+    # 3. 컬럼 단위 형식 (저카디널리티 문자열은 사전 인코딩)
+    print("\n[3단계] 컬럼 단위 형식")
+    columnar = to_columnar(df)
+    assert columnar['length'] == 4
+    assert columnar['data']['service_name'] == {'dictionary': ['EC2', 'RDS'], 'codes': [0, 0, 1, 0]}
+    assert columnar['data']['environment']['dictionary'] == ['smartmobility', 'cielmobility']
+    assert columnar['data']['cost'][2] is None
+    assert columnar['data']['resource_id'] == [None, 'i-1', 'i-2', 'i-3']
+    print(f"✓ 컬럼: {columnar['columns']}")
+
+    # 4. 스트리밍 출력 (청크 단위)
+    print("\n[4단계] NDJSON/CSV 스트리밍")
+    ndjson_chunks = list(iter_ndjson(df, chunk_size=3))
+    assert len(ndjson_chunks) == 2
+    assert ''.join(ndjson_chunks).count('\n') == 4
+    csv_chunks = list(iter_csv(df[['service_name', 'cost']], chunk_size=3))
+    assert csv_chunks[0] == '\ufeffservice_name,cost\n'
+    assert len(''.join(csv_chunks).splitlines()) == 5
+    print(f"✓ NDJSON 조각 {len(ndjson_chunks)}개, CSV 조각 {len(csv_chunks)}개")
+
+    # 5. NDJSON과 CSV는 같은 행에 같은 값 (날짜 형식, 빈 environment 기본값, 빈 값)
+    print("\n[5단계] NDJSON/CSV 값 일치")
+    ndjson_rows = [json.loads(line) for line in ''.join(iter_ndjson(df, chunk_size=3)).splitlines()]
+    csv_text = ''.join(iter_csv(df, chunk_size=3)).lstrip('\ufeff')
+    csv_rows = pd.read_csv(io.StringIO(csv_text), dtype=str, keep_default_na=False).to_dict('records')
+    assert csv_rows == [
+        {column: '' if value is None else str(value) for column, value in row.items()} for row in ndjson_rows
+    ]
+    assert csv_rows[1]['environment'] == 'cielmobility' and csv_rows[0]['date'] == '2025-12-01 00:00:00'
+    print(f"✓ {len(csv_rows)}행 일치")
+
+    print("\n" + "=" * 60)
+    print("✓ 모든 테스트 완료!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_columnar_serialization()
@@ -0,0 +1,72 @@
+"""
+압축(gzip/zip) CSV 스트림 파싱 테스트
+"""
+import gzip
+import io
+import zipfile
+
+from src.converters.data_converter import DataConverter
+
+
+SAMPLE_CSV = (
+    '\ufeffDate,Service Name,Description,Cost,env\n'
+    '2025-12-01,EC2,t3.micro instance hour,1.50,prd-smartmobility\n'
+    '\n'
+    '2025-12-02,RDS,db.t3 instance hour,2.25,\n'
+    'Cost by Group,\n'
+    'Total,3.75\n'
+).encode('utf-8')
+
+
+def test_compressed_csv():
+    """plain / gzip / zip 스트림이 같은 결과로 변환되는지 테스트"""
+
+    print("=" * 60)
+    print("압축 CSV 파싱 테스트")
+    print("=" * 60)
+
+    converter = DataConverter()
+
+    # 1. 압축 안 된 스트림 - 빈 줄 / Cost by Group 이후 제외
+    print("\n[1단계] CSV 스트림")
+    stream = io.BytesIO(SAMPLE_CSV)
+    plain = converter.to_dataframe(converter.convert_csv_stream(stream))
+    assert len(plain) == 2
+    assert list(plain['service_name']) == ['EC2', 'RDS']
+    assert not stream.closed  # 호출한 쪽 스트림은 닫지 않음
+    print(f"✓ 레코드: {len(plain)}건")
+
+    # 2. gzip
+    print("\n[2단계] .csv.gz")
+    gz = converter.to_dataframe(converter.convert_csv_stream(io.BytesIO(gzip.compress(SAMPLE_CSV))))
+    assert gz.equals(plain)
+    print("✓ gzip 결과 동일")
+
+    # 3. zip (CSV 하나)
+    print("\n[3단계] .zip")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('billing/2025-12.csv', SAMPLE_CSV)
+    zipped = converter.to_dataframe(converter.convert_csv_stream(io.BytesIO(buffer.getvalue())))
+    assert zipped.equals(plain)
+    print("✓ zip 결과 동일")
+
+    # 4. CSV가 여러 개인 zip은 거부
+    print("\n[4단계] CSV 여러 개인 zip")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('a.csv', SAMPLE_CSV)
+        archive.writestr('b.csv', SAMPLE_CSV)
+    try:
+        converter.convert_csv_stream(io.BytesIO(buffer.getvalue()))
+        assert False, "ValueError가 발생해야 합니다"
+    except ValueError as e:
+        print(f"✓ 오류: {e}")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_compressed_csv()
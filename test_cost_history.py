@@ -0,0 +1,115 @@
+"""
+월별 비용 이력 저장소 테스트
+"""
+import sqlite3
+import tempfile
+
+import pandas as pd
+
+from src.dataset.cost_store import CostHistoryStore
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=['date', 'service_name', 'environment', 'cost']).assign(
+        date=lambda df: pd.to_datetime(df['date'])
+    )
+
+
+def test_cost_history():
+    """월별 저장 / 같은 날짜 교체 / 날짜 범위 조회 / 월별 합계 / 작업 공간 구분"""
+
+    print("=" * 60)
+    print("월별 비용 이력 저장소 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = CostHistoryStore(tmp_dir)
+
+        # 1. 월별로 나눠 저장
+        print("\n[1단계] 월별 저장")
+        months = store.save('ciel', _frame([
+            ('2025-11-30', 'EC2', 'cielmobility', 10.0),
+            ('2025-12-01', 'EC2', 'cielmobility', 1.0),
+            ('2025-12-02', 'RDS', 'smartmobility', 2.0),
+        ]))
+        assert months == ['2025-11', '2025-12']
+        assert [p['rows'] for p in store.partitions('ciel')] == [1, 2]
+        print(f"✓ 저장한 월: {months}")
+
+        # 2. 같은 달을 다시 저장하면 새 데이터에 있는 날짜만 교체
+        print("\n[2단계] 날짜 교체")
+        store.save('ciel', _frame([
+            ('2025-12-02', 'RDS', 'smartmobility', 3.0),
+            ('2025-12-03', 'S3', 'cielmobility', 0.5),
+        ]))
+        december = store.query('ciel', start_date='2025-12-01', end_date='2025-12-31')
+        assert len(december) == 3
+        assert december['cost'].sum() == 4.5
+        print(f"✓ 12월 {len(december)}건")
+
+        # 3. 날짜 범위 / 서비스 조건 조회
+        print("\n[3단계] 범위 조회")
+        result = store.query('ciel', start_date='2025-11-30', end_date='2025-12-02', services=['EC2'])
+        assert list(result['cost']) == [10.0, 1.0]
+        assert len(store.query('segi')) == 0
+        print(f"✓ {len(result)}건")
+
+        # 4. 월별 합계 (전월 대비, 연 누계)
+        print("\n[4단계] 월별 합계")
+        totals = store.monthly_totals('ciel', group_by='environment')
+        assert [t['total_cost'] for t in totals] == [10.0, 4.5]
+        assert totals[1]['change'] == -5.5 and totals[1]['ytd_cost'] == 14.5
+        assert totals[1]['environment'] == {'cielmobility': 1.5, 'smartmobility': 3.0}
+        print(f"✓ 전월 대비 {totals[1]['change_pct']}%")
+
+        # 범위를 좁혀도 범위 앞의 달까지 포함해서 전월 대비 / 연 누계 계산
+        ranged = store.monthly_totals('ciel', start_month='2025-12', group_by='environment')
+        assert [t['month'] for t in ranged] == ['2025-12']
+        assert ranged[0]['change'] == -5.5 and ranged[0]['ytd_cost'] == 14.5
+        assert ranged[0]['environment'] == totals[1]['environment']
+        assert [t['month'] for t in store.monthly_totals('ciel', end_month='2025-11')] == ['2025-11']
+        print("✓ 2025-12부터 조회해도 11월과 비교")
+
+        # 5. 작업 공간별 이력 (다른 작업 공간의 같은 달은 덮어쓰지 않음)
+        print("\n[5단계] 작업 공간 구분")
+        store.save('ciel', _frame([('2025-12-05', 'EC2', 'cielmobility', 100.0)]), workspace_id='team-a')
+        assert store.query('ciel', workspace_id='team-a')['cost'].sum() == 100.0
+        assert store.query('ciel', start_date='2025-12-01')['cost'].sum() == 4.5
+        assert [p['month'] for p in store.partitions(workspace_id='team-a')] == ['2025-12']
+        assert store.partitions(workspace_id='team-b') == []
+        print("✓ team-a 이력과 기본 이력이 따로 저장됨")
+
+        # 6. 전월 대비는 바로 앞 달과만 비교 (중간 달이 없으면 None)
+        print("\n[6단계] 빠진 달")
+        store.save('ciel', _frame([('2026-02-10', 'EC2', 'cielmobility', 7.0)]))
+        totals = store.monthly_totals('ciel')
+        assert [t['month'] for t in totals] == ['2025-11', '2025-12', '2026-02']
+        assert totals[2]['change'] is None and totals[2]['change_pct'] is None
+        assert totals[2]['ytd_cost'] == 7.0
+        print("✓ 2026-02: 2026-01이 없어 증감 없음")
+
+    # 7. 작업 공간 구분이 없던 목록 DB는 기본 이력으로 옮김
+    print("\n[7단계] 목록 DB 변환")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = sqlite3.connect(f'{tmp_dir}/partitions.db')
+        conn.execute("""
+            CREATE TABLE cost_partitions (
+                company TEXT NOT NULL, month TEXT NOT NULL, filename TEXT NOT NULL, rows INTEGER NOT NULL,
+                min_date TEXT NOT NULL, max_date TEXT NOT NULL, total_cost REAL NOT NULL,
+                updated_at TIMESTAMP NOT NULL, PRIMARY KEY (company, month)
+            )
+        """)
+        conn.execute("INSERT INTO cost_partitions VALUES ('ciel', '2025-10', 'x.parquet', 1, "
+                     "'2025-10-01', '2025-10-01', 1.0, '2025-10-02')")
+        conn.commit()
+        conn.close()
+        assert [p['month'] for p in CostHistoryStore(tmp_dir).partitions('ciel')] == ['2025-10']
+        print("✓ 기존 파티션 유지")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_cost_history()
@@ -0,0 +1,72 @@
+"""
+같은 기간 파일 두 버전 비교 테스트
+"""
+import pandas as pd
+
+from src.dataset.diff import diff_datasets
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=[
+        'date', 'service_name', 'description', 'environment', 'original_environment', 'cost'
+    ])
+
+
+def test_dataset_diff():
+    """같은 라인 제외 / 비용 변경 / 추가·삭제 / 증감 집계"""
+
+    print("=" * 60)
+    print("데이터셋 비교 테스트")
+    print("=" * 60)
+
+    old_df = _frame([
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'RDS', 'db.t3', 'smartmobility', 'prd-smartmobility', 5.0),
+        ('2025-12-02', 'S3', 'storage', 'cielmobility', None, 0.5),
+    ])
+    new_df = _frame([
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'RDS', 'db.t3', 'smartmobility', 'prd-smartmobility', 4.0),
+        ('2025-12-03', 'S3', 'storage', 'cielmobility', None, 0.7),
+    ])
+
+    # 1. 같은 키 + 같은 비용 라인은 개수만큼 짝지어 제외 (3번째 EC2는 추가)
+    print("\n[1단계] 건수")
+    diff = diff_datasets(old_df, new_df)
+    totals = diff.totals()
+    assert totals['unchanged'] == 2
+    assert (totals['added'], totals['removed'], totals['changed']) == (2, 1, 1)
+    assert totals['delta'] == 0.2
+    print(f"✓ {totals}")
+
+    # 2. 비용 변경 라인 (이전/새 비용)
+    print("\n[2단계] 비용 변경")
+    changed = diff.lines[diff.lines['change'] == 'changed'].iloc[0]
+    assert changed['service_name'] == 'RDS'
+    assert (changed['old_cost'], changed['new_cost'], changed['delta']) == (5.0, 4.0, -1.0)
+    removed = diff.lines[diff.lines['change'] == 'removed'].iloc[0]
+    assert removed['date'] == '2025-12-02' and removed['new_cost'] == 0.0
+    print("✓ RDS 5.0 -> 4.0")
+
+    # 3. 서비스별 증감 (절댓값 큰 순)
+    print("\n[3단계] 서비스별 증감")
+    by_service = diff.deltas_by('service_name')
+    assert [row['service_name'] for row in by_service] == ['EC2', 'RDS', 'S3']
+    assert by_service[0]['delta'] == 1.0 and by_service[2]['delta'] == 0.2
+    print(f"✓ {by_service}")
+
+    # 4. 한쪽이 비어 있으면 모두 추가
+    print("\n[4단계] 빈 데이터")
+    assert diff_datasets(old_df.iloc[:0], new_df).totals()['added'] == 5
+    print("✓ 모두 추가")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_dataset_diff()
@@ -0,0 +1,67 @@
+"""
+데이터셋 스냅샷 / 씨엘·세기 데이터 합치기 테스트
+"""
+import pandas as pd
+
+from src.dataset.merge import merge_company_frames
+from src.dataset.snapshot import DatasetSnapshot
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=[
+        'date', 'service_name', 'description', 'environment', 'original_environment', 'cost'
+    ])
+
+
+def test_dataset_merge():
+    """씨엘/세기 데이터 합치기 및 스냅샷 버전 테스트"""
+
+    print("=" * 60)
+    print("데이터셋 합치기 테스트")
+    print("=" * 60)
+
+    ciel_df = _frame([
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'EC2', 't3.micro', 'cielmobility', None, 1.0),
+        ('2025-12-01', 'RDS', 'db.t3', 'smartmobility', 'prd-smartmobility', 5.0),
+        ('2025-12-02', 'S3', 'storage', 'cielmobility', None, 0.5),
+    ])
+    segi_df = _frame([
+        ('2025-12-01', 'EC2', 't3.micro', 'smartmobility', 'dev-smartmobility', 1.004),
+        ('2025-12-01', 'EC2', 't3.micro', 'smartmobility', 'dev-smartmobility', 1.0),
+        ('2025-12-03', 'S3', 'storage', 'smartmobility', 'dev-smartmobility', 2.0),
+    ])
+
+    # 1. smartmobility 제외 + 세기와 같은 레코드를 개수만큼 제외
+    print("\n[1단계] 씨엘 데이터 필터링")
+    merged = merge_company_frames(ciel_df, segi_df)
+    ciel_rows = merged[merged['environment'] == 'cielmobility']
+    assert len(ciel_rows) == 2  # EC2 3건 중 세기와 같은 2건 제외 + S3 1건
+    assert list(ciel_rows['service_name']) == ['EC2', 'S3']
+    print(f"✓ 씨엘 레코드: {len(ciel_rows)}건")
+
+    # 2. 세기 데이터는 파일 내 중복만 제거
+    print("\n[2단계] 합친 결과")
+    assert len(merged) == 5
+    assert list(merged.index) == list(range(5))
+    assert '_source' not in merged.columns
+    print(f"✓ 합쳐진 레코드: {len(merged)}건")
+
+    # 3. 스냅샷은 바뀌지 않고 다음 버전을 새로 만듦
+    print("\n[3단계] 스냅샷 버전")
+    first = DatasetSnapshot().next_version(ciel_df=ciel_df, df=ciel_df)
+    second = first.next_version(segi_df=segi_df, df=merged)
+    assert first.version == 1 and second.version == 2
+    assert first.df is ciel_df and first.segi_df is None
+    assert second.ciel_df is ciel_df and second.has_data
+    assert len(second.frames()) == 3
+    print(f"✓ 버전: {first.version} -> {second.version}")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_dataset_merge()
@@ -0,0 +1,60 @@
+"""
+Description 속성 추출 테스트
+"""
+import pandas as pd
+
+from src.parsers.description_attributes import (
+    extract_description_attributes, parse_description, with_description_attributes
+)
+
+
+def test_description_attributes():
+    """요금 방식 / OS / DB 엔진 / 인스턴스 타입 추출 및 category 컬럼"""
+
+    print("=" * 60)
+    print("Description 속성 추출 테스트")
+    print("=" * 60)
+
+    # 1. Description 하나
+    print("\n[1단계] 속성 추출")
+    attributes = parse_description('On Demand RHEL c6i.2xlarge Instance Hour')
+    assert attributes['pricing_model'] == 'On Demand' and attributes['operating_system'] == 'RHEL'
+    assert (attributes['instance_type'], attributes['instance_family'], attributes['instance_size']) == (
+        'c6i.2xlarge', 'c6i', '2xlarge'
+    )
+    rds = parse_description('Db.r5.2xlarge Single-AZ instance hour (or partial hour) running SQL Server SE (LI)')
+    assert rds['instance_type'] == 'db.r5.2xlarge' and rds['instance_family'] == 'r5'
+    assert rds['database_engine'] == 'SQL Server' and rds['pricing_model'] == 'On Demand'
+    transfer = parse_description('GB - Asia Pacific (Seoul) data transfer to US East (Boston)')
+    assert all(value is None for value in transfer.values())
+    print(f"✓ {attributes}")
+
+    # 2. 컬럼 추출 (고유값별 결과를 행으로 펼침, 빈 Description은 빈 값)
+    print("\n[2단계] 컬럼 추출")
+    descriptions = pd.Series([
+        'On Demand Windows m5a.xlarge Instance Hour', None,
+        'On Demand Windows m5a.xlarge Instance Hour', 'Reserved Linux t3.micro Instance Hour',
+    ], index=[10, 11, 12, 13])
+    columns = extract_description_attributes(descriptions)
+    assert list(columns.index) == [10, 11, 12, 13]
+    assert isinstance(columns['instance_family'].dtype, pd.CategoricalDtype)
+    assert list(columns['instance_family'].astype(object).fillna('')) == ['m5a', '', 'm5a', 't3']
+    assert list(columns['pricing_model'].astype(object).fillna('')) == ['On Demand', '', 'On Demand', 'Reserved']
+    print("✓ category 컬럼")
+
+    # 3. DataFrame에 추가 / 합친 뒤에는 category 타입으로만 맞춤
+    print("\n[3단계] DataFrame")
+    df = with_description_attributes(pd.DataFrame({'description': descriptions, 'cost': [1.0, 2.0, 3.0, 4.0]}))
+    merged = pd.concat([df, df.iloc[:1].assign(operating_system=pd.Series(['Linux'], index=[10], dtype='category'))])
+    merged = with_description_attributes(merged)
+    assert isinstance(merged['operating_system'].dtype, pd.CategoricalDtype)
+    assert df.groupby('instance_family', observed=True)['cost'].sum().to_dict() == {'m5a': 4.0, 't3': 4.0}
+    print("✓ 인스턴스 패밀리별 합계")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_description_attributes()
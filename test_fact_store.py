@@ -0,0 +1,122 @@
+"""
+SQLite 비용 팩트 테이블 테스트
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from src.dataset.fact_store import CostFactStore, FactVersionChanged, sort_dataframe
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=['date', 'service_name', 'environment', 'project', 'cost']).assign(
+        date=lambda df: pd.to_datetime(df['date'])
+    )
+
+
+def test_fact_store():
+    """사전 인코딩 저장 / 교체 저장 / 필터·정렬·페이지 조회 / GROUP BY 집계 / 메모리 정렬과 같은 순서"""
+
+    print("=" * 60)
+    print("SQLite 비용 팩트 테이블 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = CostFactStore(os.path.join(tmp_dir, 'facts.db'))
+        df = _frame([
+            ('2025-12-01', 'EC2', 'cielmobility', 'alpha', 3.0),
+            ('2025-12-01', 'RDS', 'smartmobility', None, 5.0),
+            ('2025-12-02', 'EC2', None, 'alpha', 1.0),
+            ('2025-12-03', 'S3', 'cielmobility', None, None),
+        ])
+
+        # 1. 저장 (같은 서비스명은 사전 테이블에 한 번만)
+        print("\n[1단계] 저장")
+        store.load('ws1', 1, df)
+        assert store.dataset_version('ws1') == 1
+        assert store.dataset_version('ws2') is None
+        print(f"✓ 버전 {store.dataset_version('ws1')}")
+
+        # 2. 필터 + 정렬 + 페이지 (빈 값은 정렬 방향과 관계없이 마지막)
+        print("\n[2단계] 페이지 조회")
+        page, total = store.query_page('ws1', sort_by='cost', ascending=True, offset=0, limit=3)
+        assert total == 4
+        assert list(page['cost']) == [1.0, 3.0, 5.0]
+        assert list(page.columns) == list(df.columns)
+        assert str(page['date'].dtype).startswith('datetime64')
+        page, total = store.query_page('ws1', sort_by='cost', ascending=False, offset=3, limit=3)
+        assert pd.isna(page['cost'].iloc[0])
+
+        page, total = store.query_page('ws1', filters={
+            'services': ['EC2', 'S3'], 'date_start': '2025-12-02', 'date_end': '2025-12-31'
+        })
+        assert total == 2 and sorted(page['service_name']) == ['EC2', 'S3']
+        page, total = store.query_page('ws1', filters={'environment': 'cielmobility', 'project': 'alpha'})
+        assert total == 1 and page['cost'].iloc[0] == 3.0
+        print("✓ 필터/정렬/페이지")
+
+        # 3. GROUP BY 합계
+        print("\n[3단계] 집계")
+        groups = store.aggregate('ws1', ['service_name'])
+        totals = dict(zip(groups['service_name'], groups['cost']))
+        assert totals == {'EC2': 4.0, 'RDS': 5.0, 'S3': 0.0}
+        assert int(groups['records'].sum()) == 4
+        assert 'cost_krw' not in groups.columns
+        print(f"✓ {totals}")
+
+        # 4. 메모리 백엔드 정렬과 같은 순서 (같은 값은 원래 행 순서, category는 값 기준)
+        print("\n[4단계] 메모리 정렬과 비교")
+        memory = df.assign(service_name=pd.Categorical(df['service_name'], categories=['S3', 'RDS', 'EC2']))
+        for sort_by in ('date', 'service_name', 'environment', 'project', 'cost'):
+            for ascending in (True, False):
+                page, _ = store.query_page('ws1', sort_by=sort_by, ascending=ascending, limit=10)
+                expected = sort_dataframe(memory, sort_by, ascending)
+                assert list(page['cost'].fillna(-1)) == list(expected['cost'].fillna(-1)), (sort_by, ascending)
+                assert list(page['date']) == list(expected['date']), (sort_by, ascending)
+        print("✓ 두 백엔드 같은 순서")
+
+        # 5. 다시 저장하면 이전 행을 모두 교체
+        print("\n[5단계] 교체 저장")
+        store.load('ws1', 2, df.iloc[:1], token='t2')
+        page, total = store.query_page('ws1')
+        assert total == 1 and store.dataset_version('ws1') == 2
+        print(f"✓ 버전 {store.dataset_version('ws1')}, {total}건")
+
+        # 6. 스냅샷 token 확인 (행을 읽는 트랜잭션 안에서 - 다른 버전이면 결과를 만들지 않음)
+        print("\n[6단계] 스냅샷 token")
+        assert store.dataset_info('ws1') == {'version': 2, 'token': 't2', 'row_count': 1}
+        page, total = store.query_page('ws1', token='t2')
+        assert total == 1
+        for call in (
+            lambda: store.query_page('ws1', token='t1'),
+            lambda: store.aggregate('ws1', ['service_name'], token='t1'),
+        ):
+            try:
+                call()
+            except FactVersionChanged:
+                pass
+            else:
+                raise AssertionError("다른 token이면 오류가 나야 합니다")
+        print("✓ 다른 버전 조회 거부")
+
+        # 7. 늦게 끝난 이전 버전 저장은 건너뜀 / 공개 중에는 데이터셋 정보 없음
+        print("\n[7단계] 이전 버전 저장 / 공개 중")
+        assert store.load('ws1', 1, df, token='t1', newer_only=True) is False
+        assert store.dataset_info('ws1')['token'] == 't2'
+        store.invalidate('ws1')
+        assert store.dataset_info('ws1') is None
+        try:
+            store.query_page('ws1', token='t2')
+        except FactVersionChanged:
+            print("✓ 공개 중에는 스냅샷으로 조회")
+        else:
+            raise AssertionError("데이터셋 정보가 없으면 오류가 나야 합니다")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_fact_store()
@@ -0,0 +1,72 @@
+"""
+필터 식 테스트
+"""
+from datetime import date
+
+import pandas as pd
+
+from src.dataset.filter_expr import compile_filter
+
+
+def test_filter_expr():
+    """파싱 / 실행 계획 캐시 / 조건 평가 / 오류"""
+
+    print("=" * 60)
+    print("필터 식 테스트")
+    print("=" * 60)
+
+    df = pd.DataFrame({
+        'date': [date(2025, 12, 1), date(2025, 12, 2), date(2025, 12, 15), None],
+        'service_name': pd.Categorical(['EC2', 'RDS', 'EC2', 'S3']),
+        'environment': ['prd-smartmobility', 'dev-ciel', None, 'prd-ciel'],
+        'description': ['On Demand Linux t3.micro Instance Hour', "Customer's RDS storage", None, 'Data Transfer'],
+        'cost': [12.5, 3.0, 40.0, 0.5],
+    }, index=[10, 11, 12, 13])
+
+    def rows(expression):
+        return list(df.index[compile_filter(expression).evaluate(df)])
+
+    # 1. 실행 계획 캐시 (같은 식은 같은 객체)
+    print("\n[1단계] 실행 계획 캐시")
+    plan = compile_filter("service_name in ('EC2', 'RDS') and cost >= 10")
+    assert compile_filter("service_name in ('EC2', 'RDS') and cost >= 10") is plan
+    assert sorted(plan.columns) == ['cost', 'service_name']
+    print(f"✓ {plan.root}")
+
+    # 2. 비교 / IN / OR / NOT / 괄호
+    print("\n[2단계] 조건 평가")
+    assert rows("service_name in ('EC2', 'RDS') and cost >= 10") == [10, 12]
+    assert rows("service_name = 'S3' or cost between 3 and 12.5") == [10, 11, 13]
+    assert rows("not (service_name = 'EC2') and cost < 5") == [11, 13]
+    assert rows("service_name not in ('EC2')") == [11, 13]
+    assert rows("environment != 'dev-ciel'") == [10, 12, 13]
+    assert rows("environment is null OR environment is not null AND cost > 100") == [12]
+    print("✓ and/or/not 우선순위")
+
+    # 3. 문자열 조건 (대소문자 구분 없음, category는 고유값에만 적용) / 날짜
+    print("\n[3단계] 문자열 / 날짜")
+    assert rows("description contains 'instance hour'") == [10]
+    assert rows("description contains 'customer''s'") == [11]
+    assert rows("service_name startswith 'e'") == [10, 12]
+    assert rows("date >= '2025-12-02' and date <= '2025-12-15'") == [11, 12]
+    assert rows("date = '2025-12-01'") == [10]
+    print("✓ contains / 기간")
+
+    # 4. 오류 (ValueError → 400)
+    print("\n[4단계] 오류")
+    for expression in ("cost >", "cost >= 'abc'", "unknown = 'x'", "service_name > 'A'",
+                       "cost = 1; drop table", "description contains 3", "(" * 40 + "cost > 1" + ")" * 40):
+        try:
+            compile_filter(expression).evaluate(df)
+        except ValueError as e:
+            print(f"✓ {expression[:30]}: {e}")
+        else:
+            raise AssertionError(f"오류가 나야 합니다: {expression}")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_filter_expr()
@@ -0,0 +1,77 @@
+"""
+변환 결과 캐시 (파일 내용 해시 → Parquet) 테스트
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from src.converters.frame_cache import ParsedFrameCache
+
+
+def _frame(rows):
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2025-12-01'] * rows),
+        'service_name': ['EC2'] * rows,
+        'description': [f'item-{i}' for i in range(rows)],
+        'cost': [1.5] * rows,
+        'department': [None] * rows,
+    })
+
+
+def test_frame_cache():
+    """같은 내용은 같은 키 / 저장 후 그대로 복원 / 한도 초과 시 오래된 항목 삭제 / 손상된 파일 삭제"""
+
+    print("=" * 60)
+    print("변환 결과 캐시 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ParsedFrameCache(cache_dir=cache_dir)
+
+        # 1. 파일 경로와 같은 내용의 bytes는 같은 키
+        print("\n[1단계] 내용 해시")
+        content = b'date,service,cost\n2025-12-01,EC2,1.0\n'
+        path = os.path.join(cache_dir, 'upload.csv')
+        with open(path, 'wb') as f:
+            f.write(content)
+        key = cache.source_key(content)
+        assert cache.source_key(path) == key
+        assert cache.source_key(content + b'\n') != key
+        print(f"✓ 키: {key[:12]}")
+
+        # 2. 저장한 DataFrame을 dtype까지 그대로 복원
+        print("\n[2단계] 저장/복원")
+        assert cache.get(key) is None
+        df = _frame(100)
+        cache.put(key, df)
+        pd.testing.assert_frame_equal(cache.get(key), df)
+        print(f"✓ {len(df)}건 복원")
+
+        # 3. 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+        print("\n[3단계] 크기 한도")
+        entry_size = os.path.getsize(os.path.join(cache_dir, f'{key}.parquet'))
+        cache.max_bytes = entry_size * 2
+        os.utime(os.path.join(cache_dir, f'{key}.parquet'), (0, 0))
+        cache.put('b' * 64, df)
+        cache.put('c' * 64, df)
+        assert cache.get(key) is None
+        assert cache.get('c' * 64) is not None
+        print("✓ 오래된 항목 삭제")
+
+        # 4. 잘린 파일은 캐시 미스로 처리하고 삭제
+        print("\n[4단계] 손상된 파일")
+        broken_path = os.path.join(cache_dir, f'{"c" * 64}.parquet')
+        with open(broken_path, 'r+b') as f:
+            f.truncate(entry_size // 2)
+        assert cache.get('c' * 64) is None
+        assert not os.path.exists(broken_path)
+        print("✓ 삭제 후 다시 변환")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_frame_cache()
@@ -0,0 +1,79 @@
+"""
+기간이 겹치는 파일의 증분 반영 (날짜별 파티션 교체) 테스트
+"""
+import io
+
+from src.converters.data_converter import DataConverter
+from src.dataset.incremental import incremental_update, source_partitions
+
+
+def _csv(rows):
+    lines = ['Date,Service Name,Description,Cost,env']
+    lines += [f'{day},{service},{description},{cost},prd-smartmobility' for day, service, description, cost in rows]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def test_incremental_upload():
+    """바뀐 날짜만 다시 변환하고 새 날짜는 추가"""
+
+    print("=" * 60)
+    print("증분 반영 테스트")
+    print("=" * 60)
+
+    converter = DataConverter()
+    first_rows = [
+        ('2025-12-01', 'EC2', 't3.micro', '1.00'),
+        ('2025-12-01', 'S3', 'storage', '0.50'),
+        ('2025-12-02', 'EC2', 't3.micro', '1.00'),
+    ]
+
+    # 1. 기존 데이터가 없으면 모든 날짜 추가
+    print("\n[1단계] 첫 업로드")
+    first = incremental_update(converter, [_csv(first_rows)], None, None)
+    assert first.added_days == ['2025-12-01', '2025-12-02']
+    assert len(first.df) == 3 and len(first.partitions) == 2
+    print(f"✓ {len(first.df)}건, {len(first.added_days)}일 추가")
+
+    # 2. 같은 날짜는 행 순서가 달라도 유지, 늦게 들어온 비용이 있는 날짜는 교체, 새 날짜는 추가
+    print("\n[2단계] 월중 갱신 파일")
+    second_rows = [
+        ('2025-12-01', 'S3', 'storage', '0.50'),
+        ('2025-12-01', 'EC2', 't3.micro', '1.00'),
+        ('2025-12-02', 'EC2', 't3.micro', '1.00'),
+        ('2025-12-02', 'RDS', 'db.t3', '2.00'),
+        ('2025-12-03', 'EC2', 't3.micro', '1.00'),
+    ]
+    second = incremental_update(converter, [_csv(second_rows)], first.df, first.partitions)
+    assert second.unchanged_days == ['2025-12-01']
+    assert second.replaced_days == ['2025-12-02']
+    assert second.added_days == ['2025-12-03']
+    assert second.converted_records == 3
+    assert len(second.df) == 5
+    assert round(second.df['cost'].sum(), 2) == 5.5
+    assert second.df['date'].is_monotonic_increasing
+    print(f"✓ 유지 1일, 교체 1일, 추가 1일 (변환 {second.converted_records}건)")
+
+    # 3. 새 파일에 없는 기존 날짜는 유지
+    print("\n[3단계] 일부 기간 파일")
+    third = incremental_update(converter, [_csv(second_rows[4:])], second.df, second.partitions)
+    assert third.unchanged_days == ['2025-12-03'] and third.converted_records == 0
+    assert len(third.df) == 5 and list(third.partitions['day']) == ['2025-12-01', '2025-12-02', '2025-12-03']
+    print("✓ 기존 날짜 유지")
+
+    # 4. 교체 업로드 후 저장한 날짜별 해시로 증분 반영 (같은 파일이면 다시 변환하지 않음)
+    print("\n[4단계] 교체 업로드 다음 증분 반영")
+    replaced_df = converter.to_dataframe(converter.convert_csv_stream(io.BytesIO(_csv(second_rows))))
+    partitions = source_partitions(converter, [_csv(second_rows)])
+    assert partitions.equals(second.partitions)
+    fourth = incremental_update(converter, [_csv(second_rows)], replaced_df, partitions)
+    assert fourth.converted_records == 0 and len(fourth.unchanged_days) == 3
+    assert len(fourth.df) == 5
+    print(f"✓ 유지 {len(fourth.unchanged_days)}일 (변환 0건)")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_incremental_upload()
@@ -0,0 +1,51 @@
+"""
+라인 항목 분류(line_item_class) 테스트
+"""
+import pandas as pd
+
+from src.converters.line_items import LINE_ITEM_CLASS_DTYPE, classify_line_items, line_item_mask, with_line_item_class
+from src.settlement.msp import custom_charge_mask
+
+
+def test_line_items():
+    """분류 규칙 / category 타입 / 코드 비교 마스크"""
+
+    print("=" * 60)
+    print("라인 항목 분류 테스트")
+    print("=" * 60)
+
+    df = pd.DataFrame({
+        'service_name': ['EC2', 'Custom Charge', 'Tax', 'EC2', 'AWS Support (Business)', 'RDS', None],
+        'description': ['t3.micro', 'MSP', 'Tax for product code AmazonEC2', 'Credit applied', 'Support fee', 'taxonomy db', None],
+        'cost': [1.0, 2500.0, 0.3, -5.0, 100.0, 2.0, 0.1],
+    })
+
+    # 1. 분류 규칙 (Custom Charge > Tax > Credit > Support > Usage)
+    print("\n[1단계] 분류")
+    classes = classify_line_items(df)
+    assert classes.dtype == LINE_ITEM_CLASS_DTYPE
+    assert list(classes) == ['usage', 'custom_charge', 'tax', 'credit', 'support', 'usage', 'usage']
+    print(f"✓ {list(classes)}")
+
+    # 2. 컬럼 추가 / 다른 category 값 목록으로 읽은 데이터도 공통 타입으로
+    print("\n[2단계] 컬럼 정규화")
+    with_class = with_line_item_class(df)
+    assert with_line_item_class(with_class) is with_class
+    cached = with_class.assign(line_item_class=with_class['line_item_class'].astype(str).astype('category'))
+    assert with_line_item_class(cached)['line_item_class'].dtype == LINE_ITEM_CLASS_DTYPE
+    print("✓ category 타입")
+
+    # 3. 마스크 (컬럼이 있으면 코드 비교, 없으면 서비스명으로 분류)
+    print("\n[3단계] 마스크")
+    assert list(custom_charge_mask(with_class)) == [False, True, False, False, False, False, False]
+    assert list(custom_charge_mask(df)) == list(custom_charge_mask(with_class))
+    assert with_class.loc[line_item_mask(with_class, 'credit'), 'cost'].sum() == -5.0
+    print("✓ Custom Charge / Credit")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_line_items()
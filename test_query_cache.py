@@ -0,0 +1,71 @@
+"""
+조회 결과 캐시 테스트
+"""
+from werkzeug.datastructures import MultiDict
+
+from src.dataset.query_cache import QueryResultCache
+
+
+def test_query_cache():
+    """버전/조회 조건 기반 LRU 캐시 테스트"""
+
+    print("=" * 60)
+    print("조회 결과 캐시 테스트")
+    print("=" * 60)
+
+    cache = QueryResultCache(max_entries=2)
+
+    # 1. 파라미터 정규화 - 순서/공백/빈 값이 달라도 같은 키
+    print("\n[1단계] 파라미터 정규화")
+    key1 = cache.make_key(1, 'data', MultiDict([('services', 'RDS, EC2'), ('page', '1'), ('project', '')]))
+    key2 = cache.make_key(1, 'data', MultiDict([('page', '1'), ('services', 'EC2,RDS')]))
+    assert key1 == key2
+    print(f"✓ 정규화된 키: {key1}")
+
+    # fields는 응답 컬럼 순서이므로 순서가 다르면 다른 키/ETag (공백만 무시)
+    fields1 = cache.make_key(1, 'data', {'fields': 'cost,service_name'})
+    fields2 = cache.make_key(1, 'data', {'fields': 'service_name,cost'})
+    assert fields1 != fields2 and cache.make_etag(fields1) != cache.make_etag(fields2)
+    assert fields1 == cache.make_key(1, 'data', {'fields': 'cost, service_name'})
+    print("✓ fields 순서 유지")
+
+    # 2. 캐시 미스 후 히트
+    print("\n[2단계] 캐시 미스/히트")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return b'{"success": true}'
+
+    etag1, body1 = cache.get_or_compute(key1, compute)
+    etag2, body2 = cache.get_or_compute(key2, compute)
+    assert len(calls) == 1
+    assert etag1 == etag2 and body1 == body2
+    print(f"✓ ETag: {etag1}, 계산 횟수: {len(calls)}")
+
+    # 3. 버전이 바뀌면 다른 키/ETag
+    print("\n[3단계] 데이터셋 버전 변경")
+    key_v2 = cache.make_key(2, 'data', {'page': '1', 'services': 'EC2,RDS'})
+    etag_v2, _ = cache.get_or_compute(key_v2, compute)
+    assert etag_v2 != etag1
+    assert len(calls) == 2
+    # 재시작 등으로 버전 번호가 다시 시작되어도 스냅샷 token이 다르면 다른 ETag
+    restarted = cache.make_etag(cache.make_key(('ws', 1, 'token-b'), 'data'))
+    assert restarted != cache.make_etag(cache.make_key(('ws', 1, 'token-a'), 'data'))
+    print(f"✓ 새 버전 ETag: {etag_v2}")
+
+    # 4. LRU 제거 및 버전 무효화
+    print("\n[4단계] LRU 제거")
+    cache.get_or_compute(cache.make_key(3, 'summary'), compute)
+    assert cache.get(key1) is None
+    cache.invalidate([2])
+    assert cache.get(key_v2) is None
+    print(f"✓ 캐시 통계: {cache.stats()}")
+
+    print("\n" + "=" * 60)
+    print("✓ 모든 테스트 완료!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_query_cache()
@@ -0,0 +1,114 @@
+"""
+데이터셋 레지스트리 디스크 내보내기 / 복원 테스트
+"""
+import os
+import tempfile
+import threading
+
+import pandas as pd
+
+from src.dataset.registry import DatasetRegistry
+
+
+class _LockProbe:
+    """pickle될 때 다른 스레드에서 레지스트리를 조회할 수 있는지 기록"""
+
+    registry = None
+    results = []
+
+    def __reduce__(self):
+        done = threading.Event()
+        threading.Thread(target=lambda: (self.registry.stats(), done.set()), daemon=True).start()
+        self.results.append(done.wait(timeout=2))
+        return (_LockProbe, ())
+
+
+class _Unpicklable:
+    def __reduce__(self):
+        raise OSError("디스크 오류")
+
+
+def _publish(registry, workspace_id, df):
+    workspace = registry.get(workspace_id)
+    with workspace.lock:
+        registry.publish(workspace, workspace.snapshot.next_version(ciel_df=df, df=df))
+    registry.update(workspace)
+    return workspace
+
+
+def test_registry_spill():
+    """예산 초과 시 내보내기 (레지스트리 lock 밖에서 저장) / 복원 / 저장 실패 시 메모리 유지 / 공개 후 해제 / 오래된 작업 공간 삭제"""
+
+    print("=" * 60)
+    print("레지스트리 내보내기 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        registry = DatasetRegistry(memory_budget_bytes=1, spill_dir=f'{tmp_dir}/spill')
+        _LockProbe.registry = registry
+
+        df = pd.DataFrame({'service_name': ['EC2', 'RDS'], 'cost': [1.5, 2.25], 'probe': [_LockProbe(), None]})
+
+        # 1. 예산을 넘으면 오래 사용하지 않은 작업 공간을 내보냄 (저장하는 동안 레지스트리 조회 가능)
+        print("\n[1단계] 내보내기")
+        first = _publish(registry, 'first', df)
+        _publish(registry, 'second', df.drop(columns='probe'))
+        assert not first.has_data and first.memory_bytes == 0
+        assert registry.stats()['spilled'] == 1
+        assert _LockProbe.results == [True]
+        print(f"✓ {registry.stats()}")
+
+        # 2. 다음 접근 시 디스크에서 복원
+        print("\n[2단계] 복원")
+        restored = registry.get('first')
+        assert restored.snapshot.version == 1
+        assert list(restored.snapshot.df['cost']) == [1.5, 2.25]
+        assert registry.stats()['spilled'] == 1  # 복원하면서 second를 내보냄
+        print("✓ 같은 버전 복원")
+
+        # 3. 저장에 실패하면 메모리에 그대로 유지
+        print("\n[3단계] 저장 실패")
+        broken = _publish(registry, 'broken', df.assign(probe=[_Unpicklable(), None]))
+        registry.get('first')
+        assert broken.has_data and broken.memory_bytes > 0
+        assert 'broken' not in registry._spilled
+        print("✓ 메모리 유지")
+
+        # 4. 예산과 관계없이 내보내기 (팩트 테이블 백엔드 - 공개 후 워커 메모리에서 해제)
+        print("\n[4단계] 공개 후 해제")
+        registry.memory_budget_bytes = 1024 * 1024 * 1024
+        released = _publish(registry, 'released', df.drop(columns='probe'))
+        assert released.has_data
+        registry.release(released)
+        assert not released.has_data and released.memory_bytes == 0
+        assert list(registry.get('released').snapshot.df['cost']) == [1.5, 2.25]
+        print("✓ 다음 접근 시 복원")
+
+        # 5. 오래 접근하지 않은 작업 공간은 삭제 (내보낸 파일 포함, 사용 중인 작업 공간은 유지)
+        print("\n[5단계] 오래된 작업 공간 삭제")
+        registry.memory_budget_bytes = 1
+        idle = _publish(registry, 'idle', df.drop(columns='probe'))
+        _publish(registry, 'busy', df.drop(columns='probe'))
+        assert 'idle' in registry._spilled
+        idle_spill = registry._spilled['idle']
+        for workspace in registry._workspaces.values():
+            workspace.last_access -= 3600
+        registry.idle_ttl_seconds = 60
+        busy = registry._workspaces['busy']
+        with busy.lock:
+            locker = threading.Thread(target=registry.get, args=('new',))
+            locker.start()
+            locker.join()
+        assert set(registry._workspaces) == {'busy', 'new'}
+        assert 'idle' not in registry._spilled
+        assert not os.path.exists(idle_spill)
+        assert not registry.get('idle').has_data
+        print(f"✓ {registry.stats()}")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_registry_spill()
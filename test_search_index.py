@@ -0,0 +1,75 @@
+"""
+서비스명 / Description 검색 색인 테스트
+"""
+import pandas as pd
+
+from src.dataset.search_index import SearchIndex, SearchIndexCache, tokenize
+
+
+def test_search_index():
+    """용어 분리 / 접두사 검색 / 여러 단어 / 색인 캐시"""
+
+    print("=" * 60)
+    print("검색 색인 테스트")
+    print("=" * 60)
+
+    df = pd.DataFrame({
+        'service_name': ['EC2', 'VPC', 'FSx', 'EC2', None, 'VPC'],
+        'description': [
+            'On Demand Windows m5a.xlarge Instance Hour',
+            'APN2-NatGateway-Hours',
+            'GB-month of SSD storage',
+            'GB - data transfer out beyond the global free tier',
+            'APN2-DataTransfer-Out-Bytes',
+            'APN2-NatGateway-Bytes',
+        ],
+    }, index=[100, 101, 102, 103, 104, 105])
+    index = SearchIndex(df)
+
+    def rows(query, **kwargs):
+        return list(index.search(query, **kwargs)['rows'])
+
+    # 1. 용어 분리 (영숫자 단어 + 대소문자 경계)
+    print("\n[1단계] 용어 분리")
+    assert tokenize('APN2-NatGateway-Hours') == ['apn2', 'natgateway', 'nat', 'gateway', 'hours']
+    assert tokenize('FSx') == ['fsx']
+    print(f"✓ {len(index.terms)}개 용어")
+
+    # 2. 접두사 / 정확히 일치 (행 번호 = 위치)
+    print("\n[2단계] 접두사 검색")
+    assert rows('natgate') == [1, 5]
+    assert rows('natgate', prefix=False) == []
+    assert rows('NatGateway') == [1, 5]
+    assert rows('fsx') == [2]
+    assert rows('gateway bytes') == [5]
+    print("✓ natgate → natgateway")
+
+    # 3. 대소문자가 섞인 단어 (용어 또는 부분 단어 모두 포함)
+    print("\n[3단계] DataTransfer-Out")
+    assert rows('DataTransfer-Out') == [3, 4]
+    assert rows('ec2 instance') == [0]
+    assert rows('zzz') == []
+    try:
+        index.search('  - ')
+    except ValueError as e:
+        print(f"✓ 빈 검색어: {e}")
+    else:
+        raise AssertionError("빈 검색어는 오류가 나야 합니다")
+
+    # 4. 색인 캐시 (작업 공간 + 버전)
+    print("\n[4단계] 색인 캐시")
+    cache = SearchIndexCache(max_entries=1)
+    cache.put(('ws', 1), index)
+    assert cache.get_or_build(('ws', 1), df) is index
+    rebuilt = cache.get_or_build(('ws', 2), df.iloc[:2])
+    assert rebuilt is not index and rebuilt.row_count == 2
+    assert cache.get_or_build(('ws', 1), df) is not index  # 밀려난 색인은 다시 만듦
+    print("✓ LRU")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_search_index()
@@ -0,0 +1,82 @@
+"""
+워커 간 공유 데이터셋 저장소 테스트
+"""
+import tempfile
+
+import pandas as pd
+
+from src.dataset.registry import DatasetRegistry
+from src.dataset.shared_store import SharedDatasetStore
+from src.dataset.snapshot import DatasetSnapshot
+
+
+def test_shared_store():
+    """두 워커(레지스트리)가 같은 저장소로 데이터셋을 공유하는지 테스트"""
+
+    print("=" * 60)
+    print("공유 데이터셋 저장소 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 워커 두 개를 레지스트리 두 개로 흉내 (같은 공유 폴더 사용)
+        worker1 = DatasetRegistry(spill_dir=f'{tmp_dir}/spill1', store=SharedDatasetStore(f'{tmp_dir}/shared'))
+        worker2 = DatasetRegistry(spill_dir=f'{tmp_dir}/spill2', store=SharedDatasetStore(f'{tmp_dir}/shared'))
+
+        df = pd.DataFrame({
+            'date': pd.to_datetime(['2025-12-01', '2025-12-02']),
+            'service_name': ['EC2', 'RDS'],
+            'environment': ['cielmobility', 'smartmobility'],
+            'cost': [1.5, 2.25],
+        })
+
+        # 1. 워커 1에서 저장
+        print("\n[1단계] 워커 1에서 새 버전 공개")
+        ws1 = worker1.get('team')
+        with ws1.lock:
+            published = worker1.publish(ws1, ws1.snapshot.next_version(ciel_df=df, df=df))
+        assert published.version == 1
+        print(f"✓ 버전: {published.version}")
+
+        # 2. 워커 2는 다음 접근 때 같은 버전을 매핑
+        print("\n[2단계] 워커 2에서 조회")
+        ws2 = worker2.get('team')
+        assert ws2.snapshot.version == 1
+        assert ws2.snapshot.token == published.token and published.token  # 워커가 달라도 같은 스냅샷 token
+        assert ws2.snapshot.df is ws2.snapshot.ciel_df  # 같은 파일은 한 번만 매핑
+        pd.testing.assert_frame_equal(ws2.snapshot.df, df)
+        print(f"✓ 레코드: {len(ws2.snapshot.df)}건, dtype 유지")
+
+        # 3. 워커 2에서 저장하면 워커 1이 가져감 (버전 번호는 저장소 기준)
+        print("\n[3단계] 워커 2에서 환율 적용 버전 공개")
+        with ws2.lock:
+            df_krw = df.assign(cost_krw=df['cost'] * 1400.0)
+            worker2.publish(ws2, ws2.snapshot.next_version(df=df_krw, exchange_rate=1400.0))
+        ws1 = worker1.get('team')
+        assert ws1.snapshot.version == 2
+        assert ws1.snapshot.exchange_rate == 1400.0
+        assert list(ws1.snapshot.df['cost_krw']) == [2100.0, 3150.0]
+        print(f"✓ 버전: {ws1.snapshot.version}, 환율: {ws1.snapshot.exchange_rate}")
+
+        # 4. 저장된 적 없는 작업 공간
+        print("\n[4단계] 빈 작업 공간")
+        assert worker1.store.latest_version('empty') == 0
+        assert worker1.store.load('empty') is None
+        assert worker1.get('empty').snapshot == DatasetSnapshot()
+        print("✓ 데이터 없음")
+
+        # 5. 공유 폴더를 비우고 다시 시작하면 버전 번호는 같아도 token이 다름 (ETag가 겹치지 않음)
+        print("\n[5단계] 저장소 초기화 후 같은 버전 번호")
+        fresh = DatasetRegistry(spill_dir=f'{tmp_dir}/spill3', store=SharedDatasetStore(f'{tmp_dir}/shared-new'))
+        ws3 = fresh.get('team')
+        with ws3.lock:
+            republished = fresh.publish(ws3, ws3.snapshot.next_version(ciel_df=df, df=df))
+        assert republished.version == 1 and republished.token != published.token
+        print(f"✓ token: {published.token[:8]} → {republished.token[:8]}")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_shared_store()
@@ -0,0 +1,80 @@
+"""
+재시작 후 복원 테스트 (공유 저장소에서 데이터셋 다시 읽기, 중단된 작업 처리)
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from src.dataset.registry import DatasetRegistry
+from src.dataset.shared_store import SharedDatasetStore
+from src.dataset.snapshot import DatasetSnapshot
+from src.jobs.manager import JobManager, JOB_FAILED
+
+
+def test_warm_start():
+    """새 워커가 저장된 최신 버전을 그대로 읽고, 죽은 워커의 작업은 실패로 표시"""
+
+    print("=" * 60)
+    print("재시작 후 복원 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        df = pd.DataFrame({
+            'date': pd.to_datetime(['2025-12-01', '2025-12-02']),
+            'service_name': ['EC2', 'RDS'],
+            'cost': [1.5, 2.25],
+            'cost_krw': [2100.0, 3150.0],
+        })
+
+        # 1. 재시작 전 워커가 저장한 스냅샷 (환율 포함)
+        print("\n[1단계] 재시작 전 저장")
+        before = DatasetRegistry(spill_dir=f'{tmp_dir}/spill1', store=SharedDatasetStore(f'{tmp_dir}/shared'))
+        workspace = before.get('team')
+        with workspace.lock:
+            before.publish(workspace, workspace.snapshot.next_version(ciel_df=df, df=df, exchange_rate=1400.0))
+        print(f"✓ 버전 {workspace.snapshot.version} 저장")
+
+        # 2. 새 워커는 처음 접근할 때 같은 버전/환율을 다시 읽음
+        print("\n[2단계] 재시작 후 접근")
+        after = DatasetRegistry(spill_dir=f'{tmp_dir}/spill2', store=SharedDatasetStore(f'{tmp_dir}/shared'))
+        restored = after.get('team').snapshot
+        assert restored.version == workspace.snapshot.version
+        assert restored.exchange_rate == 1400.0
+        pd.testing.assert_frame_equal(restored.df, df)
+        print(f"✓ 버전 {restored.version}, 환율 {restored.exchange_rate}")
+
+        # 3. 파일이 없어진 버전은 오류 대신 빈 작업 공간
+        print("\n[3단계] 파일이 없는 버전")
+        for path in os.listdir(f'{tmp_dir}/shared/team'):
+            os.unlink(f'{tmp_dir}/shared/team/{path}')
+        assert SharedDatasetStore(f'{tmp_dir}/shared').load('team') is None
+        print("✓ 빈 작업 공간으로 시작")
+
+        # 4. 종료된 워커 프로세스가 실행하던 작업은 실패로 표시
+        print("\n[4단계] 중단된 작업")
+        jobs = JobManager(db_path=f'{tmp_dir}/jobs.db', max_workers=1)
+        job_id = jobs.submit('team', 'upload', lambda report: {'success': True})
+        jobs.wait(job_id)
+        dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+        dead.wait()
+        conn = sqlite3.connect(f'{tmp_dir}/jobs.db')
+        conn.execute("UPDATE jobs SET status = 'running', owner_pid = ? WHERE job_id = ?", (dead.pid, job_id))
+        conn.commit()
+        conn.close()
+        job = jobs.get(job_id)
+        assert job['status'] == JOB_FAILED and job['error']
+        assert jobs.get(job_id)['status'] == JOB_FAILED
+        jobs.executor.shutdown()
+        print(f"✓ {job['error']}")
+
+    print("\n" + "=" * 60)
+    print("모든 테스트 통과!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    test_warm_start()
@@ -8,5 +8,5 @@ echo.
 :: 2초 후 브라우저 자동 열기 (서버가 시작될 시간을 줌)
 start "" cmd /c "timeout /t 2 /nobreak >nul && start http://localhost:5000"
 
-python app.py
+python run_server.py
 pause